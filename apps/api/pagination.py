@@ -1,4 +1,4 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 
@@ -25,3 +25,25 @@ class ApiPageNumberPagination(PageNumberPagination):
                 },
             }
         )
+
+
+class ApiCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "status": "success",
+                "data": data,
+                "meta": {
+                    "pagination": {
+                        "page_size": self.get_page_size(self.request),
+                        "next": self.get_next_link(),
+                        "previous": self.get_previous_link(),
+                    }
+                },
+            }
+        )
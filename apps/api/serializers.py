@@ -13,6 +13,7 @@ class TopInterestStockSerializer(serializers.Serializer):
     market = serializers.CharField()
     sector = serializers.CharField()
     total_mentions = serializers.IntegerField()
+    sentiment = serializers.FloatField(source="avg_sentiment", allow_null=True)
 
 
 class InterestAnomalySerializer(serializers.Serializer):
@@ -24,6 +25,53 @@ class InterestAnomalySerializer(serializers.Serializer):
     surge_ratio = serializers.FloatField()
     z_score = serializers.FloatField()
     severity = serializers.CharField()
+    sentiment = serializers.FloatField(allow_null=True)
+    # Distinct authors/posts over the recent window; list endpoint only.
+    unique_mentions = serializers.IntegerField(required=False)
+
+
+class SectorAnomalySerializer(serializers.Serializer):
+    sector = serializers.CharField()
+    recent_mentions = serializers.IntegerField()
+    expected_mentions = serializers.IntegerField()
+    baseline_hourly_avg = serializers.FloatField()
+    surge_ratio = serializers.FloatField()
+    z_score = serializers.FloatField()
+    severity = serializers.CharField()
+
+
+class SectorSeriesSerializer(serializers.Serializer):
+    sector = serializers.CharField()
+    total_mentions = serializers.IntegerField()
+    mentions = serializers.ListField(child=serializers.IntegerField())
+
+
+class SectorTimelineSerializer(serializers.Serializer):
+    labels = serializers.ListField(child=serializers.CharField())
+    sectors = SectorSeriesSerializer(many=True)
+
+
+class TrendingTermSerializer(serializers.Serializer):
+    term = serializers.CharField()
+    count = serializers.IntegerField()
+    weight = serializers.FloatField()
+
+
+class NewsHistoryItemSerializer(serializers.Serializer):
+    title = serializers.CharField()
+    url = serializers.URLField()
+    publisher = serializers.CharField(allow_blank=True)
+    published_at = serializers.DateTimeField(allow_null=True)
+    archived = serializers.BooleanField()
+
+
+class NewsSearchResultSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    symbol = serializers.CharField(source="stock.symbol")
+    title = serializers.CharField()
+    url = serializers.URLField()
+    publisher = serializers.CharField(allow_blank=True)
+    published_at = serializers.DateTimeField(allow_null=True)
 
 
 class StockSummarySerializer(serializers.Serializer):
@@ -55,9 +103,16 @@ class StockSummarySerializer(serializers.Serializer):
         publisher = serializers.CharField(allow_blank=True)
         published_at = serializers.DateTimeField(allow_null=True)
 
+    class RelatedStockSerializer(serializers.Serializer):
+        symbol = serializers.CharField()
+        name = serializers.CharField()
+        co_mentions = serializers.IntegerField()
+        pmi = serializers.FloatField()
+
     stock = StockMetaSerializer()
     latest_price = PriceSnapshotSerializer(allow_null=True)
     price_chart_data = PricePointSerializer(many=True)
     interest_chart_data = InterestPointSerializer(many=True)
     news_items = NewsItemSerializer(many=True)
     stock_anomaly = InterestAnomalySerializer(allow_null=True)
+    related_stocks = RelatedStockSerializer(many=True)
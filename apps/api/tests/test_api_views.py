@@ -14,7 +14,9 @@ from rest_framework.throttling import ScopedRateThrottle
 
 from apps.accounts.models import Subscription
 from apps.stocks.models import Interest, NewsItem, Price, Stock
+from services.interest_service import rebuild_interest_anomaly_states, refresh_sector_rollups
 from services.stock_service import ensure_index_stocks
+from services.trending_terms import record_trending_terms
 
 
 class ApiViewsTests(APITestCase):
@@ -124,6 +126,7 @@ class ApiViewsTests(APITestCase):
                 recorded_at=now - timedelta(hours=hours_ago),
                 mentions=12,
             )
+        rebuild_interest_anomaly_states()
 
     def test_market_summary_api_returns_success_shape(self):
         self._auth_pro_user()
@@ -149,6 +152,20 @@ class ApiViewsTests(APITestCase):
         self.assertEqual(len(response.data["data"]), 1)
         self.assertEqual(response.data["data"][0]["symbol"], "API1")
         self.assertEqual(response.data["data"][0]["total_mentions"], 12)
+        self.assertIn("sentiment", response.data["data"][0])
+
+    def test_trending_terms_api_returns_window_ranking(self):
+        self._auth_pro_user()
+        record_trending_terms(["Chip rally", "chip export curbs"])
+
+        response = self.client.get(reverse("api:trending-terms"), {"limit": 2, "hours": 6})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "success")
+        self.assertEqual(
+            [(row["term"], row["count"]) for row in response.data["data"]],
+            [("chip", 2), ("curbs", 1)],
+        )
 
     def test_interest_anomaly_api_returns_detected_symbol(self):
         self._auth_pro_user()
@@ -165,6 +182,100 @@ class ApiViewsTests(APITestCase):
         self.assertIn("pagination", response.data["meta"])
         symbols = [row["symbol"] for row in response.data["data"]]
         self.assertIn("API1", symbols)
+        self.assertIn("sentiment", response.data["data"][0])
+        self.assertEqual(response.data["data"][0]["unique_mentions"], 0)
+
+    def test_interest_anomaly_api_unique_metric_uses_batch_detector(self):
+        self._auth_pro_user()
+        self._seed_anomaly_history()
+
+        with patch("apps.api.views.get_current_interest_anomalies") as mock_state_read:
+            response = self.client.get(reverse("api:interest-anomalies"), {"metric": "unique"})
+        invalid = self.client.get(reverse("api:interest-anomalies"), {"metric": "authors"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_state_read.assert_not_called()
+        # The seeded history has mention counts but no author sketches.
+        self.assertEqual(response.data["data"], [])
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_sector_timeline_api_returns_ranked_sector_series(self):
+        self._auth_pro_user()
+        now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        refresh_sector_rollups(now - timedelta(hours=5), now)
+
+        response = self.client.get(reverse("api:sector-timeline"), {"hours": 6, "limit": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "success")
+        self.assertEqual(len(response.data["data"]["labels"]), 6)
+        sectors = response.data["data"]["sectors"]
+        self.assertEqual([row["sector"] for row in sectors], ["Tech", "Finance"])
+        self.assertEqual(sectors[0]["total_mentions"], 12)
+        self.assertEqual(len(sectors[0]["mentions"]), 6)
+
+    def test_sector_anomaly_api_returns_surging_sector(self):
+        self._auth_pro_user()
+        self._seed_anomaly_history()
+        now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        refresh_sector_rollups(now - timedelta(hours=77), now)
+
+        response = self.client.get(
+            reverse("api:sector-anomalies"),
+            {"limit": 5, "recent_hours": 6, "baseline_hours": 72},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "success")
+        self.assertEqual(response.data["data"][0]["sector"], "Tech")
+        self.assertIn("surge_ratio", response.data["data"][0])
+        self.assertIn("severity", response.data["data"][0])
+
+    def test_interest_anomaly_api_custom_window_uses_batch_detector(self):
+        self._auth_pro_user()
+        self._seed_anomaly_history()
+
+        with patch("apps.api.views.get_current_interest_anomalies") as mock_state_read:
+            response = self.client.get(
+                reverse("api:interest-anomalies"),
+                {"recent_hours": 6, "baseline_hours": 48},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_state_read.assert_not_called()
+        symbols = [row["symbol"] for row in response.data["data"]]
+        self.assertIn("API1", symbols)
+
+    def test_interest_anomaly_api_accepts_seasonal_mode(self):
+        self._auth_pro_user()
+        self._seed_anomaly_history()
+
+        with patch(
+            "apps.api.views.detect_interest_anomalies",
+            return_value=[],
+        ) as mock_detect:
+            response = self.client.get(reverse("api:interest-anomalies"), {"mode": "seasonal"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_detect.call_args.kwargs["mode"], "seasonal")
+
+    def test_interest_anomaly_api_rejects_unknown_mode(self):
+        self._auth_pro_user()
+
+        response = self.client.get(reverse("api:interest-anomalies"), {"mode": "weekly"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("mode", response.data["errors"])
+
+    def test_stock_summary_api_reads_persisted_anomaly_state(self):
+        self._auth_pro_user()
+        self._seed_anomaly_history()
+
+        response = self.client.get(reverse("api:stock-summary", kwargs={"symbol": "API1"}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["stock_anomaly"]["symbol"], "API1")
+        self.assertEqual(response.data["data"]["stock_anomaly"]["severity"], "high")
 
     def test_stock_summary_api_returns_price_interest_and_news(self):
         self._auth_pro_user()
@@ -182,6 +293,49 @@ class ApiViewsTests(APITestCase):
         self.assertGreaterEqual(len(payload["price_chart_data"]), 2)
         self.assertGreaterEqual(len(payload["interest_chart_data"]), 1)
         self.assertGreaterEqual(len(payload["news_items"]), 1)
+        self.assertEqual(payload["related_stocks"], [])
+
+    def test_stock_news_history_api_lists_hot_news_and_validates_before(self):
+        self._auth_pro_user()
+
+        response = self.client.get(reverse("api:stock-news-history", kwargs={"symbol": "api1"}))
+        invalid = self.client.get(
+            reverse("api:stock-news-history", kwargs={"symbol": "API1"}),
+            {"before": "yesterday"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"][0]["title"], "API One launches product")
+        self.assertFalse(response.data["data"][0]["archived"])
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("before", invalid.data["errors"])
+
+    def test_news_search_api_uses_cursor_pagination_and_filters(self):
+        self._auth_pro_user()
+        for idx in range(3):
+            NewsItem.objects.create(
+                stock=self.other,
+                title=f"API Two product update {idx}",
+                url=f"https://example.com/api2-news/{idx}",
+            )
+
+        first = self.client.get(reverse("api:news-search"), {"q": "product", "page_size": 2})
+        second = self.client.get(first.data["meta"]["pagination"]["next"])
+        filtered = self.client.get(reverse("api:news-search"), {"q": "product", "symbol": "api1"})
+        invalid = self.client.get(reverse("api:news-search"), {"q": "x"})
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["title"] for row in first.data["data"]],
+            ["API Two product update 2", "API Two product update 1"],
+        )
+        self.assertEqual(
+            [row["title"] for row in second.data["data"]],
+            ["API Two product update 0", "API One launches product"],
+        )
+        self.assertEqual([row["symbol"] for row in filtered.data["data"]], ["API1"])
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("q", invalid.data["errors"])
 
     def test_top_interest_api_returns_400_for_invalid_limit(self):
         self._auth_pro_user()
@@ -5,8 +5,13 @@ from .views import (
     ApiTokenRotateView,
     InterestAnomalyApiView,
     MarketSummaryApiView,
+    NewsSearchApiView,
+    SectorAnomalyApiView,
+    SectorTimelineApiView,
+    StockNewsHistoryApiView,
     StockSummaryApiView,
     TopInterestApiView,
+    TrendingTermsApiView,
 )
 
 app_name = "api"
@@ -17,5 +22,14 @@ urlpatterns = [
     path("market/summary/", MarketSummaryApiView.as_view(), name="market-summary"),
     path("interest/top/", TopInterestApiView.as_view(), name="top-interest"),
     path("interest/anomalies/", InterestAnomalyApiView.as_view(), name="interest-anomalies"),
+    path("interest/sectors/", SectorTimelineApiView.as_view(), name="sector-timeline"),
+    path(
+        "interest/sectors/anomalies/",
+        SectorAnomalyApiView.as_view(),
+        name="sector-anomalies",
+    ),
+    path("interest/trending-terms/", TrendingTermsApiView.as_view(), name="trending-terms"),
+    path("news/search/", NewsSearchApiView.as_view(), name="news-search"),
     path("stocks/<str:symbol>/summary/", StockSummaryApiView.as_view(), name="stock-summary"),
+    path("stocks/<str:symbol>/news/", StockNewsHistoryApiView.as_view(), name="stock-news-history"),
 ]
@@ -1,8 +1,10 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
 from django.contrib.auth import authenticate
-from django.db.models import Sum
-from django.db.models.functions import TruncDate
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework.authentication import SessionAuthentication, TokenAuthentication
 from rest_framework.authtoken.models import Token
 from rest_framework.exceptions import APIException, PermissionDenied, ValidationError
@@ -12,22 +14,41 @@ from rest_framework.views import APIView
 from apps.accounts.models import Subscription
 from apps.stocks.models import Stock
 from services.interest_service import (
+    ANOMALY_METRIC_MENTIONS,
+    ANOMALY_METRICS,
+    ANOMALY_MODE_FLAT,
+    ANOMALY_MODES,
+    ANOMALY_STATE_BASELINE_HOURS,
+    ANOMALY_STATE_RECENT_HOURS,
     detect_interest_anomalies,
+    detect_sector_anomalies,
+    get_current_interest_anomalies,
+    get_sector_interest_timeline,
+    get_stock_daily_interest,
     get_stock_interest_anomaly,
     get_top_interest_stocks,
 )
-from services.news_service import get_related_news
+from services.news_search import search_news
+from services.news_service import get_news_history, get_related_news
+from services.related_stocks import get_related_stocks
 from services.stock_service import get_market_summary
+from services.trending_terms import get_trending_terms
+from services.unique_mentions import get_unique_mentions
 from services.watchlist_service import get_user_plan
 
-from .pagination import ApiPageNumberPagination
+from .pagination import ApiCursorPagination, ApiPageNumberPagination
 from .permissions import HasApiPlanPermission
 from .responses import success_response
 from .serializers import (
     InterestAnomalySerializer,
     MarketSummaryItemSerializer,
+    NewsHistoryItemSerializer,
+    NewsSearchResultSerializer,
+    SectorAnomalySerializer,
+    SectorTimelineSerializer,
     StockSummarySerializer,
     TopInterestStockSerializer,
+    TrendingTermSerializer,
 )
 
 
@@ -45,6 +66,28 @@ def _parse_positive_int(field_name, value, *, default, minimum=1, maximum=365):
     return parsed
 
 
+def _parse_choice(field_name, value, *, choices, default):
+    if value in (None, ""):
+        return default
+    normalized = str(value).strip().lower()
+    if normalized not in choices:
+        raise ValidationError({field_name: [f"Must be one of: {', '.join(choices)}"]})
+    return normalized
+
+
+def _parse_date(field_name, value):
+    if value in (None, ""):
+        return None
+    parsed = parse_date(str(value))
+    if parsed is None:
+        raise ValidationError({field_name: ["Must be a date in YYYY-MM-DD format"]})
+    return parsed
+
+
+def _start_of_day(value):
+    return timezone.make_aware(datetime.combine(value, time.min))
+
+
 class InvalidCredentialsException(APIException):
     status_code = 401
     default_detail = "Invalid username or password."
@@ -144,6 +187,25 @@ class TopInterestApiView(BaseProtectedApiView):
         return paginator.get_paginated_response(serializer.data)
 
 
+class TrendingTermsApiView(BaseProtectedApiView):
+    def get(self, request):
+        limit = _parse_positive_int(
+            "limit",
+            request.query_params.get("limit"),
+            default=20,
+            maximum=100,
+        )
+        hours = _parse_positive_int(
+            "hours",
+            request.query_params.get("hours"),
+            default=6,
+            maximum=settings.TRENDING_RETENTION_HOURS,
+        )
+        rows = get_trending_terms(hours=hours, limit=limit)
+        serializer = TrendingTermSerializer(rows, many=True)
+        return success_response(serializer.data)
+
+
 class InterestAnomalyApiView(BaseProtectedApiView):
     def get(self, request):
         limit = _parse_positive_int(
@@ -164,17 +226,94 @@ class InterestAnomalyApiView(BaseProtectedApiView):
             default=72,
             maximum=720,
         )
-        rows = detect_interest_anomalies(
-            limit=limit,
-            recent_hours=recent_hours,
-            baseline_hours=baseline_hours,
+        mode = _parse_choice(
+            "mode",
+            request.query_params.get("mode"),
+            choices=ANOMALY_MODES,
+            default=ANOMALY_MODE_FLAT,
+        )
+        metric = _parse_choice(
+            "metric",
+            request.query_params.get("metric"),
+            choices=ANOMALY_METRICS,
+            default=ANOMALY_METRIC_MENTIONS,
         )
+        served_by_state = (mode, metric, recent_hours, baseline_hours) == (
+            ANOMALY_MODE_FLAT,
+            ANOMALY_METRIC_MENTIONS,
+            ANOMALY_STATE_RECENT_HOURS,
+            ANOMALY_STATE_BASELINE_HOURS,
+        )
+        if served_by_state:
+            rows = get_current_interest_anomalies(limit=limit)
+        else:
+            rows = detect_interest_anomalies(
+                limit=limit,
+                recent_hours=recent_hours,
+                baseline_hours=baseline_hours,
+                mode=mode,
+                metric=metric,
+            )
         paginator = ApiPageNumberPagination()
         page_rows = paginator.paginate_queryset(rows, request, view=self)
+        unique_mentions = get_unique_mentions(
+            [row["symbol"] for row in page_rows], hours=recent_hours
+        )
+        page_rows = [
+            {**row, "unique_mentions": unique_mentions.get(row["symbol"], 0)} for row in page_rows
+        ]
         serializer = InterestAnomalySerializer(page_rows, many=True)
         return paginator.get_paginated_response(serializer.data)
 
 
+class SectorTimelineApiView(BaseProtectedApiView):
+    def get(self, request):
+        limit = _parse_positive_int(
+            "limit",
+            request.query_params.get("limit"),
+            default=6,
+            maximum=20,
+        )
+        hours = _parse_positive_int(
+            "hours",
+            request.query_params.get("hours"),
+            default=24,
+            maximum=168,
+        )
+        timeline = get_sector_interest_timeline(hours=hours, limit=limit)
+        serializer = SectorTimelineSerializer(timeline)
+        return success_response(serializer.data)
+
+
+class SectorAnomalyApiView(BaseProtectedApiView):
+    def get(self, request):
+        limit = _parse_positive_int(
+            "limit",
+            request.query_params.get("limit"),
+            default=10,
+            maximum=50,
+        )
+        recent_hours = _parse_positive_int(
+            "recent_hours",
+            request.query_params.get("recent_hours"),
+            default=6,
+            maximum=48,
+        )
+        baseline_hours = _parse_positive_int(
+            "baseline_hours",
+            request.query_params.get("baseline_hours"),
+            default=72,
+            maximum=720,
+        )
+        rows = detect_sector_anomalies(
+            limit=limit,
+            recent_hours=recent_hours,
+            baseline_hours=baseline_hours,
+        )
+        serializer = SectorAnomalySerializer(rows, many=True)
+        return success_response(serializer.data)
+
+
 class StockSummaryApiView(BaseProtectedApiView):
     def get(self, request, symbol):
         stock = get_object_or_404(Stock, symbol=symbol.upper())
@@ -204,19 +343,7 @@ class StockSummaryApiView(BaseProtectedApiView):
             for row in prices
         ]
 
-        start_date = timezone.localdate() - timezone.timedelta(days=interest_days)
-        interest_by_day = (
-            stock.interest_records.filter(recorded_at__date__gte=start_date)
-            .annotate(day=TruncDate("recorded_at"))
-            .values("day")
-            .annotate(total_mentions=Sum("mentions"))
-            .order_by("day")
-        )
-        interest_chart_data = [
-            {"date": row["day"].isoformat(), "mentions": int(row["total_mentions"] or 0)}
-            for row in interest_by_day
-            if row["day"] is not None
-        ]
+        interest_chart_data = get_stock_daily_interest(stock, days=interest_days)
 
         payload = {
             "stock": {
@@ -241,6 +368,49 @@ class StockSummaryApiView(BaseProtectedApiView):
             "interest_chart_data": interest_chart_data,
             "news_items": get_related_news(stock_symbol=stock.symbol, limit=news_limit),
             "stock_anomaly": get_stock_interest_anomaly(stock=stock),
+            "related_stocks": get_related_stocks(stock=stock, limit=10),
         }
         serializer = StockSummarySerializer(payload)
         return success_response(serializer.data)
+
+
+class StockNewsHistoryApiView(BaseProtectedApiView):
+    def get(self, request, symbol):
+        stock = get_object_or_404(Stock, symbol=symbol.upper())
+        limit = _parse_positive_int(
+            "limit",
+            request.query_params.get("limit"),
+            default=50,
+            maximum=500,
+        )
+        before = _parse_date("before", request.query_params.get("before"))
+        end = None
+        if before:
+            end = _start_of_day(before)
+
+        rows = get_news_history(stock.symbol, end=end, limit=limit)
+        paginator = ApiPageNumberPagination()
+        page_rows = paginator.paginate_queryset(rows, request, view=self)
+        serializer = NewsHistoryItemSerializer(page_rows, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class NewsSearchApiView(BaseProtectedApiView):
+    def get(self, request):
+        query = (request.query_params.get("q") or "").strip()
+        if len(query) < 2 or len(query) > 100:
+            raise ValidationError({"q": ["Must be between 2 and 100 characters"]})
+        symbol = (request.query_params.get("symbol") or "").strip().upper() or None
+        date_from = _parse_date("from", request.query_params.get("from"))
+        date_to = _parse_date("to", request.query_params.get("to"))
+
+        queryset = search_news(
+            query,
+            symbol=symbol,
+            start=_start_of_day(date_from) if date_from else None,
+            end=_start_of_day(date_to + timedelta(days=1)) if date_to else None,
+        )
+        paginator = ApiCursorPagination()
+        page_rows = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = NewsSearchResultSerializer(page_rows, many=True)
+        return paginator.get_paginated_response(serializer.data)
@@ -7,6 +7,7 @@ from django.urls import reverse
 from django.utils import timezone
 
 from apps.stocks.models import Interest, Price, Stock
+from services.interest_service import refresh_sector_rollups
 
 
 class DashboardViewsTests(TestCase):
@@ -35,6 +36,7 @@ class DashboardViewsTests(TestCase):
             recorded_at=bucket_now,
             mentions=12,
         )
+        refresh_sector_rollups(bucket_now)
 
     def test_dashboard_home_renders_with_context_flags(self):
         response = self.client.get(reverse("dashboard:home"))
@@ -45,6 +47,7 @@ class DashboardViewsTests(TestCase):
         self.assertTrue(response.context["has_heatmap_data"])
         self.assertTrue(response.context["has_timeline_data"])
         self.assertIn("has_anomaly_data", response.context)
+        self.assertFalse(response.context["has_trending_data"])
 
     def test_dashboard_partials_return_200(self):
         partials = {
@@ -53,6 +56,7 @@ class DashboardViewsTests(TestCase):
             "dashboard:interest-heatmap-partial": "dashboard/_interest_heatmap_panel.html",
             "dashboard:interest-timeline-partial": "dashboard/_interest_timeline_panel.html",
             "dashboard:anomaly-alert-partial": "dashboard/_anomaly_alert_panel.html",
+            "dashboard:trending-terms-partial": "dashboard/_trending_terms_panel.html",
         }
 
         for name, template_name in partials.items():
@@ -138,7 +142,11 @@ class DashboardViewsTests(TestCase):
             patch("apps.dashboard.views.get_top_interest_stocks") as mock_top,
             patch("apps.dashboard.views.get_sector_interest_heatmap") as mock_heatmap,
             patch("apps.dashboard.views.get_interest_timeline") as mock_timeline,
-            patch("apps.dashboard.views.detect_interest_anomalies", return_value=[]) as mock_anomaly,
+            patch("apps.dashboard.views.detect_interest_anomalies") as mock_detect,
+            patch(
+                "apps.dashboard.views.get_current_interest_anomalies",
+                return_value=[],
+            ) as mock_anomaly,
         ):
             response = self.client.get(reverse("dashboard:anomaly-alert-partial"))
 
@@ -147,7 +155,23 @@ class DashboardViewsTests(TestCase):
         mock_top.assert_not_called()
         mock_heatmap.assert_not_called()
         mock_timeline.assert_not_called()
-        mock_anomaly.assert_called_once()
+        # Flat mode reads stored anomaly state instead of rescanning history.
+        mock_detect.assert_not_called()
+        mock_anomaly.assert_called_once_with(limit=8)
+
+    def test_anomaly_partial_passes_selected_mode_to_detector(self):
+        with patch(
+            "apps.dashboard.views.detect_interest_anomalies",
+            return_value=[],
+        ) as mock_anomaly:
+            response = self.client.get(
+                reverse("dashboard:anomaly-alert-partial"),
+                {"anomaly_mode": "seasonal"},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["anomaly_mode"], "seasonal")
+        mock_anomaly.assert_called_once_with(limit=8, mode="seasonal")
 
     def test_market_summary_partial_uses_cache_between_requests(self):
         with patch(
@@ -7,6 +7,7 @@ from .views import (
     interest_timeline_partial,
     market_summary_partial,
     top_interest_partial,
+    trending_terms_partial,
 )
 
 app_name = "dashboard"
@@ -18,4 +19,5 @@ urlpatterns = [
     path("partials/interest-heatmap/", interest_heatmap_partial, name="interest-heatmap-partial"),
     path("partials/interest-timeline/", interest_timeline_partial, name="interest-timeline-partial"),
     path("partials/anomaly-alert/", anomaly_alert_partial, name="anomaly-alert-partial"),
+    path("partials/trending-terms/", trending_terms_partial, name="trending-terms-partial"),
 ]
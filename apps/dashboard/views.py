@@ -3,12 +3,16 @@ from django.core.cache import cache
 from django.shortcuts import render
 
 from services.interest_service import (
+    ANOMALY_MODE_FLAT,
+    ANOMALY_MODES,
     detect_interest_anomalies,
+    get_current_interest_anomalies,
     get_interest_timeline,
     get_sector_interest_heatmap,
     get_top_interest_stocks,
 )
 from services.stock_service import get_market_summary
+from services.trending_terms import get_trending_terms
 
 
 def _cached_value(key, *, timeout, builder):
@@ -68,30 +72,57 @@ def _interest_timeline_context():
     }
 
 
-def _anomaly_alert_context():
+def _trending_terms_context():
+    trending_terms = _cached_value(
+        "dashboard:trending_terms:v1",
+        timeout=settings.CACHE_TTL_TRENDING_TERMS,
+        builder=lambda: get_trending_terms(hours=6, limit=20),
+    )
+    return {
+        "trending_terms": trending_terms,
+        "has_trending_data": len(trending_terms) > 0,
+    }
+
+
+def _anomaly_mode(request):
+    mode = request.GET.get("anomaly_mode", "").strip().lower()
+    return mode if mode in ANOMALY_MODES else ANOMALY_MODE_FLAT
+
+
+def _anomaly_alerts(mode):
+    if mode == ANOMALY_MODE_FLAT:
+        # Flat alerts are maintained incrementally; read the stored state.
+        return get_current_interest_anomalies(limit=8)
+    return detect_interest_anomalies(limit=8, mode=mode)
+
+
+def _anomaly_alert_context(mode=ANOMALY_MODE_FLAT):
     anomaly_alerts = _cached_value(
-        "dashboard:anomalies:v1",
+        f"dashboard:anomalies:{mode}:v2",
         timeout=settings.CACHE_TTL_ANOMALIES,
-        builder=lambda: detect_interest_anomalies(limit=8),
+        builder=lambda: _anomaly_alerts(mode),
     )
     return {
         "anomaly_alerts": anomaly_alerts,
         "has_anomaly_data": len(anomaly_alerts) > 0,
+        "anomaly_mode": mode,
+        "anomaly_modes": ANOMALY_MODES,
     }
 
 
-def _dashboard_context():
+def _dashboard_context(anomaly_mode=ANOMALY_MODE_FLAT):
     return {
         **_market_summary_context(),
         **_top_interest_context(),
-        **_anomaly_alert_context(),
+        **_anomaly_alert_context(anomaly_mode),
         **_interest_heatmap_context(),
         **_interest_timeline_context(),
+        **_trending_terms_context(),
     }
 
 
 def dashboard_home(request):
-    context = _dashboard_context()
+    context = _dashboard_context(anomaly_mode=_anomaly_mode(request))
     return render(request, "dashboard/index.html", context)
 
 
@@ -115,6 +146,11 @@ def interest_timeline_partial(request):
     return render(request, "dashboard/_interest_timeline_panel.html", context)
 
 
+def trending_terms_partial(request):
+    context = _trending_terms_context()
+    return render(request, "dashboard/_trending_terms_panel.html", context)
+
+
 def anomaly_alert_partial(request):
-    context = _anomaly_alert_context()
+    context = _anomaly_alert_context(_anomaly_mode(request))
     return render(request, "dashboard/_anomaly_alert_panel.html", context)
@@ -1,6 +1,13 @@
 from django.contrib import admin
 
-from .models import Interest, NewsItem, Price, Stock
+from .models import (
+    Interest,
+    InterestAnomalyState,
+    NewsItem,
+    Price,
+    SectorInterestRollup,
+    Stock,
+)
 
 
 @admin.register(Stock)
@@ -29,3 +36,17 @@ class NewsItemAdmin(admin.ModelAdmin):
     list_display = ("stock", "source", "publisher", "published_at", "created_at")
     list_filter = ("source", "publisher", "published_at")
     search_fields = ("stock__symbol", "title", "publisher")
+
+
+@admin.register(InterestAnomalyState)
+class InterestAnomalyStateAdmin(admin.ModelAdmin):
+    list_display = ("stock", "bucket_start", "recent_mentions", "surge_ratio", "z_score", "severity")
+    list_filter = ("is_anomalous", "severity")
+    search_fields = ("stock__symbol",)
+
+
+@admin.register(SectorInterestRollup)
+class SectorInterestRollupAdmin(admin.ModelAdmin):
+    list_display = ("sector", "bucket_start", "mentions", "stock_count", "updated_at")
+    list_filter = ("bucket_start",)
+    search_fields = ("sector",)
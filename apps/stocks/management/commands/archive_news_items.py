@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from services.news_archive import ARCHIVE_CHUNK_SIZE, archive_news_items
+
+
+class Command(BaseCommand):
+    help = "오래된 뉴스 항목을 월별 압축 NDJSON 아카이브로 옮기고 원본 테이블에서 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.NEWS_ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--chunk-size", type=int, default=ARCHIVE_CHUNK_SIZE)
+        parser.add_argument("--archive-dir", default=None)
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        chunk_size = options["chunk_size"]
+
+        if days < 1 or chunk_size < 1:
+            self.stderr.write(self.style.ERROR("--days와 --chunk-size는 1 이상이어야 합니다."))
+            return
+
+        result = archive_news_items(
+            older_than_days=days,
+            chunk_size=chunk_size,
+            root=options["archive_dir"],
+        )
+        if result["status"] != "success":
+            self.stderr.write(self.style.ERROR(f"news archive skipped: {result['message']}"))
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"news archived: rows={result['archived']}, before={result['archived_before']}"
+            )
+        )
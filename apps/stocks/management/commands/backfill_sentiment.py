@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from services.sentiment_backfill import (
+    SENTIMENT_BACKFILL_BATCH_SIZE,
+    backfill_interest_sentiment,
+    backfill_news_sentiment,
+)
+
+
+class Command(BaseCommand):
+    help = "감성 점수가 비어 있는 뉴스와 관심도 스냅샷을 프로세스 풀로 일괄 채점합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=int,
+            default=0,
+            help="최근 N시간만 채점합니다. 0이면 전체 기간을 대상으로 합니다.",
+        )
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=SENTIMENT_BACKFILL_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        hours = options["hours"]
+        if hours < 0:
+            self.stderr.write(self.style.ERROR("--hours는 0 이상이어야 합니다."))
+            return
+        if options["workers"] < 1 or options["batch_size"] < 1:
+            self.stderr.write(self.style.ERROR("--workers와 --batch-size는 1 이상이어야 합니다."))
+            return
+
+        since = timezone.now() - timedelta(hours=hours) if hours else None
+        kwargs = {"since": since, "workers": options["workers"], "batch_size": options["batch_size"]}
+        news = backfill_news_sentiment(**kwargs)
+        interest = backfill_interest_sentiment(**kwargs)
+        self.stdout.write(self.style.SUCCESS(f"sentiment backfilled: news={news}, interest={interest}"))
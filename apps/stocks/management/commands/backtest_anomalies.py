@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from services.anomaly_backtest import (
+    DEFAULT_HORIZON_HOURS,
+    DEFAULT_MOVE_THRESHOLD_PCT,
+    build_parameter_grid,
+    load_backtest_dataset,
+    run_backtest_grid,
+)
+
+
+def _int_list(raw):
+    try:
+        return [int(item) for item in raw.split(",") if item.strip()]
+    except ValueError as exc:
+        raise CommandError(f"정수 목록이 아닙니다: {raw}") from exc
+
+
+def _float_list(raw):
+    try:
+        return [float(item) for item in raw.split(",") if item.strip()]
+    except ValueError as exc:
+        raise CommandError(f"숫자 목록이 아닙니다: {raw}") from exc
+
+
+class Command(BaseCommand):
+    help = "과거 관심도 데이터로 이상 징후 임계치 조합을 백테스트합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30)
+        parser.add_argument("--symbols", nargs="*", default=None)
+        parser.add_argument("--recent-hours", default="6")
+        parser.add_argument("--baseline-hours", default="72")
+        parser.add_argument("--min-recent-mentions", default="8")
+        parser.add_argument("--min-surge-ratio", default="2.5")
+        parser.add_argument("--min-z-score", default="2.0")
+        parser.add_argument("--move-threshold", type=float, default=DEFAULT_MOVE_THRESHOLD_PCT)
+        parser.add_argument("--horizon-hours", type=int, default=DEFAULT_HORIZON_HOURS)
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--top", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if options["days"] < 1:
+            self.stderr.write(self.style.ERROR("--days는 1 이상이어야 합니다."))
+            return
+
+        grid = build_parameter_grid(
+            recent_hours=_int_list(options["recent_hours"]),
+            baseline_hours=_int_list(options["baseline_hours"]),
+            min_recent_mentions=_int_list(options["min_recent_mentions"]),
+            min_surge_ratio=_float_list(options["min_surge_ratio"]),
+            min_z_score=_float_list(options["min_z_score"]),
+        )
+        symbols = [symbol.upper() for symbol in options["symbols"]] if options["symbols"] else None
+        dataset = load_backtest_dataset(days=options["days"], symbols=symbols)
+        self.stdout.write(
+            f"dataset: stocks={len(dataset.symbols)}, hours={dataset.hour_count}, grid={len(grid)}"
+        )
+
+        results = run_backtest_grid(
+            dataset,
+            grid,
+            workers=options["workers"],
+            move_threshold_pct=options["move_threshold"],
+            horizon_hours=options["horizon_hours"],
+        )
+        for row in results[: options["top"]]:
+            self.stdout.write(
+                "recent={recent_hours} baseline={baseline_hours} "
+                "min_mentions={min_recent_mentions} surge={min_surge_ratio} z={min_z_score} "
+                "| alerts={alerts} hits={hits} hit_rate={hit_rate} "
+                "avg_lead_h={avg_lead_hours} median_lead_h={median_lead_hours}".format(**row)
+            )
+        self.stdout.write(self.style.SUCCESS(f"backtest completed: {len(results)} combinations"))
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from services.partition_service import manage_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "관심도 테이블의 월별 파티션을 미리 생성합니다. "
+        "보존 기간이 지난 파티션은 --detach(또는 --drop)를 지정할 때만 분리합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD)
+        parser.add_argument(
+            "--retention-months",
+            type=int,
+            default=settings.PARTITION_RETENTION_MONTHS,
+        )
+        parser.add_argument("--detach", action="store_true")
+        parser.add_argument("--drop", action="store_true", help="분리한 파티션을 삭제합니다.")
+
+    def handle(self, *args, **options):
+        months_ahead = options["months_ahead"]
+        retention_months = options["retention_months"]
+
+        if months_ahead < 0 or retention_months < 1:
+            self.stderr.write(
+                self.style.ERROR("--months-ahead는 0 이상, --retention-months는 1 이상이어야 합니다.")
+            )
+            return
+
+        result = manage_partitions(
+            months_ahead=months_ahead,
+            retention_months=retention_months,
+            # Dropping needs the partition detached first.
+            detach=options["detach"] or options["drop"],
+            drop=options["drop"],
+        )
+        if result["status"] == "skipped":
+            self.stdout.write(self.style.WARNING(result["message"]))
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"partitions managed: created={len(result['created'])}, "
+                f"detached={len(result['detached'])}"
+            )
+        )
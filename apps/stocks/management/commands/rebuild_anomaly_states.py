@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from apps.stocks.models import Stock
+from services.interest_service import ANOMALY_STATE_REBUILD_HOURS, rebuild_interest_anomaly_states
+
+
+class Command(BaseCommand):
+    help = "관심도 원천 기록을 재생하여 종목별 이상 징후 상태를 재구성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--symbols", nargs="*", default=None)
+        parser.add_argument("--hours", type=int, default=ANOMALY_STATE_REBUILD_HOURS)
+
+    def handle(self, *args, **options):
+        symbols = options["symbols"]
+        hours = options["hours"]
+
+        if hours < 1:
+            self.stderr.write(self.style.ERROR("--hours는 1 이상이어야 합니다."))
+            return
+
+        stock_ids = None
+        if symbols:
+            stock_ids = list(
+                Stock.objects.filter(symbol__in=[symbol.upper() for symbol in symbols]).values_list(
+                    "id",
+                    flat=True,
+                )
+            )
+
+        result = rebuild_interest_anomaly_states(stock_ids=stock_ids, hours=hours)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"anomaly states rebuilt: stocks={result['stocks']}, buckets={result['buckets']}"
+            )
+        )
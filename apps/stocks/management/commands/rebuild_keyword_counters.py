@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from services.topic_service import rebuild_keyword_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "저장된 뉴스 제목과 관심도 샘플로 종목별 시간 단위 키워드 카운터를 재구성합니다. "
+        "샘플은 INTEREST_RAW_RETENTION_HOURS 이후 압축되어 사라지므로 그보다 오래된 "
+        "구간은 재구성하지 않고 기존 카운터를 유지합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=72)
+
+    def handle(self, *args, **options):
+        hours = options["hours"]
+
+        if hours < 1:
+            self.stderr.write(self.style.ERROR("--hours는 1 이상이어야 합니다."))
+            return
+
+        end = timezone.now()
+        result = rebuild_keyword_counters(end - timedelta(hours=hours - 1), end)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"keyword counters rebuilt: since={result['start'].isoformat()}, "
+                f"buckets={result['buckets']}, rows={result['rows']}"
+            )
+        )
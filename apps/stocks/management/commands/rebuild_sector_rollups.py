@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from services.interest_service import refresh_sector_rollups
+
+
+class Command(BaseCommand):
+    help = "관심도 원천 기록으로 섹터별 시간 단위 집계를 재구성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=24 * 14)
+
+    def handle(self, *args, **options):
+        hours = options["hours"]
+
+        if hours < 1:
+            self.stderr.write(self.style.ERROR("--hours는 1 이상이어야 합니다."))
+            return
+
+        end = timezone.now()
+        result = refresh_sector_rollups(end - timedelta(hours=hours - 1), end)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"sector rollups rebuilt: buckets={result['buckets']}, rows={result['rows']}"
+            )
+        )
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.11 on 2026-10-19 07:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0005_newsitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterestAnomalyState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField()),
+                ('recent_window', models.JSONField(blank=True, default=list)),
+                ('baseline_mean', models.FloatField(default=0.0)),
+                ('baseline_var', models.FloatField(default=0.0)),
+                ('baseline_count', models.PositiveIntegerField(default=0)),
+                ('recent_mentions', models.PositiveIntegerField(default=0)),
+                ('expected_mentions', models.PositiveIntegerField(default=0)),
+                ('surge_ratio', models.FloatField(default=0.0)),
+                ('z_score', models.FloatField(default=0.0)),
+                ('severity', models.CharField(blank=True, max_length=8)),
+                ('is_anomalous', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='anomaly_state', to='stocks.stock')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['is_anomalous', 'bucket_start'], name='stocks_inte_is_anom_b2c0c7_idx')],
+            },
+        ),
+    ]
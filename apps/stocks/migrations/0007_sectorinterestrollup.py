@@ -0,0 +1,29 @@
+# Generated by Django 5.2.11 on 2026-10-19 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0006_interestanomalystate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SectorInterestRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sector', models.CharField(max_length=64)),
+                ('bucket_start', models.DateTimeField()),
+                ('mentions', models.PositiveIntegerField(default=0)),
+                ('stock_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-bucket_start', 'sector'],
+                'indexes': [models.Index(fields=['bucket_start', 'sector'], name='stocks_sect_bucket__8ab146_idx')],
+                'unique_together': {('sector', 'bucket_start')},
+            },
+        ),
+    ]
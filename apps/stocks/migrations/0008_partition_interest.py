@@ -0,0 +1,95 @@
+from datetime import date, datetime, time
+
+from django.db import migrations
+from django.utils import timezone
+
+TABLE = "stocks_interest"
+LEGACY_TABLE = "stocks_interest_unpartitioned"
+INITIAL_MONTHS_AHEAD = 3
+RECORDED_SOURCE_INDEX = "stocks_inte_recorde_9ab332_idx"
+# Name Django gives the Interest.stock FK index; LIKE does not copy indexes.
+STOCK_FK_INDEX = "stocks_interest_stock_id_380cfa04"
+
+
+# Frozen copies of the partition helpers, so later service changes cannot
+# alter what this migration does.
+def _month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _month_bound(month):
+    return timezone.make_aware(datetime.combine(month, time.min), timezone.get_current_timezone())
+
+
+def create_month_partition(cursor, table, month):
+    name = f"{table}_p{month:%Y%m}"
+    lower = _month_bound(month).isoformat()
+    upper = _month_bound(_add_months(month, 1)).isoformat()
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    )
+    return name
+
+
+def partition_interest_table(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY_TABLE}"')
+        cursor.execute(f"ALTER INDEX {RECORDED_SOURCE_INDEX} RENAME TO {RECORDED_SOURCE_INDEX}_old")
+        cursor.execute(
+            f'CREATE TABLE "{TABLE}" ('
+            f'LIKE "{LEGACY_TABLE}" INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS'
+            ") PARTITION BY RANGE (recorded_at)"
+        )
+        # The partition key must be part of every unique index on the parent.
+        cursor.execute(
+            f'ALTER TABLE "{TABLE}" ADD CONSTRAINT stocks_interest_partitioned_pkey '
+            "PRIMARY KEY (id, recorded_at)"
+        )
+        cursor.execute(
+            f'ALTER TABLE "{TABLE}" ADD CONSTRAINT stocks_interest_stock_id_fk_partitioned '
+            'FOREIGN KEY (stock_id) REFERENCES "stocks_stock" (id) DEFERRABLE INITIALLY DEFERRED'
+        )
+        cursor.execute(f'CREATE INDEX {STOCK_FK_INDEX} ON "{TABLE}" (stock_id)')
+        cursor.execute(
+            f'CREATE INDEX stocks_interest_stock_recorded_idx ON "{TABLE}" (stock_id, recorded_at)'
+        )
+        cursor.execute(
+            f'CREATE INDEX {RECORDED_SOURCE_INDEX} ON "{TABLE}" (recorded_at, source)'
+        )
+
+        cursor.execute(f'SELECT MIN(recorded_at) FROM "{LEGACY_TABLE}"')
+        earliest = cursor.fetchone()[0] or timezone.now()
+        month = _month_start(timezone.localtime(earliest))
+        last_month = _add_months(_month_start(timezone.localtime()), INITIAL_MONTHS_AHEAD)
+        while month <= last_month:
+            create_month_partition(cursor, TABLE, month)
+            month = _add_months(month, 1)
+        cursor.execute(f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT')
+
+        cursor.execute(f'INSERT INTO "{TABLE}" OVERRIDING SYSTEM VALUE SELECT * FROM "{LEGACY_TABLE}"')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+            f'COALESCE((SELECT MAX(id) FROM "{TABLE}"), 0) + 1, false)'
+        )
+        cursor.execute(f'DROP TABLE "{LEGACY_TABLE}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stocks", "0007_sectorinterestrollup"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_interest_table, migrations.RunPython.noop),
+    ]
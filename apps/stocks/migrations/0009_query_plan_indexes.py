@@ -0,0 +1,43 @@
+# Generated by Django 5.2.11 on 2026-10-19 07:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0008_partition_interest'),
+    ]
+
+    operations = [
+        # Superseded by the covering (stock, recorded_at, mentions) index below;
+        # only present on databases where 0008 partitioned the table.
+        migrations.RunSQL(
+            "DROP INDEX IF EXISTS stocks_interest_stock_recorded_idx",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RemoveIndex(
+            model_name='interestanomalystate',
+            name='stocks_inte_is_anom_b2c0c7_idx',
+        ),
+        migrations.AddIndex(
+            model_name='interest',
+            index=models.Index(fields=['stock', 'recorded_at', 'mentions'], name='stocks_inte_stock_i_6e6fc6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interestanomalystate',
+            index=models.Index(condition=models.Q(('is_anomalous', True)), fields=['bucket_start'], name='stocks_anomaly_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsitem',
+            index=models.Index(fields=['stock', 'created_at'], name='stocks_news_stock_i_084163_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsitem',
+            index=models.Index(fields=['created_at'], name='stocks_news_created_31b30d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stock',
+            index=models.Index(fields=['is_active', 'symbol'], name='stocks_stoc_is_acti_f1ad50_idx'),
+        ),
+    ]
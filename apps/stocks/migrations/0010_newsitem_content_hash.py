@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 07:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0009_query_plan_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsitem',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.11 on 2026-10-19 07:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0010_newsitem_content_hash'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='newsitem',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='newsitem',
+            name='canonical_url',
+            field=models.URLField(blank=True, max_length=500),
+        ),
+        migrations.AddField(
+            model_name='newsitem',
+            name='url_hash',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+    ]
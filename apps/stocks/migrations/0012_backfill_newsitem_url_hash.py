@@ -0,0 +1,114 @@
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.db import migrations, transaction
+from django.db.models import Count, Min
+
+BACKFILL_CHUNK_SIZE = 1000
+
+# Frozen copy of services.url_canonicalizer as of this migration, so later
+# canonicalization changes cannot alter what it backfilled.
+TRACKING_PARAMS = {
+    "_ga",
+    "cmpid",
+    "dclid",
+    "fbclid",
+    "gclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "msclkid",
+    "oc",
+    "ref",
+    "ref_src",
+    "spm",
+    "yclid",
+}
+TRACKING_PREFIXES = ("utm_",)
+GOOGLE_REDIRECT_HOSTS = {"google.com", "www.google.com", "news.google.com"}
+GOOGLE_REDIRECT_PATHS = {"/url", "/news/url"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking_param(name):
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url):
+    url = (url or "").strip()
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    query = parse_qsl(parts.query, keep_blank_values=True)
+
+    if host in GOOGLE_REDIRECT_HOSTS and parts.path in GOOGLE_REDIRECT_PATHS:
+        target = dict(query).get("url") or dict(query).get("q")
+        if target and target.startswith(("http://", "https://")):
+            return canonicalize_url(target)
+
+    path = parts.path or "/"
+    if host == "news.google.com":
+        if path.startswith("/rss/articles/"):
+            path = path[len("/rss") :]
+        query = []
+
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    kept = sorted((name, value) for name, value in query if not _is_tracking_param(name))
+    return urlunsplit((scheme, netloc, path, urlencode(kept), ""))
+
+
+def url_hash(canonical_url):
+    return hashlib.sha1(canonical_url.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def backfill_url_hash(apps, schema_editor):
+    NewsItem = apps.get_model("stocks", "NewsItem")
+
+    last_id = 0
+    while True:
+        chunk = list(
+            NewsItem.objects.filter(id__gt=last_id).order_by("id").only("id", "url")[
+                :BACKFILL_CHUNK_SIZE
+            ]
+        )
+        if not chunk:
+            break
+        for item in chunk:
+            item.canonical_url = canonicalize_url(item.url)[:500]
+            item.url_hash = url_hash(item.canonical_url)
+        with transaction.atomic():
+            NewsItem.objects.bulk_update(chunk, ["canonical_url", "url_hash"])
+        last_id = chunk[-1].id
+
+    # Tracking-URL variants of one article now share a key; keep the oldest row.
+    duplicates = (
+        NewsItem.objects.values("stock_id", "url_hash")
+        .annotate(row_count=Count("id"), keep_id=Min("id"))
+        .filter(row_count__gt=1)
+    )
+    for group in duplicates.iterator():
+        with transaction.atomic():
+            NewsItem.objects.filter(
+                stock_id=group["stock_id"],
+                url_hash=group["url_hash"],
+            ).exclude(id=group["keep_id"]).delete()
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("stocks", "0011_newsitem_url_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_url_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stocks", "0012_backfill_newsitem_url_hash"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="newsitem",
+            unique_together={("stock", "url_hash")},
+        ),
+    ]
@@ -0,0 +1,74 @@
+from django.db import migrations
+
+SQLITE_FTS_TABLE = "stocks_newsitem_fts"
+POSTGRES_TRGM_INDEX = "stocks_newsitem_title_trgm_idx"
+
+SQLITE_FORWARD = [
+    f"""
+    CREATE VIRTUAL TABLE {SQLITE_FTS_TABLE} USING fts5(
+        title,
+        content='stocks_newsitem',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER stocks_newsitem_fts_ai AFTER INSERT ON stocks_newsitem BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    f"""
+    CREATE TRIGGER stocks_newsitem_fts_ad AFTER DELETE ON stocks_newsitem BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title)
+        VALUES ('delete', old.id, old.title);
+    END
+    """,
+    f"""
+    CREATE TRIGGER stocks_newsitem_fts_au AFTER UPDATE OF title ON stocks_newsitem BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title)
+        VALUES ('delete', old.id, old.title);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS stocks_newsitem_fts_au",
+    "DROP TRIGGER IF EXISTS stocks_newsitem_fts_ad",
+    "DROP TRIGGER IF EXISTS stocks_newsitem_fts_ai",
+    f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}",
+]
+# Matches the UPPER(title::text) LIKE UPPER(...) that icontains compiles to, and
+# trigrams work on Hangul without a language-specific dictionary.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""
+    CREATE INDEX IF NOT EXISTS {POSTGRES_TRGM_INDEX}
+    ON stocks_newsitem USING gin (UPPER(title::text) gin_trgm_ops)
+    """,
+]
+POSTGRES_REVERSE = [f"DROP INDEX IF EXISTS {POSTGRES_TRGM_INDEX}"]
+
+
+def _run(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_title_search_index(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD})
+
+
+def drop_title_search_index(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_REVERSE, "postgresql": POSTGRES_REVERSE})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stocks", "0013_alter_newsitem_unique_together"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_title_search_index, drop_title_search_index),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.11 on 2026-10-19 07:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0014_newsitem_title_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsitem',
+            name='cluster_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='newsitem',
+            name='simhash',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='HeadlineSignature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('value', models.PositiveIntegerField()),
+                ('simhash', models.BigIntegerField()),
+                ('cluster_id', models.BigIntegerField()),
+                ('seen_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'value'], name='stocks_head_band_0d6941_idx'), models.Index(fields=['seen_at'], name='stocks_head_seen_at_3dfed0_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,150 @@
+import hashlib
+import re
+from collections import defaultdict, deque
+from datetime import timedelta
+
+from django.db import migrations, transaction
+from django.utils import timezone
+
+BACKFILL_CHUNK_SIZE = 1000
+# Frozen copies of services.simhash and the clustering window as of this
+# migration, so later service changes cannot alter what it backfilled.
+CLUSTER_WINDOW = timedelta(hours=72)
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+SIMHASH_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+SIMHASH_SHINGLE = 3
+SIMHASH_NUMBER_WEIGHT = 4
+SIMHASH_MAX_DISTANCE = SIMHASH_BANDS - 1
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+_PUBLISHER_SUFFIX = re.compile(r"\s+[-–|]\s+[^-–|]{1,40}$")
+_BAND_MASK = (1 << SIMHASH_BAND_BITS) - 1
+_SIGN_BIT = 1 << (SIMHASH_BITS - 1)
+_UNSIGNED_MASK = (1 << SIMHASH_BITS) - 1
+
+
+def _features(text):
+    text = _PUBLISHER_SUFFIX.sub("", (text or "").strip())
+    normalized = _NON_WORD.sub(" ", text.lower()).strip()
+    if not normalized:
+        return []
+    features = [
+        (normalized[index : index + SIMHASH_SHINGLE], 1)
+        for index in range(max(len(normalized) - SIMHASH_SHINGLE + 1, 1))
+    ]
+    features.extend(
+        (f"#{token}", SIMHASH_NUMBER_WEIGHT)
+        for token in normalized.split()
+        if any(char.isdigit() for char in token)
+    )
+    return features
+
+
+def simhash(text):
+    counters = [0] * SIMHASH_BITS
+    for feature, weight in _features(text):
+        value = int.from_bytes(
+            hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(SIMHASH_BITS):
+            counters[bit] += weight if value >> bit & 1 else -weight
+
+    signature = 0
+    for bit, weight in enumerate(counters):
+        if weight > 0:
+            signature |= 1 << bit
+    return signature - (1 << SIMHASH_BITS) if signature & _SIGN_BIT else signature
+
+
+def band_values(signature):
+    unsigned = signature & _UNSIGNED_MASK
+    return [
+        (band, unsigned >> (band * SIMHASH_BAND_BITS) & _BAND_MASK)
+        for band in range(SIMHASH_BANDS)
+    ]
+
+
+class WindowedHeadlineIndex:
+    """LSH over SimHash bands holding only signatures seen within the window,
+    mirroring what ingestion could match against at each row's insert time."""
+
+    def __init__(self):
+        self._buckets = defaultdict(set)
+        self._clusters = {}
+        self._seen = deque()
+
+    def expire(self, now):
+        while self._seen and self._seen[0][0] < now - CLUSTER_WINDOW:
+            _, signature = self._seen.popleft()
+            self._clusters.pop(signature, None)
+            for key in band_values(signature):
+                self._buckets[key].discard(signature)
+
+    def assign(self, signature, seen_at):
+        """Return ``(cluster_id, is_new)`` for a headline seen at ``seen_at``."""
+        self.expire(seen_at)
+        if signature in self._clusters:
+            return self._clusters[signature], False
+        best = None
+        for key in band_values(signature):
+            for candidate in self._buckets.get(key, ()):
+                distance = ((signature ^ candidate) & _UNSIGNED_MASK).bit_count()
+                if distance <= SIMHASH_MAX_DISTANCE and (best is None or distance < best[0]):
+                    best = (distance, self._clusters[candidate])
+        cluster_id = best[1] if best else signature
+        self._clusters[signature] = cluster_id
+        self._seen.append((seen_at, signature))
+        for key in band_values(signature):
+            self._buckets[key].add(signature)
+        return cluster_id, True
+
+
+def backfill_clusters(apps, schema_editor):
+    NewsItem = apps.get_model("stocks", "NewsItem")
+    HeadlineSignature = apps.get_model("stocks", "HeadlineSignature")
+
+    # Rows are replayed in insert order so each cluster is named after its
+    # oldest headline within the window, as ingestion would have done.
+    index = WindowedHeadlineIndex()
+    window_start = timezone.now() - CLUSTER_WINDOW
+    last_id = 0
+    while True:
+        chunk = list(
+            NewsItem.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "title", "created_at")[:BACKFILL_CHUNK_SIZE]
+        )
+        if not chunk:
+            break
+        signatures = []
+        for item in chunk:
+            item.simhash = simhash(item.title)
+            item.cluster_id, is_new = index.assign(item.simhash, item.created_at)
+            if is_new and item.created_at >= window_start:
+                signatures.extend(
+                    HeadlineSignature(
+                        band=band,
+                        value=value,
+                        simhash=item.simhash,
+                        cluster_id=item.cluster_id,
+                        seen_at=item.created_at,
+                    )
+                    for band, value in band_values(item.simhash)
+                )
+        with transaction.atomic():
+            NewsItem.objects.bulk_update(chunk, ["simhash", "cluster_id"])
+            HeadlineSignature.objects.bulk_create(signatures)
+        last_id = chunk[-1].id
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("stocks", "0015_newsitem_cluster"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_clusters, migrations.RunPython.noop),
+    ]
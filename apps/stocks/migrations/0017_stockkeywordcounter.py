@@ -0,0 +1,28 @@
+# Generated by Django 5.2.11 on 2026-10-19 07:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0016_backfill_newsitem_cluster'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockKeywordCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField()),
+                ('keyword', models.CharField(max_length=64)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keyword_counters', to='stocks.stock')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['stock', 'bucket_start'], name='stocks_stoc_stock_i_0287c9_idx'), models.Index(fields=['bucket_start'], name='stocks_stoc_bucket__83d683_idx')],
+                'unique_together': {('stock', 'bucket_start', 'keyword')},
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.11 on 2026-10-19 07:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0017_stockkeywordcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockTopicKeyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=64)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('score', models.FloatField(default=0.0)),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('computed_at', models.DateTimeField()),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='topic_keywords', to='stocks.stock')),
+            ],
+            options={
+                'ordering': ['stock', 'rank'],
+                'indexes': [models.Index(fields=['stock', 'rank'], name='stocks_stoc_stock_i_377dc3_idx')],
+                'unique_together': {('stock', 'keyword')},
+            },
+        ),
+    ]
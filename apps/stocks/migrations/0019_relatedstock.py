@@ -0,0 +1,31 @@
+# Generated by Django 5.2.11 on 2026-10-19 07:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0018_stocktopickeyword'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedStock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('co_mentions', models.PositiveIntegerField(default=0)),
+                ('pmi', models.FloatField(default=0.0)),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('computed_at', models.DateTimeField()),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='stocks.stock')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_stocks', to='stocks.stock')),
+            ],
+            options={
+                'ordering': ['stock', 'rank'],
+                'indexes': [models.Index(fields=['stock', 'rank'], name='stocks_rela_stock_i_4eafc9_idx')],
+                'unique_together': {('stock', 'related')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 08:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0019_relatedstock'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsitem',
+            name='sentiment',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.11 on 2026-10-19 08:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0020_newsitem_sentiment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterestUniqueSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('reddit', 'Reddit'), ('naver', 'Naver'), ('news', 'News')], max_length=16)),
+                ('bucket_start', models.DateTimeField()),
+                ('registers', models.BinaryField()),
+                ('estimate', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='unique_sketches', to='stocks.stock')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['stock', 'bucket_start'], name='stocks_inte_stock_i_6cdc4d_idx'), models.Index(fields=['bucket_start'], name='stocks_inte_bucket__d0a32f_idx')],
+                'unique_together': {('stock', 'source', 'bucket_start')},
+            },
+        ),
+    ]
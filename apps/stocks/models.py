@@ -16,6 +16,7 @@ class Stock(models.Model):
 
     class Meta:
         ordering = ["symbol"]
+        indexes = [models.Index(fields=["is_active", "symbol"])]
 
     def __str__(self):
         return f"{self.symbol} ({self.market})"
@@ -58,7 +59,11 @@ class Interest(models.Model):
 
     class Meta:
         ordering = ["-recorded_at", "-id"]
-        indexes = [models.Index(fields=["recorded_at", "source"])]
+        indexes = [
+            models.Index(fields=["recorded_at", "source"]),
+            # Covers per-stock window sums without touching the heap.
+            models.Index(fields=["stock", "recorded_at", "mentions"]),
+        ]
 
 
 class NewsItem(models.Model):
@@ -69,16 +74,169 @@ class NewsItem(models.Model):
     source = models.CharField(max_length=16, choices=Source.choices, default=Source.NEWS)
     title = models.CharField(max_length=300)
     url = models.URLField(max_length=500)
+    canonical_url = models.URLField(max_length=500, blank=True)
+    url_hash = models.CharField(max_length=40, blank=True)
     publisher = models.CharField(max_length=120, blank=True)
     published_at = models.DateTimeField(blank=True, null=True)
     metadata = models.JSONField(default=dict, blank=True)
+    content_hash = models.CharField(max_length=40, blank=True)
+    simhash = models.BigIntegerField(blank=True, null=True)
+    cluster_id = models.BigIntegerField(blank=True, null=True)
+    sentiment = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        blank=True,
+        null=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-published_at", "-id"]
-        unique_together = ("stock", "url")
+        unique_together = ("stock", "url_hash")
         indexes = [
             models.Index(fields=["stock", "published_at"]),
             models.Index(fields=["source", "published_at"]),
+            models.Index(fields=["stock", "created_at"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+
+class HeadlineSignature(models.Model):
+    """One LSH band of a recent headline SimHash, pointing at its cluster."""
+
+    band = models.PositiveSmallIntegerField()
+    value = models.PositiveIntegerField()
+    simhash = models.BigIntegerField()
+    cluster_id = models.BigIntegerField()
+    seen_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["band", "value"]),
+            models.Index(fields=["seen_at"]),
+        ]
+
+    def __str__(self):
+        return f"band {self.band}={self.value} -> cluster {self.cluster_id}"
+
+
+class InterestAnomalyState(models.Model):
+    stock = models.OneToOneField(
+        Stock,
+        related_name="anomaly_state",
+        on_delete=models.CASCADE,
+    )
+    bucket_start = models.DateTimeField()
+    recent_window = models.JSONField(default=list, blank=True)
+    baseline_mean = models.FloatField(default=0.0)
+    baseline_var = models.FloatField(default=0.0)
+    baseline_count = models.PositiveIntegerField(default=0)
+    recent_mentions = models.PositiveIntegerField(default=0)
+    expected_mentions = models.PositiveIntegerField(default=0)
+    surge_ratio = models.FloatField(default=0.0)
+    z_score = models.FloatField(default=0.0)
+    severity = models.CharField(max_length=8, blank=True)
+    is_anomalous = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["bucket_start"],
+                condition=models.Q(is_anomalous=True),
+                name="stocks_anomaly_active_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.stock.symbol} anomaly state @ {self.bucket_start}"
+
+
+class SectorInterestRollup(models.Model):
+    sector = models.CharField(max_length=64)
+    bucket_start = models.DateTimeField()
+    mentions = models.PositiveIntegerField(default=0)
+    stock_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-bucket_start", "sector"]
+        unique_together = ("sector", "bucket_start")
+        indexes = [models.Index(fields=["bucket_start", "sector"])]
+
+    def __str__(self):
+        return f"{self.sector} @ {self.bucket_start}: {self.mentions}"
+
+
+class InterestUniqueSketch(models.Model):
+    """HyperLogLog registers of distinct authors/posts per stock, source and hour."""
+
+    stock = models.ForeignKey(Stock, related_name="unique_sketches", on_delete=models.CASCADE)
+    source = models.CharField(max_length=16, choices=Interest.Source.choices)
+    bucket_start = models.DateTimeField()
+    registers = models.BinaryField()
+    # The hour's own estimate, kept so hourly series sum without loading registers.
+    estimate = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("stock", "source", "bucket_start")
+        indexes = [
+            models.Index(fields=["stock", "bucket_start"]),
+            models.Index(fields=["bucket_start"]),
+        ]
+
+    def __str__(self):
+        return f"{self.stock.symbol} {self.source} @ {self.bucket_start}: ~{self.estimate}"
+
+
+class StockKeywordCounter(models.Model):
+    stock = models.ForeignKey(Stock, related_name="keyword_counters", on_delete=models.CASCADE)
+    bucket_start = models.DateTimeField()
+    keyword = models.CharField(max_length=64)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("stock", "bucket_start", "keyword")
+        indexes = [
+            models.Index(fields=["stock", "bucket_start"]),
+            models.Index(fields=["bucket_start"]),
         ]
+
+    def __str__(self):
+        return f"{self.stock.symbol} {self.keyword} @ {self.bucket_start}: {self.count}"
+
+
+class StockTopicKeyword(models.Model):
+    stock = models.ForeignKey(Stock, related_name="topic_keywords", on_delete=models.CASCADE)
+    keyword = models.CharField(max_length=64)
+    count = models.PositiveIntegerField(default=0)
+    score = models.FloatField(default=0.0)
+    rank = models.PositiveSmallIntegerField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["stock", "rank"]
+        unique_together = ("stock", "keyword")
+        indexes = [models.Index(fields=["stock", "rank"])]
+
+    def __str__(self):
+        return f"{self.stock.symbol} #{self.rank} {self.keyword} ({self.score:.4f})"
+
+
+class RelatedStock(models.Model):
+    stock = models.ForeignKey(Stock, related_name="related_stocks", on_delete=models.CASCADE)
+    related = models.ForeignKey(Stock, related_name="+", on_delete=models.CASCADE)
+    co_mentions = models.PositiveIntegerField(default=0)
+    pmi = models.FloatField(default=0.0)
+    rank = models.PositiveSmallIntegerField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["stock", "rank"]
+        unique_together = ("stock", "related")
+        indexes = [models.Index(fields=["stock", "rank"])]
+
+    def __str__(self):
+        return f"{self.stock.symbol} ~ {self.related.symbol} (pmi {self.pmi:.3f})"
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from services.news_clustering import assign_headline_clusters
+from services.sentiment import score_title, to_sentiment_decimal
+from services.simhash import simhash
+from services.tokenizer import invalidate_stock_stopwords
+from services.url_canonicalizer import canonicalize_url, url_hash
+
+from .models import NewsItem, Stock
+
+
+@receiver(post_save, sender=Stock)
+@receiver(post_delete, sender=Stock)
+def drop_cached_stock_stopwords(sender, instance, **kwargs):
+    invalidate_stock_stopwords(instance.pk)
+
+
+@receiver(pre_save, sender=NewsItem)
+def fill_news_item_derived_fields(sender, instance, **kwargs):
+    # Single saves outside the ingest path; values set by the caller are kept.
+    if not instance.url_hash:
+        instance.canonical_url = canonicalize_url(instance.url)[:500]
+        instance.url_hash = url_hash(instance.canonical_url)
+    if instance.cluster_id is None:
+        assign_headline_clusters([instance])
+    elif instance.simhash is None:
+        instance.simhash = simhash(instance.title)
+    if instance.sentiment is None:
+        instance.sentiment = to_sentiment_decimal(score_title(instance.title))
@@ -0,0 +1,47 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+from services.interest_compaction import compact_interest_snapshots
+from services.partition_service import manage_partitions
+from services.related_stocks import compute_related_stocks
+from services.topic_service import compute_topic_keywords, prune_keyword_counters
+from services.unique_mentions import prune_unique_sketches
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def manage_partitions_task():
+    # Expired partitions hold raw history; dropping them must be opted into.
+    retire = settings.PARTITION_DROP_EXPIRED
+    result = manage_partitions(detach=retire, drop=retire)
+    if result.get("status") == "skipped":
+        logger.info("Partition maintenance skipped: %s", result.get("message"))
+    return result
+
+
+@shared_task
+def compact_interest_task():
+    return compact_interest_snapshots()
+
+
+@shared_task
+def prune_keyword_counters_task():
+    return {"deleted": prune_keyword_counters()}
+
+
+@shared_task
+def prune_unique_sketches_task():
+    return {"deleted": prune_unique_sketches()}
+
+
+@shared_task
+def compute_topic_keywords_task():
+    return compute_topic_keywords()
+
+
+@shared_task
+def compute_related_stocks_task():
+    return compute_related_stocks()
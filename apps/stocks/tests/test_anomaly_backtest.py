@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.stocks.models import Interest, Price, Stock
+from services.anomaly_backtest import (
+    BacktestDataset,
+    build_parameter_grid,
+    compute_anomaly_flags,
+    evaluate_parameters,
+    load_backtest_dataset,
+    run_backtest_grid,
+)
+from services.interest_service import detect_interest_anomalies
+
+
+class AnomalyBacktestTests(TestCase):
+    def setUp(self):
+        self.stock = Stock.objects.create(
+            symbol="BACK",
+            name="Backtest Corp",
+            market=Stock.Market.USA,
+            sector="Tech",
+            is_active=True,
+        )
+
+    def _seed_surge(self):
+        now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        for hours_ago in range(6, 78):
+            Interest.objects.create(
+                stock=self.stock,
+                source=Interest.Source.REDDIT,
+                recorded_at=now - timedelta(hours=hours_ago),
+                mentions=1 + hours_ago % 2,
+            )
+        for hours_ago in range(0, 6):
+            Interest.objects.create(
+                stock=self.stock,
+                source=Interest.Source.REDDIT,
+                recorded_at=now - timedelta(hours=hours_ago),
+                mentions=12,
+            )
+
+    def test_flags_at_latest_hour_match_live_detector(self):
+        self._seed_surge()
+
+        dataset = load_backtest_dataset(days=4)
+        flags = compute_anomaly_flags(dataset.series)
+        live = detect_interest_anomalies(limit=5)
+
+        self.assertEqual(dataset.symbols, ["BACK"])
+        self.assertEqual([row["symbol"] for row in live], ["BACK"])
+        self.assertTrue(flags[0][-1])
+        self.assertFalse(any(flags[0][: 6 + 72 - 1]))
+
+    def test_evaluate_parameters_counts_alert_onsets_and_lead_time(self):
+        series = [[1] * 80 + [20] * 6 + [1] * 20]
+        dataset = BacktestDataset(
+            start=timezone.now(),
+            symbols=["BACK"],
+            series=series,
+            price_moves=[[(60, 5.0), (95, -4.2), (100, 0.5)]],
+        )
+
+        result = evaluate_parameters(dataset, build_parameter_grid()[0])
+
+        self.assertEqual(result["alerts"], 1)
+        self.assertEqual(result["hits"], 1)
+        self.assertEqual(result["hit_rate"], 1.0)
+        self.assertEqual(result["avg_lead_hours"], 15)
+
+    def test_run_backtest_grid_matches_between_process_pool_and_inline(self):
+        series = [[1 + (hour % 3) for hour in range(120)] + [25] * 4, [2] * 124]
+        dataset = BacktestDataset(
+            start=timezone.now(),
+            symbols=["A", "B"],
+            series=series,
+            price_moves=[[(122, 6.0)], []],
+        )
+        grid = build_parameter_grid(min_recent_mentions=(8, 200), min_surge_ratio=(2.0, 3.0))
+
+        inline = run_backtest_grid(dataset, grid, workers=1)
+        pooled = run_backtest_grid(dataset, grid, workers=2)
+
+        self.assertEqual(inline, pooled)
+        self.assertEqual(len(inline), 4)
+        self.assertEqual(inline[0]["hits"], 1)
+
+    def test_load_backtest_dataset_places_price_moves_after_market_close(self):
+        today = timezone.localdate()
+        Price.objects.create(
+            stock=self.stock,
+            traded_at=today - timedelta(days=2),
+            open_price=Decimal("100"),
+            high_price=Decimal("100"),
+            low_price=Decimal("100"),
+            close_price=Decimal("100"),
+            volume=1,
+        )
+        Price.objects.create(
+            stock=self.stock,
+            traded_at=today - timedelta(days=1),
+            open_price=Decimal("100"),
+            high_price=Decimal("110"),
+            low_price=Decimal("100"),
+            close_price=Decimal("110"),
+            volume=1,
+        )
+
+        dataset = load_backtest_dataset(days=5)
+
+        self.assertEqual(len(dataset.price_moves[0]), 1)
+        hour_index, change = dataset.price_moves[0][0]
+        self.assertEqual(change, 10.0)
+        moved_at = dataset.start + timedelta(hours=hour_index)
+        self.assertIsInstance(moved_at, datetime)
+        self.assertGreater(moved_at, dataset.start)
+
+    def test_backtest_command_reports_grid_results(self):
+        self._seed_surge()
+        out = StringIO()
+
+        call_command(
+            "backtest_anomalies",
+            "--days",
+            "4",
+            "--min-surge-ratio",
+            "2.0,3.0",
+            stdout=out,
+        )
+
+        output = out.getvalue()
+        self.assertIn("grid=2", output)
+        self.assertIn("backtest completed: 2 combinations", output)
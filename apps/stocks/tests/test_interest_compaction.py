@@ -0,0 +1,60 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.stocks.models import Interest, Stock
+from services.interest_compaction import compact_interest_snapshots
+
+
+class InterestCompactionTests(TestCase):
+    def setUp(self):
+        self.stock = Stock.objects.create(symbol="CMPT", name="Compact Inc", is_active=True)
+        self.now = timezone.now().replace(minute=30, second=0, microsecond=0)
+
+    def _interest(self, recorded_at, mentions, sentiment=None, source=Interest.Source.REDDIT):
+        return Interest.objects.create(
+            stock=self.stock,
+            source=source,
+            recorded_at=recorded_at,
+            mentions=mentions,
+            sentiment_score=sentiment,
+            metadata={"samples": [{"title": "sample"}]},
+        )
+
+    def test_aged_raw_snapshots_fold_into_hourly_rows(self):
+        old_hour = (self.now - timedelta(hours=100)).replace(minute=0)
+        self._interest(old_hour + timedelta(minutes=5), 3, Decimal("1.00"))
+        self._interest(old_hour + timedelta(minutes=40), 1, Decimal("-1.00"))
+        self._interest(old_hour + timedelta(minutes=50), 2, source=Interest.Source.NEWS)
+        recent = self._interest(self.now - timedelta(hours=2), 7)
+
+        result = compact_interest_snapshots(now=self.now)
+
+        self.assertEqual(result["hourly"]["removed"], 3)
+        self.assertEqual(result["hourly"]["created"], 2)
+        reddit = Interest.objects.get(source=Interest.Source.REDDIT, recorded_at=old_hour)
+        self.assertEqual(reddit.mentions, 4)
+        self.assertEqual(reddit.sentiment_score, Decimal("0.50"))
+        self.assertEqual(reddit.metadata, {"resolution": "hour", "compacted_rows": 2})
+        recent.refresh_from_db()
+        self.assertIn("samples", recent.metadata)
+
+    def test_compaction_is_idempotent_and_rolls_old_hours_into_days(self):
+        old = self.now - timedelta(days=50)
+        for hour in range(3):
+            self._interest(old.replace(hour=hour, minute=10), 2)
+        self._interest(self.now - timedelta(hours=90), 5)
+
+        compact_interest_snapshots(now=self.now)
+        first_ids = set(Interest.objects.values_list("id", flat=True))
+        second = compact_interest_snapshots(now=self.now)
+
+        self.assertEqual(second["hourly"]["removed"], 0)
+        self.assertEqual(second["daily"]["removed"], 0)
+        self.assertEqual(set(Interest.objects.values_list("id", flat=True)), first_ids)
+        daily = Interest.objects.get(metadata__resolution="day")
+        self.assertEqual(daily.mentions, 6)
+        self.assertEqual(daily.metadata["compacted_rows"], 3)
+        self.assertEqual(Interest.objects.filter(metadata__resolution="hour").count(), 1)
@@ -0,0 +1,175 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import redis
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.stocks.models import Interest, Stock
+from services.interest_leaderboard import (
+    LEADERBOARD_RETENTION_SEC,
+    _coverage_key,
+    get_leaderboard_scores,
+    record_leaderboard_mentions,
+)
+from services.interest_service import get_top_interest_stocks
+
+
+class FakeRedis:
+    """Just enough of the sorted-set API for the leaderboard code paths."""
+
+    def __init__(self):
+        self.zsets = {}
+        self.strings = {}
+        self.ttls = {}
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+    def zincrby(self, key, amount, member):
+        zset = self.zsets.setdefault(key, {})
+        zset[member] = zset.get(member, 0) + amount
+
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+        return True
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = str(value)
+        self.ttls[key] = ex
+        return True
+
+    def delete(self, key):
+        return int(self.strings.pop(key, None) is not None)
+
+    def get(self, key):
+        return self.strings.get(key)
+
+    def exists(self, key):
+        return int(key in self.zsets)
+
+    def zunionstore(self, dest, keys):
+        merged = {}
+        for key in keys:
+            for member, score in self.zsets.get(key, {}).items():
+                merged[member] = merged.get(member, 0) + score
+        self.zsets[dest] = merged
+
+    def _ordered(self, key):
+        return sorted(self.zsets.get(key, {}).items(), key=lambda item: (-item[1], item[0]))
+
+    def zrevrange(self, key, start, end, withscores=False):
+        return [(member, float(score)) for member, score in self._ordered(key)[start : end + 1]]
+
+    def zrevrangebyscore(self, key, high, low, withscores=False):
+        return [
+            (member, float(score)) for member, score in self._ordered(key) if score >= float(low)
+        ]
+
+
+@override_settings(INTEREST_LEADERBOARD_ENABLED=True)
+class InterestLeaderboardTests(TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = patch("services.interest_leaderboard.get_redis_client", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.alpha = Stock.objects.create(symbol="ALPHA", name="Alpha", is_active=True)
+        self.beta = Stock.objects.create(symbol="BETA", name="Beta", is_active=True)
+        self.gamma = Stock.objects.create(symbol="GAMMA", name="Gamma", is_active=True)
+
+    def _seed_coverage(self, hours_ago):
+        bucket = timezone.now() - timedelta(hours=hours_ago)
+        record_leaderboard_mentions({self.gamma.id: 1}, recorded_at=bucket)
+
+    def test_scores_sum_hour_buckets_inside_the_window(self):
+        now = timezone.now()
+        self._seed_coverage(hours_ago=30)
+        record_leaderboard_mentions({self.alpha.id: 4, self.beta.id: 2}, recorded_at=now)
+        record_leaderboard_mentions({self.beta.id: 5}, recorded_at=now - timedelta(hours=3))
+        record_leaderboard_mentions({self.alpha.id: 50}, recorded_at=now - timedelta(hours=28))
+
+        scores = get_leaderboard_scores(hours=24, limit=2)
+
+        self.assertEqual(scores, [(self.beta.id, 7), (self.alpha.id, 4)])
+
+    def test_scores_fall_back_when_window_predates_coverage(self):
+        record_leaderboard_mentions({self.alpha.id: 4}, recorded_at=timezone.now())
+
+        self.assertIsNone(get_leaderboard_scores(hours=24, limit=5))
+
+    def test_top_interest_stocks_reads_leaderboard_without_aggregating_interest(self):
+        self._seed_coverage(hours_ago=30)
+        record_leaderboard_mentions(
+            {self.alpha.id: 3, self.beta.id: 3}, recorded_at=timezone.now()
+        )
+
+        with self.assertNumQueries(1):
+            rows = get_top_interest_stocks(limit=5, hours=24, only_positive=True)
+
+        self.assertEqual([stock.symbol for stock in rows], ["ALPHA", "BETA"])
+        self.assertEqual([stock.total_mentions for stock in rows], [3, 3])
+
+    def test_top_interest_stocks_pads_with_zero_mention_stocks(self):
+        self._seed_coverage(hours_ago=30)
+        record_leaderboard_mentions({self.beta.id: 2}, recorded_at=timezone.now())
+
+        rows = get_top_interest_stocks(limit=3, hours=24)
+
+        self.assertEqual([stock.symbol for stock in rows], ["BETA", "ALPHA", "GAMMA"])
+        self.assertEqual([stock.total_mentions for stock in rows], [2, 0, 0])
+
+    def test_top_interest_stocks_skips_inactive_members_and_still_fills_the_page(self):
+        self._seed_coverage(hours_ago=30)
+        extra = [
+            Stock.objects.create(symbol=f"OFF{idx}", name=f"Off {idx}", is_active=False)
+            for idx in range(4)
+        ]
+        mentions = {stock.id: 10 for stock in extra}
+        mentions.update({self.alpha.id: 3, self.beta.id: 2})
+        record_leaderboard_mentions(mentions, recorded_at=timezone.now())
+
+        rows = get_top_interest_stocks(limit=2, hours=24, only_positive=True)
+
+        self.assertEqual([stock.symbol for stock in rows], ["ALPHA", "BETA"])
+
+    def test_each_write_refreshes_coverage_ttl_without_moving_its_start(self):
+        self._seed_coverage(hours_ago=30)
+        started = self.redis.get(_coverage_key())
+        self.redis.ttls[_coverage_key()] = 5
+
+        record_leaderboard_mentions({self.alpha.id: 1}, recorded_at=timezone.now())
+
+        self.assertEqual(self.redis.get(_coverage_key()), started)
+        self.assertEqual(self.redis.ttls[_coverage_key()], LEADERBOARD_RETENTION_SEC)
+
+    def test_failed_write_drops_coverage(self):
+        self._seed_coverage(hours_ago=30)
+        pipe = MagicMock()
+        pipe.execute.side_effect = redis.ConnectionError("down")
+        with patch.object(self.redis, "pipeline", return_value=pipe):
+            self.assertFalse(
+                record_leaderboard_mentions({self.alpha.id: 1}, recorded_at=timezone.now())
+            )
+
+        self.assertIsNone(get_leaderboard_scores(hours=24, limit=5))
+
+    def test_top_interest_stocks_falls_back_to_database_on_redis_error(self):
+        Interest.objects.create(
+            stock=self.alpha,
+            source=Interest.Source.NEWS,
+            recorded_at=timezone.now() - timedelta(hours=1),
+            mentions=6,
+        )
+        broken = MagicMock()
+        broken.get.side_effect = redis.ConnectionError("down")
+
+        with patch("services.interest_leaderboard.get_redis_client", return_value=broken):
+            rows = get_top_interest_stocks(limit=5, hours=24, only_positive=True)
+
+        self.assertEqual([(stock.symbol, stock.total_mentions) for stock in rows], [("ALPHA", 6)])
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from decimal import Decimal
 from types import SimpleNamespace
 from unittest.mock import patch
 
@@ -7,11 +8,27 @@ from django.test import TestCase
 from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from apps.stocks.models import Interest, NewsItem, Stock
+from apps.stocks.models import (
+    Interest,
+    InterestAnomalyState,
+    NewsItem,
+    SectorInterestRollup,
+    Stock,
+)
 from services.interest_service import (
+    ANOMALY_MODE_SEASONAL,
+    _fold_baseline,
     collect_interest_snapshot,
     detect_interest_anomalies,
+    detect_sector_anomalies,
+    get_current_interest_anomalies,
+    get_sector_interest_heatmap,
+    get_sector_interest_timeline,
+    get_stock_interest_anomaly,
     get_top_interest_stocks,
+    rebuild_interest_anomaly_states,
+    refresh_sector_rollups,
+    update_interest_anomaly_states,
 )
 
 
@@ -71,6 +88,46 @@ class InterestServiceTests(TestCase):
         self.assertEqual(reddit_record.mentions, 2)
         self.assertEqual(len(reddit_record.metadata.get("samples", [])), 2)
 
+    def test_collect_interest_snapshot_scores_sentiment_per_group(self):
+        now = timezone.now()
+        NewsItem.objects.create(
+            stock=self.stock,
+            title="Anomaly shares surge",
+            url="https://example.com/news/anom-surge",
+            published_at=now,
+        )
+        NewsItem.objects.create(
+            stock=self.stock,
+            title="Anomaly surges on record profit",
+            url="https://example.com/news/anom-record",
+            published_at=now,
+        )
+
+        class FakeCrawler:
+            source = Interest.Source.REDDIT
+
+            def fetch(self, stocks, limit_per_symbol=3):
+                return [
+                    SimpleNamespace(
+                        symbol=stocks[0].symbol,
+                        source=Interest.Source.REDDIT,
+                        title=title,
+                        url=f"https://reddit.example.com/{idx}",
+                        published_at=now,
+                    )
+                    for idx, title in enumerate(["ANOM plunges after recall", "ANOM 실적 부진 우려"])
+                ]
+
+        with patch("services.interest_service.DEFAULT_SOURCE_CRAWLERS", (FakeCrawler,)):
+            collect_interest_snapshot(limit_stocks=5, limit_per_symbol=3)
+
+        records = Interest.objects.filter(stock=self.stock)
+        # surge 0.71, surge+record+profit 0.89 / plunges+recall -0.83, 부진+우려 -0.78
+        self.assertEqual(records.get(source=Interest.Source.NEWS).sentiment_score, Decimal("0.80"))
+        self.assertEqual(
+            records.get(source=Interest.Source.REDDIT).sentiment_score, Decimal("-0.81")
+        )
+
     def test_detect_interest_anomalies_finds_surge(self):
         now = timezone.now().replace(minute=0, second=0, microsecond=0)
 
@@ -87,6 +144,7 @@ class InterestServiceTests(TestCase):
                 source=Interest.Source.REDDIT,
                 recorded_at=now - timedelta(hours=hours_ago),
                 mentions=12,
+                sentiment_score=Decimal("0.40"),
             )
 
         anomalies = detect_interest_anomalies(limit=5)
@@ -95,6 +153,7 @@ class InterestServiceTests(TestCase):
         self.assertEqual(anomalies[0]["symbol"], "ANOM")
         self.assertEqual(anomalies[0]["severity"], "high")
         self.assertGreaterEqual(anomalies[0]["surge_ratio"], 4.0)
+        self.assertEqual(anomalies[0]["sentiment"], 0.4)
 
     def test_get_top_interest_stocks_only_positive_filters_zero_mentions(self):
         positive = self.stock
@@ -123,6 +182,29 @@ class InterestServiceTests(TestCase):
         self.assertEqual(len(rows), 1)
         self.assertEqual(rows[0].symbol, positive.symbol)
 
+    def test_get_top_interest_stocks_weights_sentiment_by_mentions(self):
+        now = timezone.now()
+        for mentions, sentiment in ((3, Decimal("0.50")), (1, Decimal("-0.50")), (4, None)):
+            Interest.objects.create(
+                stock=self.stock,
+                source=Interest.Source.REDDIT,
+                recorded_at=now,
+                mentions=mentions,
+                sentiment_score=sentiment,
+            )
+        Interest.objects.create(
+            stock=self.stock,
+            source=Interest.Source.REDDIT,
+            recorded_at=now - timedelta(hours=30),
+            mentions=10,
+            sentiment_score=Decimal("-1.00"),
+        )
+
+        rows = get_top_interest_stocks(limit=10, hours=24, only_positive=True)
+
+        self.assertEqual(rows[0].total_mentions, 8)
+        self.assertEqual(rows[0].avg_sentiment, 0.25)
+
     def test_detect_interest_anomalies_query_count_is_bounded(self):
         now = timezone.now().replace(minute=0, second=0, microsecond=0)
         extra_stocks = [
@@ -182,3 +264,246 @@ class InterestServiceTests(TestCase):
         self.assertEqual(result["sources"][Interest.Source.REDDIT], 0)
         self.assertEqual(result["sources"][Interest.Source.NEWS], 30)
         self.assertLessEqual(len(queries), 10)
+
+    def test_collect_interest_snapshot_keeps_newest_news_samples_per_stock(self):
+        now = timezone.now()
+        other = Stock.objects.create(symbol="OTHR", name="Other Inc", is_active=True)
+        for idx in range(8):
+            NewsItem.objects.create(
+                stock=self.stock,
+                title=f"Anom {idx}",
+                url=f"https://example.com/anom/{idx}",
+                published_at=now - timedelta(minutes=idx),
+            )
+        NewsItem.objects.create(
+            stock=other,
+            title="Other 0",
+            url="https://example.com/other/0",
+            published_at=now,
+        )
+
+        with patch("services.interest_service.DEFAULT_SOURCE_CRAWLERS", ()):
+            result = collect_interest_snapshot(limit_stocks=5, limit_per_symbol=3)
+
+        self.assertEqual(result["inserted"], 2)
+        self.assertEqual(result["total_mentions"], 9)
+        record = Interest.objects.get(stock=self.stock, source=Interest.Source.NEWS)
+        self.assertEqual(record.mentions, 8)
+        self.assertEqual(
+            [sample["title"] for sample in record.metadata["samples"]],
+            ["Anom 0", "Anom 1", "Anom 2", "Anom 3", "Anom 4"],
+        )
+        other_record = Interest.objects.get(stock=other, source=Interest.Source.NEWS)
+        self.assertEqual(other_record.mentions, 1)
+
+    def test_collect_interest_snapshot_updates_anomaly_state(self):
+        now = timezone.now()
+
+        class FakeCrawler:
+            source = Interest.Source.REDDIT
+
+            def fetch(self, stocks, limit_per_symbol=3):
+                return [
+                    SimpleNamespace(
+                        symbol=stocks[0].symbol,
+                        source=Interest.Source.REDDIT,
+                        title=f"ANOM post {idx}",
+                        url=f"https://reddit.example.com/{idx}",
+                        published_at=now,
+                    )
+                    for idx in range(3)
+                ]
+
+        with patch("services.interest_service.DEFAULT_SOURCE_CRAWLERS", (FakeCrawler,)):
+            collect_interest_snapshot(limit_stocks=5, limit_per_symbol=3)
+            collect_interest_snapshot(limit_stocks=5, limit_per_symbol=3)
+
+        state = InterestAnomalyState.objects.get(stock=self.stock)
+        self.assertEqual(state.recent_mentions, 6)
+        self.assertEqual(state.recent_window[-1], 6)
+        self.assertEqual(state.bucket_start, now.replace(minute=0, second=0, microsecond=0))
+
+    def test_fold_baseline_matches_population_statistics_while_warming_up(self):
+        baseline_mean, baseline_var, baseline_count = 0.0, 0.0, 0
+        for value in [1, 2, 3, 4]:
+            baseline_mean, baseline_var, baseline_count = _fold_baseline(
+                baseline_mean,
+                baseline_var,
+                baseline_count,
+                value,
+            )
+
+        self.assertEqual(baseline_count, 4)
+        self.assertAlmostEqual(baseline_mean, 2.5)
+        self.assertAlmostEqual(baseline_var, 1.25)
+
+    def test_rebuilt_anomaly_state_serves_stock_and_universe_reads(self):
+        now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        for hours_ago in range(6, 78):
+            Interest.objects.create(
+                stock=self.stock,
+                source=Interest.Source.REDDIT,
+                recorded_at=now - timedelta(hours=hours_ago),
+                mentions=1,
+            )
+        for hours_ago in range(0, 6):
+            Interest.objects.create(
+                stock=self.stock,
+                source=Interest.Source.REDDIT,
+                recorded_at=now - timedelta(hours=hours_ago),
+                mentions=12,
+                sentiment_score=Decimal("-0.30"),
+            )
+        rebuild_interest_anomaly_states()
+
+        with self.assertNumQueries(1):
+            stock_anomaly = get_stock_interest_anomaly(self.stock)
+        with self.assertNumQueries(1):
+            anomalies = get_current_interest_anomalies(limit=5)
+
+        self.assertEqual(stock_anomaly["severity"], "high")
+        self.assertEqual(stock_anomaly["recent_mentions"], 72)
+        self.assertEqual([row["symbol"] for row in anomalies], ["ANOM"])
+        self.assertEqual(stock_anomaly["sentiment"], -0.3)
+        self.assertEqual(anomalies[0]["sentiment"], -0.3)
+
+    def test_stale_anomaly_state_is_not_reported(self):
+        stale_bucket = timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(
+            hours=12
+        )
+        update_interest_anomaly_states({self.stock.id: 40}, recorded_at=stale_bucket)
+
+        self.assertTrue(InterestAnomalyState.objects.get(stock=self.stock).is_anomalous)
+        self.assertEqual(get_current_interest_anomalies(limit=5), [])
+        self.assertIsNone(get_stock_interest_anomaly(self.stock))
+
+    def _seed_weekly_opening_spikes(self, current_mentions):
+        now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        for hours_ago in range(6, 78):
+            Interest.objects.create(
+                stock=self.stock,
+                source=Interest.Source.REDDIT,
+                recorded_at=now - timedelta(hours=hours_ago),
+                mentions=1,
+            )
+        for week in range(1, 5):
+            for hours_ago in range(0, 6):
+                Interest.objects.create(
+                    stock=self.stock,
+                    source=Interest.Source.REDDIT,
+                    recorded_at=now - timedelta(weeks=week, hours=hours_ago),
+                    mentions=12,
+                )
+        for hours_ago in range(0, 6):
+            Interest.objects.create(
+                stock=self.stock,
+                source=Interest.Source.REDDIT,
+                recorded_at=now - timedelta(hours=hours_ago),
+                mentions=current_mentions,
+            )
+
+    def test_seasonal_mode_ignores_recurring_hour_of_week_spikes(self):
+        self._seed_weekly_opening_spikes(current_mentions=12)
+
+        flat = detect_interest_anomalies(limit=5)
+        with self.assertNumQueries(2):
+            seasonal = detect_interest_anomalies(limit=5, mode=ANOMALY_MODE_SEASONAL)
+
+        self.assertEqual([row["symbol"] for row in flat], ["ANOM"])
+        self.assertEqual(seasonal, [])
+
+    def test_seasonal_mode_flags_surge_above_hour_of_week_baseline(self):
+        self._seed_weekly_opening_spikes(current_mentions=60)
+
+        seasonal = detect_interest_anomalies(limit=5, mode=ANOMALY_MODE_SEASONAL)
+
+        self.assertEqual(len(seasonal), 1)
+        self.assertEqual(seasonal[0]["expected_mentions"], 72)
+        self.assertEqual(seasonal[0]["recent_mentions"], 360)
+        self.assertEqual(seasonal[0]["severity"], "high")
+
+    def test_sector_rollups_group_normalized_sectors_for_heatmap(self):
+        bucket = timezone.now().replace(minute=0, second=0, microsecond=0)
+        padded = Stock.objects.create(symbol="PAD", name="Padded", sector=" Tech ", is_active=True)
+        blank = Stock.objects.create(symbol="BLNK", name="Blank", sector="", is_active=True)
+        inactive = Stock.objects.create(symbol="OFF", name="Off", sector="Tech", is_active=False)
+        for stock, mentions in ((self.stock, 4), (padded, 6), (blank, 3), (inactive, 50)):
+            Interest.objects.create(
+                stock=stock,
+                source=Interest.Source.REDDIT,
+                recorded_at=bucket,
+                mentions=mentions,
+            )
+
+        result = refresh_sector_rollups(bucket)
+        refresh_sector_rollups(bucket)
+
+        self.assertEqual(result["rows"], 2)
+        self.assertEqual(SectorInterestRollup.objects.count(), 2)
+        tech = SectorInterestRollup.objects.get(sector="Tech")
+        self.assertEqual((tech.mentions, tech.stock_count), (10, 2))
+        with self.assertNumQueries(1):
+            heatmap = get_sector_interest_heatmap(hours=24, limit=12)
+        self.assertEqual(
+            heatmap,
+            [
+                {"sector": "Tech", "mentions": 10, "intensity": 1.0},
+                {"sector": "Unknown", "mentions": 3, "intensity": 0.3},
+            ],
+        )
+
+    def test_sector_rollups_upsert_over_rows_from_an_overlapping_refresh(self):
+        bucket = timezone.now().replace(minute=0, second=0, microsecond=0)
+        Interest.objects.create(
+            stock=self.stock,
+            source=Interest.Source.REDDIT,
+            recorded_at=bucket,
+            mentions=4,
+        )
+        # Rows a concurrent refresh committed for the same bucket.
+        SectorInterestRollup.objects.create(
+            sector="Tech", bucket_start=bucket, mentions=1, stock_count=1
+        )
+        SectorInterestRollup.objects.create(
+            sector="Gone", bucket_start=bucket, mentions=7, stock_count=1
+        )
+        earlier = SectorInterestRollup.objects.create(
+            sector="Gone", bucket_start=bucket - timedelta(hours=1), mentions=7, stock_count=1
+        )
+
+        refresh_sector_rollups(bucket)
+
+        self.assertEqual(
+            list(
+                SectorInterestRollup.objects.filter(bucket_start=bucket).values_list(
+                    "sector", "mentions"
+                )
+            ),
+            [("Tech", 4)],
+        )
+        self.assertTrue(SectorInterestRollup.objects.filter(pk=earlier.pk).exists())
+
+    def test_sector_timeline_and_anomalies_read_rollups(self):
+        now_bucket = timezone.now().replace(minute=0, second=0, microsecond=0)
+        for hour in range(78):
+            SectorInterestRollup.objects.create(
+                sector="Tech",
+                bucket_start=now_bucket - timedelta(hours=hour),
+                mentions=30 if hour < 6 else 2,
+                stock_count=1,
+            )
+            SectorInterestRollup.objects.create(
+                sector="Energy",
+                bucket_start=now_bucket - timedelta(hours=hour),
+                mentions=3,
+                stock_count=1,
+            )
+
+        timeline = get_sector_interest_timeline(hours=24, limit=1)
+        anomalies = detect_sector_anomalies(limit=5)
+
+        self.assertEqual(len(timeline["labels"]), 24)
+        self.assertEqual([row["sector"] for row in timeline["sectors"]], ["Tech"])
+        self.assertEqual(timeline["sectors"][0]["mentions"][-1], 30)
+        self.assertEqual([row["sector"] for row in anomalies], ["Tech"])
+        self.assertEqual(anomalies[0]["recent_mentions"], 180)
@@ -0,0 +1,108 @@
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.stocks.models import NewsItem, Stock
+from services.news_archive import archive_news_items, load_manifest, read_archived_news
+from services.news_service import get_news_history
+
+
+class NewsArchiveTests(TestCase):
+    def setUp(self):
+        self.archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.archive_dir.cleanup)
+        settings_override = override_settings(NEWS_ARCHIVE_DIR=self.archive_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.stock = Stock.objects.create(symbol="ARCH", name="Archive Co", is_active=True)
+        self.other = Stock.objects.create(symbol="KEEP", name="Keep Co", is_active=True)
+        self.now = timezone.now()
+
+    def _news(self, stock, title, age_days):
+        item = NewsItem.objects.create(
+            stock=stock,
+            title=title,
+            url=f"https://example.com/{stock.symbol}/{title.replace(' ', '-')}",
+            publisher="Example",
+            published_at=self.now - timedelta(days=age_days),
+        )
+        NewsItem.objects.filter(pk=item.pk).update(created_at=self.now - timedelta(days=age_days))
+        return item
+
+    def test_archive_moves_old_rows_into_monthly_files(self):
+        self._news(self.stock, "old one", 200)
+        self._news(self.stock, "old two", 120)
+        self._news(self.other, "old other", 150)
+        self._news(self.stock, "fresh", 3)
+
+        result = archive_news_items(older_than_days=90, chunk_size=2)
+
+        self.assertEqual(result["archived"], 3)
+        self.assertEqual(list(NewsItem.objects.values_list("title", flat=True)), ["fresh"])
+        manifest = load_manifest()
+        self.assertEqual(sum(entry["rows"] for entry in manifest["months"].values()), 3)
+        self.assertTrue(
+            all(entry["file"].endswith(".ndjson.gz") for entry in manifest["months"].values())
+        )
+        self.assertIsNotNone(manifest["archived_before"])
+
+    def test_archive_keeps_rows_when_root_is_not_configured(self):
+        self._news(self.stock, "old one", 200)
+
+        with override_settings(NEWS_ARCHIVE_DIR=""):
+            result = archive_news_items(older_than_days=90)
+            rows = read_archived_news("ARCH", limit=10)
+
+        self.assertEqual(result["code"], "ARCHIVE_NOT_CONFIGURED")
+        self.assertEqual(result["archived"], 0)
+        self.assertEqual(rows, [])
+        self.assertTrue(NewsItem.objects.filter(title="old one").exists())
+
+    def test_archive_keeps_rows_when_root_is_not_writable(self):
+        self._news(self.stock, "old one", 200)
+        blocker = Path(self.archive_dir.name) / "not-a-directory"
+        blocker.write_text("", encoding="utf-8")
+
+        result = archive_news_items(older_than_days=90, root=blocker)
+
+        self.assertEqual(result["code"], "ARCHIVE_NOT_WRITABLE")
+        self.assertTrue(NewsItem.objects.filter(title="old one").exists())
+
+    def test_news_history_falls_back_to_archive(self):
+        self._news(self.stock, "old one", 200)
+        self._news(self.stock, "old two", 120)
+        self._news(self.other, "old other", 150)
+        self._news(self.stock, "fresh", 3)
+        archive_news_items(older_than_days=90)
+
+        rows = get_news_history("ARCH", limit=10)
+
+        self.assertEqual([row["title"] for row in rows], ["fresh", "old two", "old one"])
+        self.assertEqual([row["archived"] for row in rows], [False, True, True])
+
+        bounded = get_news_history("ARCH", end=self.now - timedelta(days=150), limit=10)
+        self.assertEqual([row["title"] for row in bounded], ["old one"])
+
+    def test_archive_reads_stop_after_the_month_cap(self):
+        self._news(self.stock, "old one", 200)
+        self._news(self.stock, "old two", 120)
+        archive_news_items(older_than_days=90)
+
+        rows = read_archived_news("ARCH", limit=10, max_months=1)
+
+        self.assertEqual([row["title"] for row in rows], ["old two"])
+
+    def test_archive_command_reports_archived_rows(self):
+        self._news(self.stock, "old one", 200)
+        stdout = StringIO()
+
+        call_command("archive_news_items", "--days", "90", stdout=stdout)
+
+        self.assertIn("rows=1", stdout.getvalue())
+        self.assertFalse(NewsItem.objects.exists())
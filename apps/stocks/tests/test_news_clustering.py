@@ -0,0 +1,71 @@
+from django.test import SimpleTestCase, TestCase
+
+from apps.stocks.models import NewsItem, Stock
+from services.news_clustering import HeadlineIndex
+from services.simhash import SIMHASH_MAX_DISTANCE, hamming_distance, simhash
+
+
+class SimHashTests(SimpleTestCase):
+    def test_publisher_suffix_and_punctuation_do_not_change_signature(self):
+        self.assertEqual(
+            simhash("삼성전자, 반도체 호황에 분기 최대 실적 - 연합뉴스"),
+            simhash("삼성전자 반도체 호황에 분기 최대 실적"),
+        )
+
+    def test_headlines_differing_in_figures_stay_apart(self):
+        distance = hamming_distance(
+            simhash("Samsung Q3 operating profit 10 trillion won"),
+            simhash("Samsung Q3 operating profit 12 trillion won"),
+        )
+        self.assertGreater(distance, SIMHASH_MAX_DISTANCE)
+
+    def test_signature_is_signed_64_bit(self):
+        value = simhash("Tesla recalls vehicles over steering issue")
+        self.assertGreaterEqual(value, -(2**63))
+        self.assertLess(value, 2**63)
+
+
+class HeadlineIndexTests(SimpleTestCase):
+    def test_signatures_within_max_distance_share_a_cluster(self):
+        index = HeadlineIndex()
+        base = simhash("Nvidia shares rally on AI demand")
+        # Flip one bit in each of three bands; one band stays an exact match.
+        near = base ^ (1 << 3) ^ (1 << 20) ^ (1 << 40)
+        far = base ^ (1 << 5) ^ (1 << 25) ^ (1 << 45) ^ (1 << 60)
+
+        self.assertEqual(index.assign(base), base)
+        self.assertEqual(index.assign(near), base)
+        self.assertEqual(index.assign(far), far)
+
+
+class NewsItemSaveTests(TestCase):
+    def setUp(self):
+        self.stock = Stock.objects.create(symbol="SAVE", name="Save Corp", is_active=True)
+
+    def test_direct_saves_cluster_through_the_headline_index(self):
+        first = NewsItem.objects.create(
+            stock=self.stock,
+            title="Save Corp beats third-quarter estimates - Reuters",
+            url="https://example.com/save/1?utm_source=x",
+        )
+        second = NewsItem.objects.create(
+            stock=self.stock,
+            title="Save Corp beats third-quarter estimates - Bloomberg",
+            url="https://example.com/save/2",
+        )
+
+        self.assertEqual(first.cluster_id, second.cluster_id)
+        self.assertEqual(first.canonical_url, "https://example.com/save/1")
+
+    def test_values_passed_by_the_caller_are_kept(self):
+        item = NewsItem.objects.create(
+            stock=self.stock,
+            title="Save Corp update",
+            url="https://example.com/save/3",
+            url_hash="custom",
+            cluster_id=42,
+        )
+
+        item.refresh_from_db()
+        self.assertEqual((item.url_hash, item.cluster_id), ("custom", 42))
+        self.assertIsNotNone(item.simhash)
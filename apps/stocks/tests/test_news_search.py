@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.stocks.models import NewsItem, Stock
+from services.news_search import search_news
+
+
+class NewsSearchTests(TestCase):
+    def setUp(self):
+        self.samsung = Stock.objects.create(symbol="005930", name="삼성전자", is_active=True)
+        self.apple = Stock.objects.create(symbol="AAPL", name="Apple", is_active=True)
+        now = timezone.now()
+        self.items = {}
+        for stock, title, days_ago in (
+            (self.samsung, "삼성전자가 반도체 투자를 확대한다", 0),
+            (self.samsung, "삼성전자 실적 발표 앞두고 관망", 3),
+            (self.apple, "Apple earnings beat estimates", 1),
+            (self.apple, "Apple supplier 삼성전자 wins display deal", 2),
+        ):
+            self.items[title] = NewsItem.objects.create(
+                stock=stock,
+                title=title,
+                url=f"https://example.com/{stock.symbol}/{days_ago}",
+                published_at=now - timedelta(days=days_ago),
+            )
+
+    def _titles(self, queryset):
+        return [item.title for item in queryset]
+
+    def test_prefix_terms_match_korean_words_with_particles(self):
+        self.assertEqual(
+            self._titles(search_news("삼성전자")),
+            [
+                "Apple supplier 삼성전자 wins display deal",
+                "삼성전자 실적 발표 앞두고 관망",
+                "삼성전자가 반도체 투자를 확대한다",
+            ],
+        )
+
+    def test_terms_are_combined_and_filtered_by_symbol_and_date(self):
+        self.assertEqual(self._titles(search_news("apple EARN")), ["Apple earnings beat estimates"])
+        self.assertEqual(
+            self._titles(search_news("삼성전자", symbol="005930")),
+            ["삼성전자 실적 발표 앞두고 관망", "삼성전자가 반도체 투자를 확대한다"],
+        )
+        self.assertEqual(
+            self._titles(search_news("삼성전자", end=timezone.now() - timedelta(days=1))),
+            ["Apple supplier 삼성전자 wins display deal", "삼성전자 실적 발표 앞두고 관망"],
+        )
+
+    def test_index_follows_title_updates_and_deletes(self):
+        item = self.items["Apple earnings beat estimates"]
+        item.title = "Apple guidance raised"
+        item.save()
+        self.items["삼성전자 실적 발표 앞두고 관망"].delete()
+
+        self.assertEqual(self._titles(search_news("earnings")), [])
+        self.assertEqual(self._titles(search_news("guidance")), ["Apple guidance raised"])
+        self.assertEqual(len(search_news("삼성전자")), 2)
+
+    def test_query_syntax_characters_are_ignored(self):
+        self.assertEqual(self._titles(search_news('"apple" OR*')), [])
+        self.assertEqual(list(search_news('  "" ')), [])
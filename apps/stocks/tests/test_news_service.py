@@ -7,8 +7,12 @@ from django.test import TestCase
 from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from apps.stocks.models import NewsItem, Stock
-from services.news_service import collect_news_items, get_latest_news_for_symbols
+from apps.stocks.models import HeadlineSignature, NewsItem, Stock, StockKeywordCounter
+from services.news_service import (
+    collect_news_items,
+    get_latest_news_for_symbols,
+    get_related_news,
+)
 
 
 class NewsServiceTests(TestCase):
@@ -67,6 +71,124 @@ class NewsServiceTests(TestCase):
         self.assertEqual(item.title, "Updated headline")
         self.assertEqual(item.publisher, "Two")
 
+    def test_collect_news_items_bulk_upsert_skips_unchanged_rows(self):
+        now = timezone.now()
+        existing = NewsItem.objects.create(
+            stock=self.stock,
+            title="Headline 0",
+            url="https://example.com/news/0",
+            publisher="Wire",
+            published_at=now,
+        )
+        records = [
+            SimpleNamespace(
+                symbol=self.stock.symbol,
+                source=NewsItem.Source.NEWS,
+                title=f"Headline {idx}",
+                url=f"https://example.com/news/{idx}",
+                published_at=now,
+                metadata={"publisher": "Wire"},
+            )
+            for idx in range(40)
+        ]
+
+        class FakeCrawler:
+            source = NewsItem.Source.NEWS
+
+            def fetch(self, stocks, limit_per_symbol=3):
+                return records
+
+        with patch("services.news_service.NewsCrawler", return_value=FakeCrawler()):
+            with CaptureQueriesContext(connection) as queries:
+                first = collect_news_items(limit_stocks=3, limit_per_symbol=2)
+            second = collect_news_items(limit_stocks=3, limit_per_symbol=2)
+
+        self.assertEqual((first["inserted"], first["updated"], first["unchanged"]), (39, 1, 0))
+        self.assertEqual((second["inserted"], second["updated"], second["unchanged"]), (0, 0, 40))
+        # Upsert plus constant overhead: cluster lookup, signature insert and prune,
+        # the keyword counter increment, then the unique-mention sketch insert,
+        # locked read and update.
+        self.assertLessEqual(len(queries), 12)
+        self.assertEqual(NewsItem.objects.count(), 40)
+        existing.refresh_from_db()
+        self.assertEqual(len(existing.content_hash), 40)
+        self.assertEqual(existing.metadata, {"publisher": "Wire"})
+
+    def test_collect_news_items_stores_tracking_url_variants_once(self):
+        now = timezone.now()
+
+        class FakeCrawler:
+            source = NewsItem.Source.NEWS
+
+            def fetch(self, stocks, limit_per_symbol=3):
+                return [
+                    SimpleNamespace(
+                        symbol=stocks[0].symbol,
+                        source=NewsItem.Source.NEWS,
+                        title="Same story",
+                        url=url,
+                        published_at=now,
+                        metadata={"publisher": "Wire"},
+                    )
+                    for url in (
+                        "https://example.com/story?utm_source=rss",
+                        "https://example.com/story/?fbclid=abc",
+                    )
+                ]
+
+        with patch("services.news_service.NewsCrawler", return_value=FakeCrawler()):
+            result = collect_news_items(limit_stocks=3, limit_per_symbol=2)
+
+        self.assertEqual((result["inserted"], result["unchanged"]), (1, 1))
+        item = NewsItem.objects.get(stock=self.stock)
+        self.assertEqual(item.canonical_url, "https://example.com/story")
+        self.assertEqual(len(item.url_hash), 40)
+
+    def test_collect_news_items_clusters_syndicated_headlines(self):
+        now = timezone.now()
+        records = [
+            SimpleNamespace(
+                symbol=self.stock.symbol,
+                source=NewsItem.Source.NEWS,
+                title=title,
+                url=f"https://example.com/{idx}",
+                published_at=now - timedelta(minutes=idx),
+                metadata={"publisher": "Wire"},
+            )
+            for idx, title in enumerate(
+                [
+                    "News Corp beats third-quarter estimates - Reuters",
+                    "News Corp beats third-quarter estimates - Bloomberg",
+                    "News Corp cuts full-year guidance",
+                ]
+            )
+        ]
+
+        class FakeCrawler:
+            source = NewsItem.Source.NEWS
+
+            def fetch(self, stocks, limit_per_symbol=3):
+                return records
+
+        with patch("services.news_service.NewsCrawler", return_value=FakeCrawler()):
+            result = collect_news_items(limit_stocks=3, limit_per_symbol=3)
+
+        self.assertEqual(result["inserted"], 3)
+        first, syndicated, other = NewsItem.objects.order_by("id")
+        self.assertEqual(first.cluster_id, syndicated.cluster_id)
+        self.assertNotEqual(first.cluster_id, other.cluster_id)
+        self.assertEqual(HeadlineSignature.objects.values("simhash").distinct().count(), 2)
+        self.assertEqual(
+            StockKeywordCounter.objects.get(stock=self.stock, keyword="estimates").count,
+            1,
+        )
+
+        rows = get_latest_news_for_symbols([self.stock.symbol], limit_per_symbol=3)
+        self.assertEqual(
+            [row["title"] for row in rows],
+            [first.title, other.title],
+        )
+
     def test_get_latest_news_for_symbols_filters_by_created_at(self):
         now = timezone.now()
         recent = NewsItem.objects.create(
@@ -144,3 +266,20 @@ class NewsServiceTests(TestCase):
         self.assertEqual(by_symbol[self.stock.symbol], ["NEWS1-0", "NEWS1-1"])
         self.assertEqual(by_symbol[second_stock.symbol], ["NEWS2-0", "NEWS2-1"])
         self.assertEqual(by_symbol[third_stock.symbol], ["NEWS3-0", "NEWS3-1"])
+
+    def test_get_related_news_collapses_clusters_within_recent_slice(self):
+        now = timezone.now()
+        for idx, cluster_id in enumerate([7, 7, 8, 9]):
+            NewsItem.objects.create(
+                stock=self.stock,
+                title=f"Story {idx}",
+                url=f"https://example.com/related/{idx}",
+                published_at=now - timedelta(hours=idx),
+                cluster_id=cluster_id,
+            )
+
+        with patch("services.news_service.RELATED_NEWS_SCAN_FACTOR", 1):
+            rows = get_related_news(self.stock.symbol, limit=3)
+
+        # The slice holds stories 0-2; 1 repeats 0's cluster and 3 is out of range.
+        self.assertEqual([row["title"] for row in rows], ["Story 0", "Story 2"])
@@ -0,0 +1,117 @@
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.stocks.tasks import manage_partitions_task
+
+from services.partition_service import (
+    _add_months,
+    detach_old_partitions,
+    ensure_partitions,
+    manage_partitions,
+    partition_name,
+)
+
+
+class PartitionServiceTests(TestCase):
+    def _fake_connection(self):
+        fake = MagicMock()
+        fake.vendor = "postgresql"
+        cursor = fake.cursor.return_value.__enter__.return_value
+        return fake, cursor
+
+    def test_manage_partitions_is_noop_on_sqlite(self):
+        result = manage_partitions()
+
+        self.assertEqual(result["status"], "skipped")
+        self.assertEqual(result["code"], "UNSUPPORTED_VENDOR")
+
+    def test_add_months_rolls_over_year_boundaries(self):
+        self.assertEqual(_add_months(date(2026, 11, 1), 3), date(2027, 2, 1))
+        self.assertEqual(_add_months(date(2026, 1, 1), -13), date(2024, 12, 1))
+        self.assertEqual(partition_name("stocks_interest", date(2026, 2, 1)), "stocks_interest_p202602")
+
+    def test_ensure_partitions_creates_only_missing_months(self):
+        fake, cursor = self._fake_connection()
+        reference = datetime(2026, 10, 19, tzinfo=dt_timezone.utc)
+
+        with (
+            patch("services.partition_service.connection", fake),
+            patch(
+                "services.partition_service.list_partitions",
+                return_value=["stocks_interest_p202610", "stocks_interest_default"],
+            ),
+        ):
+            created = ensure_partitions(months_ahead=2, reference=reference)
+
+        self.assertEqual(created, ["stocks_interest_p202611", "stocks_interest_p202612"])
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        self.assertEqual(len(statements), 2)
+        self.assertIn('PARTITION OF "stocks_interest"', statements[0])
+        self.assertIn("2026-11-01T00:00:00", statements[0])
+
+    def test_detach_old_partitions_skips_recent_and_default_partitions(self):
+        fake, cursor = self._fake_connection()
+        reference = datetime(2026, 10, 19, tzinfo=dt_timezone.utc)
+
+        with (
+            patch("services.partition_service.connection", fake),
+            patch(
+                "services.partition_service.list_partitions",
+                return_value=[
+                    "stocks_interest_default",
+                    "stocks_interest_p202507",
+                    "stocks_interest_p202508",
+                    "stocks_interest_p202509",
+                    "stocks_interest_p202610",
+                ],
+            ),
+        ):
+            detached = detach_old_partitions(retention_months=14, drop=True, reference=reference)
+
+        self.assertEqual(detached, ["stocks_interest_p202507"])
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        self.assertEqual(
+            statements,
+            [
+                'ALTER TABLE "stocks_interest" DETACH PARTITION "stocks_interest_p202507"',
+                'DROP TABLE "stocks_interest_p202507"',
+            ],
+        )
+
+    def test_manage_partitions_command_reports_skip(self):
+        stdout = StringIO()
+
+        call_command("manage_partitions", stdout=stdout)
+
+        self.assertIn("sqlite", stdout.getvalue())
+
+    def test_manage_partitions_command_detaches_only_on_request(self):
+        result = {"status": "success", "created": [], "detached": []}
+        with patch(
+            "apps.stocks.management.commands.manage_partitions.manage_partitions",
+            return_value=result,
+        ) as mock_manage:
+            call_command("manage_partitions", stdout=StringIO())
+            call_command("manage_partitions", "--detach", stdout=StringIO())
+            call_command("manage_partitions", "--drop", stdout=StringIO())
+
+        self.assertEqual(
+            [(call.kwargs["detach"], call.kwargs["drop"]) for call in mock_manage.call_args_list],
+            [(False, False), (True, False), (True, True)],
+        )
+
+    def test_monthly_task_only_creates_partitions_unless_dropping_is_enabled(self):
+        with patch("apps.stocks.tasks.manage_partitions", return_value={}) as mock_manage:
+            manage_partitions_task()
+            with override_settings(PARTITION_DROP_EXPIRED=True):
+                manage_partitions_task()
+
+        self.assertEqual(
+            [call.kwargs for call in mock_manage.call_args_list],
+            [{"detach": False, "drop": False}, {"detach": True, "drop": True}],
+        )
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.db.models import Count, F
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.stocks.models import NewsItem, Stock
+from services.query_helpers import top_n_per_group
+
+
+class TopNPerGroupTests(TestCase):
+    def test_returns_first_rows_per_group_with_group_totals(self):
+        now = timezone.now()
+        for symbol, count in (("AAA", 6), ("BBB", 1)):
+            stock = Stock.objects.create(symbol=symbol, name=symbol, is_active=True)
+            for idx in range(count):
+                NewsItem.objects.create(
+                    stock=stock,
+                    title=f"{symbol}-{idx}",
+                    url=f"https://example.com/{symbol}/{idx}",
+                    published_at=now - timedelta(minutes=idx),
+                )
+
+        rows = list(
+            top_n_per_group(
+                NewsItem.objects.all(),
+                partition_by=["stock_id"],
+                order_by=[F("published_at").desc(), F("id").desc()],
+                limit=2,
+                fields=["stock__symbol", "title"],
+                group_annotations={"group_total": Count("id")},
+            )
+        )
+
+        self.assertEqual(
+            [(row["stock__symbol"], row["title"], row["group_total"]) for row in rows],
+            [("AAA", "AAA-0", 6), ("AAA", "AAA-1", 6), ("BBB", "BBB-0", 1)],
+        )
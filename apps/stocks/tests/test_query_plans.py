@@ -0,0 +1,173 @@
+import json
+import re
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Subscription
+from apps.stocks.models import Interest, NewsItem, Price, Stock
+from services.interest_service import (
+    ANOMALY_METRIC_UNIQUE,
+    detect_interest_anomalies,
+    get_current_interest_anomalies,
+    get_interest_timeline,
+    get_sector_interest_heatmap,
+    get_stock_interest_anomaly,
+    get_top_interest_stocks,
+    rebuild_interest_anomaly_states,
+)
+from services.news_service import get_latest_news_for_symbols, get_news_history, get_related_news
+from services.stock_service import get_market_summary
+from services.unique_mentions import get_unique_mentions
+
+# Tables that grow with collected data. Small dimension tables (stocks, users)
+# may legitimately be scanned and are not checked.
+HOT_TABLES = (
+    "stocks_interest",
+    "stocks_newsitem",
+    "stocks_price",
+    "stocks_sectorinterestrollup",
+    "stocks_interestanomalystate",
+    "stocks_interestuniquesketch",
+)
+SQLITE_FULL_SCAN = re.compile(r"^SCAN (?P<table>\w+)(?! USING (?:COVERING )?INDEX)")
+POSTGRES_SEQ_SCAN = re.compile(r'"Node Type": "Seq Scan", [^}]*?"Relation Name": "(\w+)"')
+
+
+def _explain(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            with transaction.atomic():
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+                return json.dumps(cursor.fetchone()[0])
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(row[-1] for row in cursor.fetchall())
+
+
+def _sequential_scans(plan):
+    if connection.vendor == "postgresql":
+        # Partitions of a hot table (stocks_interest_p202610) count as that table.
+        return [table for table in POSTGRES_SEQ_SCAN.findall(plan) if table.startswith(HOT_TABLES)]
+    scans = []
+    for line in plan.splitlines():
+        match = SQLITE_FULL_SCAN.match(line.strip())
+        if match and match["table"] in HOT_TABLES:
+            scans.append(match["table"])
+    return scans
+
+
+class QueryPlanRegressionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.stocks = [
+            Stock.objects.create(
+                symbol=f"PLN{idx}",
+                name=f"Plan {idx}",
+                sector="Tech" if idx % 2 else "Energy",
+                is_active=True,
+            )
+            for idx in range(6)
+        ]
+        for stock in cls.stocks:
+            for hours_ago in range(0, 96, 3):
+                Interest.objects.create(
+                    stock=stock,
+                    source=Interest.Source.REDDIT,
+                    recorded_at=now - timedelta(hours=hours_ago),
+                    mentions=hours_ago % 7 + 1,
+                )
+            for idx in range(5):
+                NewsItem.objects.create(
+                    stock=stock,
+                    title=f"{stock.symbol} headline {idx}",
+                    url=f"https://example.com/{stock.symbol}/{idx}",
+                    published_at=now - timedelta(hours=idx),
+                )
+            for days_ago in range(5):
+                Price.objects.create(
+                    stock=stock,
+                    traded_at=timezone.localdate() - timedelta(days=days_ago),
+                    open_price=Decimal("10"),
+                    high_price=Decimal("11"),
+                    low_price=Decimal("9"),
+                    close_price=Decimal("10.5"),
+                    volume=100,
+                )
+        rebuild_interest_anomaly_states()
+
+        User = get_user_model()
+        cls.user = User.objects.create_user(username="plan-user", password="pass1234")
+        Subscription.objects.create(
+            user=cls.user,
+            plan=Subscription.Plan.PRO,
+            is_active=True,
+            start_date=timezone.localdate() - timedelta(days=1),
+            end_date=timezone.localdate() + timedelta(days=30),
+        )
+
+    def assertIndexedPlans(self, func):
+        with CaptureQueriesContext(connection) as queries:
+            func()
+
+        selects = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].lstrip().upper().startswith(("SELECT", "WITH"))
+            and any(table in query["sql"] for table in HOT_TABLES)
+        ]
+        self.assertTrue(selects, "expected at least one hot-table query")
+        for sql in selects:
+            plan = _explain(sql)
+            with self.subTest(sql=sql[:120]):
+                self.assertEqual(
+                    _sequential_scans(plan),
+                    [],
+                    f"Sequential scan on a hot table:\n{sql}\n--- plan ---\n{plan}",
+                )
+
+    def test_interest_service_hot_queries_use_indexes(self):
+        symbol = self.stocks[0].symbol
+        self.assertIndexedPlans(lambda: get_top_interest_stocks(limit=5, hours=24))
+        self.assertIndexedPlans(lambda: get_sector_interest_heatmap(hours=24))
+        self.assertIndexedPlans(lambda: get_interest_timeline(hours=24))
+        self.assertIndexedPlans(lambda: detect_interest_anomalies(limit=5))
+        self.assertIndexedPlans(
+            lambda: detect_interest_anomalies(limit=5, metric=ANOMALY_METRIC_UNIQUE)
+        )
+        self.assertIndexedPlans(lambda: get_unique_mentions([symbol], hours=6))
+        self.assertIndexedPlans(lambda: get_current_interest_anomalies(limit=5))
+        self.assertIndexedPlans(
+            lambda: get_stock_interest_anomaly(Stock.objects.get(symbol=symbol))
+        )
+
+    def test_news_service_hot_queries_use_indexes(self):
+        symbols = [stock.symbol for stock in self.stocks[:3]]
+        self.assertIndexedPlans(lambda: get_related_news(symbols[0], limit=5))
+        self.assertIndexedPlans(lambda: get_latest_news_for_symbols(symbols, limit_per_symbol=2))
+        self.assertIndexedPlans(lambda: get_news_history(symbols[0], limit=5))
+
+    def test_stock_service_hot_queries_use_indexes(self):
+        self.assertIndexedPlans(get_market_summary)
+
+    def test_stock_summary_api_queries_use_indexes(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        url = reverse("api:stock-summary", kwargs={"symbol": self.stocks[0].symbol})
+
+        self.assertIndexedPlans(lambda: self.assertEqual(client.get(url).status_code, 200))
+
+    def test_stock_detail_page_queries_use_indexes(self):
+        cache.clear()
+        url = reverse("stocks:detail", kwargs={"symbol": self.stocks[0].symbol})
+
+        self.assertIndexedPlans(lambda: self.assertEqual(self.client.get(url).status_code, 200))
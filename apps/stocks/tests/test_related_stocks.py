@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from apps.stocks.models import Interest, NewsItem, RelatedStock, Stock
+from services.related_stocks import (
+    build_incidence,
+    co_mention_counts,
+    compute_related_stocks,
+    get_related_stocks,
+)
+
+
+class CoMentionCountsTests(SimpleTestCase):
+    def test_counts_match_incidence_product(self):
+        documents = {1: {10, 20}, 2: {10, 20, 30}, 3: {30}, 4: {10}}
+
+        pair_counts, stock_counts = co_mention_counts(documents)
+
+        self.assertEqual(dict(pair_counts), {(10, 20): 2, (10, 30): 1, (20, 30): 1})
+        self.assertEqual(dict(stock_counts), {10: 3, 20: 2, 30: 2})
+
+
+class RelatedStocksTests(TestCase):
+    def setUp(self):
+        self.nvda = Stock.objects.create(
+            symbol="NVDA", name="Nvidia", market=Stock.Market.USA, is_active=True
+        )
+        self.amd = Stock.objects.create(
+            symbol="AMD", name="AMD", market=Stock.Market.USA, is_active=True
+        )
+        self.ko = Stock.objects.create(
+            symbol="KO", name="Coca-Cola", market=Stock.Market.USA, is_active=True
+        )
+
+    def _news(self, stock, title, idx):
+        return NewsItem.objects.create(
+            stock=stock,
+            title=title,
+            url=f"https://example.com/related-{idx}",
+            published_at=timezone.now(),
+        )
+
+    def test_shared_clusters_and_title_mentions_link_stocks(self):
+        # One wire story attributed to both chip makers.
+        self._news(self.nvda, "Chip stocks climb on AI demand", 1)
+        self._news(self.amd, "Chip stocks climb on AI demand", 2)
+        # A headline filed under NVDA that names AMD.
+        self._news(self.nvda, "Nvidia and AMD unveil data center GPUs", 3)
+        self._news(self.ko, "Coca-Cola raises sales forecast", 4)
+        Interest.objects.create(
+            stock=self.ko,
+            source=Interest.Source.REDDIT,
+            recorded_at=timezone.now(),
+            mentions=1,
+            metadata={"samples": [{"title": "KO dividend hike"}]},
+        )
+
+        result = compute_related_stocks(hours=24, top_k=5, min_co_mentions=2)
+
+        self.assertEqual(result["related"], 2)
+        related = get_related_stocks(self.nvda, limit=5)
+        self.assertEqual([row["symbol"] for row in related], ["AMD"])
+        self.assertEqual(related[0]["co_mentions"], 2)
+        self.assertGreater(related[0]["pmi"], 0)
+        self.assertFalse(RelatedStock.objects.filter(stock=self.ko).exists())
+
+    @override_settings(RELATED_STOCKS_MIN_CO_MENTIONS=5)
+    def test_explicit_zero_threshold_is_not_replaced_by_setting(self):
+        self._news(self.nvda, "Chip stocks climb on AI demand", 1)
+        self._news(self.amd, "Chip stocks climb on AI demand", 2)
+
+        result = compute_related_stocks(hours=24, top_k=5, min_co_mentions=0)
+
+        self.assertEqual(result["related"], 2)
+
+    def test_short_tickers_only_match_uppercase_tokens(self):
+        on = Stock.objects.create(
+            symbol="ON", name="ON Semiconductor", market=Stock.Market.USA, is_active=True
+        )
+        it = Stock.objects.create(
+            symbol="IT", name="Gartner Inc", market=Stock.Market.USA, is_active=True
+        )
+        self._news(self.nvda, "Nvidia bets on AI as it expands", 1)
+        self._news(self.amd, "AMD leans on it too", 2)
+        self._news(self.ko, "Coca-Cola and ON report earnings", 3)
+
+        documents = build_incidence(timezone.now() - timedelta(hours=1))
+
+        self.assertNotIn(it.id, set().union(*documents.values()))
+        self.assertEqual(
+            [stock_ids for stock_ids in documents.values() if on.id in stock_ids],
+            [{self.ko.id, on.id}],
+        )
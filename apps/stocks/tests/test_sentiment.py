@@ -0,0 +1,95 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from apps.stocks.models import Interest, NewsItem, Stock
+from services.sentiment import (
+    mean_sentiment,
+    score_title,
+    score_titles,
+    score_titles_parallel,
+)
+
+
+class SentimentScorerTests(SimpleTestCase):
+    def test_english_and_korean_polarity(self):
+        self.assertGreater(score_title("Chipmaker shares surge on record profit"), 0.5)
+        self.assertLess(score_title("Automaker plunges after recall"), -0.5)
+        self.assertGreater(score_title("삼성전자 흑자전환으로 신고가 경신"), 0.5)
+        self.assertLess(score_title("SK하이닉스 실적 부진 우려"), -0.5)
+        self.assertEqual(score_title("Quarterly results due Thursday"), 0.0)
+
+    def test_negation_flips_the_nearest_sentiment_term(self):
+        self.assertLess(score_title("Chipmaker does not beat estimates"), 0)
+        self.assertLess(score_title("주가 상승하지 않았다"), 0)
+        self.assertGreater(score_title("실적 악화 우려 없다"), score_title("실적 악화 우려"))
+
+    def test_batch_scores_match_single_titles(self):
+        titles = ["Shares surge", "", "급락\n이후 반등", "Weak guidance", "News 0"]
+
+        self.assertEqual(score_titles(titles), [score_title(title) for title in titles])
+
+    def test_process_pool_matches_inline_scoring(self):
+        titles = ["Shares surge", "Automaker plunges after recall", "실적 부진 우려"] * 10
+
+        pooled = score_titles_parallel(titles, workers=2, chunk_size=7)
+
+        self.assertEqual(pooled, score_titles(titles))
+
+    def test_mean_sentiment_is_quantized_or_none(self):
+        self.assertIsNone(mean_sentiment([]))
+        self.assertEqual(mean_sentiment([0.5, -0.25, 0.1]), Decimal("0.12"))
+
+
+class SentimentBackfillTests(TestCase):
+    def test_backfill_command_scores_unscored_news_and_snapshots(self):
+        stock = Stock.objects.create(symbol="SENT", name="Sentiment Corp", is_active=True)
+        item = NewsItem.objects.create(
+            stock=stock,
+            title="Sentiment Corp shares surge",
+            url="https://example.com/sent/1",
+        )
+        NewsItem.objects.filter(id=item.id).update(sentiment=None)
+        snapshot = Interest.objects.create(
+            stock=stock,
+            source=Interest.Source.REDDIT,
+            recorded_at=timezone.now(),
+            mentions=2,
+            metadata={
+                "samples": [{"title": "SENT plunges"}, "malformed", {"title": "SENT update"}]
+            },
+        )
+        compacted = Interest.objects.create(
+            stock=stock,
+            source=Interest.Source.REDDIT,
+            recorded_at=timezone.now(),
+            mentions=4,
+            metadata={"resolution": "hour", "compacted_rows": 2},
+        )
+
+        out = StringIO()
+
+        call_command("backfill_sentiment", "--workers", "2", "--batch-size", "1", stdout=out)
+
+        item.refresh_from_db()
+        snapshot.refresh_from_db()
+        compacted.refresh_from_db()
+        self.assertEqual(item.sentiment, Decimal("0.71"))
+        self.assertEqual(snapshot.sentiment_score, Decimal("-0.35"))
+        self.assertIsNone(compacted.sentiment_score)
+        self.assertIn("news=1, interest=1", out.getvalue())
+
+    def test_explicit_sentiment_is_not_rescored_on_save(self):
+        stock = Stock.objects.create(symbol="KEEP", name="Keep Corp", is_active=True)
+        item = NewsItem.objects.create(
+            stock=stock,
+            title="Keep Corp shares surge",
+            url="https://example.com/keep/1",
+            sentiment=Decimal("-0.50"),
+        )
+
+        item.refresh_from_db()
+        self.assertEqual(item.sentiment, Decimal("-0.50"))
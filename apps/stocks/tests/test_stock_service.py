@@ -1,13 +1,25 @@
+import threading
+import time
 from datetime import timedelta
 from decimal import Decimal
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.utils import timezone
 
-from apps.stocks.models import Price, Stock
+from apps.stocks.models import InterestAnomalyState, Price, Stock
+from apps.watchlist.models import Watchlist, WatchlistItem
+from services.alpha_vantage_quota import (
+    mark_quota_exhausted,
+    release_quota,
+    remaining_quota,
+    reserve_quota,
+)
 from services.stock_service import (
     INDEX_DEFINITIONS,
+    RequestBudget,
     ensure_index_stocks,
     get_market_summary,
     refresh_market_prices,
@@ -15,6 +27,9 @@ from services.stock_service import (
 
 
 class StockServiceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
     def test_ensure_index_stocks_creates_expected_defaults(self):
         result = ensure_index_stocks()
 
@@ -22,44 +37,94 @@ class StockServiceTests(TestCase):
         self.assertEqual(result["created"], len(INDEX_DEFINITIONS))
         self.assertEqual(Stock.objects.count(), len(INDEX_DEFINITIONS))
 
-    @patch("services.stock_service.time.sleep")
+    def test_ensure_index_stocks_is_a_single_read_once_synced(self):
+        ensure_index_stocks()
+        Stock.objects.filter(symbol="KOSPI").update(is_active=False, name="stale")
+
+        repaired = ensure_index_stocks()
+        with self.assertNumQueries(1):
+            steady = ensure_index_stocks()
+
+        self.assertEqual((repaired["created"], repaired["updated"]), (0, 1))
+        self.assertEqual((steady["created"], steady["updated"]), (0, 0))
+        self.assertTrue(Stock.objects.get(symbol="KOSPI").is_active)
+
+    @patch("services.stock_service.ALPHA_VANTAGE_MIN_INTERVAL_SEC", 0.01)
+    @patch("services.stock_service.ALPHA_VANTAGE_RATE_LIMIT_BACKOFF_SEC", 0.01)
     @patch("services.stock_service.fetch_alpha_vantage_quote")
     def test_refresh_market_prices_handles_rate_limit_and_skips_remaining(
         self,
         mock_fetch_alpha_vantage_quote,
-        _mock_sleep,
     ):
         ensure_index_stocks()
         today = timezone.localdate()
-        mock_fetch_alpha_vantage_quote.side_effect = [
-            {
+
+        def fake_fetch(api_symbol, client=None):
+            if api_symbol == "^KS11":
+                return {
+                    "status": "success",
+                    "data": {
+                        "open_price": Decimal("100"),
+                        "high_price": Decimal("110"),
+                        "low_price": Decimal("90"),
+                        "close_price": Decimal("105"),
+                        "volume": 12345,
+                        "traded_at": today,
+                        "raw": {},
+                    },
+                }
+            return {"status": "error", "code": "RATE_LIMIT", "message": "rate limit reached"}
+
+        mock_fetch_alpha_vantage_quote.side_effect = fake_fetch
+
+        with self.settings(ALPHA_VANTAGE_CONCURRENCY=1):
+            result = refresh_market_prices(force=True, stop_on_rate_limit=True)
+
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual(result["inserted"], 1)
+        self.assertEqual([item["reason"] for item in result["failed"]], ["RATE_LIMIT"])
+        self.assertTrue(result["rate_limited"])
+        self.assertGreaterEqual(len(result["skipped"]), 1)
+        self.assertEqual(Price.objects.count(), 1)
+
+    @patch("services.stock_service.ALPHA_VANTAGE_MIN_INTERVAL_SEC", 0.01)
+    @patch("services.stock_service.ALPHA_VANTAGE_RATE_LIMIT_BACKOFF_SEC", 0.01)
+    @patch("services.stock_service.fetch_alpha_vantage_quote")
+    def test_transient_rate_limit_backs_off_without_aborting_the_batch(
+        self,
+        mock_fetch_alpha_vantage_quote,
+    ):
+        ensure_index_stocks()
+        today = timezone.localdate()
+        throttled = set()
+
+        def fake_fetch(api_symbol, client=None):
+            if api_symbol not in throttled:
+                throttled.add(api_symbol)
+                return {"status": "error", "code": "RATE_LIMIT", "message": "rate limit reached"}
+            return {
                 "status": "success",
                 "data": {
-                    "open_price": Decimal("100"),
-                    "high_price": Decimal("110"),
-                    "low_price": Decimal("90"),
-                    "close_price": Decimal("105"),
-                    "volume": 12345,
+                    "open_price": Decimal("1"),
+                    "high_price": Decimal("1"),
+                    "low_price": Decimal("1"),
+                    "close_price": Decimal("1"),
+                    "volume": 1,
                     "traded_at": today,
                     "raw": {},
                 },
-            },
-            {
-                "status": "error",
-                "code": "RATE_LIMIT",
-                "message": "rate limit reached",
-            },
-        ]
+            }
+
+        mock_fetch_alpha_vantage_quote.side_effect = fake_fetch
 
         result = refresh_market_prices(force=True, stop_on_rate_limit=True)
 
-        self.assertEqual(result["status"], "partial")
-        self.assertEqual(result["inserted"], 1)
-        self.assertEqual(len(result["failed"]), 1)
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["inserted"], len(INDEX_DEFINITIONS))
+        self.assertEqual(result["failed"], [])
+        self.assertEqual(result["skipped"], [])
         self.assertTrue(result["rate_limited"])
-        self.assertGreaterEqual(len(result["skipped"]), 1)
-        self.assertEqual(Price.objects.count(), 1)
-        self.assertEqual(mock_fetch_alpha_vantage_quote.call_count, 2)
+        self.assertEqual(mock_fetch_alpha_vantage_quote.call_count, 2 * len(INDEX_DEFINITIONS))
 
     def test_get_market_summary_uses_latest_price_snapshot(self):
         ensure_index_stocks()
@@ -90,3 +155,229 @@ class StockServiceTests(TestCase):
 
         self.assertEqual(kospi_row["price"], "110.00")
         self.assertEqual(kospi_row["change_rate"], 10.0)
+
+    @override_settings(ALPHA_VANTAGE_BULK_QUOTES=True, ALPHA_VANTAGE_CONCURRENCY=2)
+    @patch("services.stock_service.ALPHA_VANTAGE_MIN_INTERVAL_SEC", 0.01)
+    @patch("services.stock_service.fetch_alpha_vantage_bulk_quotes")
+    @patch("services.stock_service.fetch_alpha_vantage_quote")
+    def test_refresh_market_prices_bulk_quotes_with_per_symbol_fallback(
+        self,
+        mock_fetch_alpha_vantage_quote,
+        mock_fetch_bulk_quotes,
+    ):
+        ensure_index_stocks()
+        for symbol in ("AAPL", "MSFT"):
+            Stock.objects.create(symbol=symbol, name=symbol, market=Stock.Market.USA)
+        today = timezone.localdate()
+        quote = {
+            "open_price": Decimal("100"),
+            "high_price": Decimal("110"),
+            "low_price": Decimal("90"),
+            "close_price": Decimal("105"),
+            "volume": 10,
+            "traded_at": today,
+            "raw": {},
+        }
+        mock_fetch_bulk_quotes.return_value = {"AAPL": quote}
+        mock_fetch_alpha_vantage_quote.return_value = {"status": "success", "data": quote}
+
+        result = refresh_market_prices(symbols=["AAPL", "MSFT", "KOSPI"], force=True)
+
+        mock_fetch_bulk_quotes.assert_called_once()
+        self.assertEqual(mock_fetch_bulk_quotes.call_args.args[0], ["AAPL", "MSFT"])
+        called = sorted(call.args[0] for call in mock_fetch_alpha_vantage_quote.call_args_list)
+        self.assertEqual(called, ["MSFT", "^KS11"])
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["inserted"], 3)
+
+    @patch("services.stock_service.ALPHA_VANTAGE_MIN_INTERVAL_SEC", 0.01)
+    @patch("services.stock_service.fetch_alpha_vantage_quote")
+    def test_refresh_market_prices_retries_transient_errors(self, mock_fetch_alpha_vantage_quote):
+        ensure_index_stocks()
+        today = timezone.localdate()
+        mock_fetch_alpha_vantage_quote.side_effect = [
+            {"status": "error", "code": "API_ERROR", "message": "timeout"},
+            {"status": "error", "code": "EMPTY_QUOTE", "message": "no data"},
+            {
+                "status": "success",
+                "data": {
+                    "open_price": Decimal("1"),
+                    "high_price": Decimal("1"),
+                    "low_price": Decimal("1"),
+                    "close_price": Decimal("1"),
+                    "volume": 1,
+                    "traded_at": today,
+                    "raw": {},
+                },
+            },
+        ]
+
+        with self.settings(ALPHA_VANTAGE_CONCURRENCY=1):
+            result = refresh_market_prices(symbols=["KOSPI", "KOSDAQ"], force=True)
+
+        self.assertEqual(mock_fetch_alpha_vantage_quote.call_count, 3)
+        self.assertEqual(result["inserted"], 1)
+        self.assertEqual([item["reason"] for item in result["failed"]], ["EMPTY_QUOTE"])
+
+    @patch("services.stock_service.ALPHA_VANTAGE_MIN_INTERVAL_SEC", 0.01)
+    @patch("services.stock_service.fetch_alpha_vantage_quote")
+    def test_refresh_market_prices_query_count_is_flat(self, mock_fetch_alpha_vantage_quote):
+        ensure_index_stocks()
+        today = timezone.localdate()
+        kospi = Stock.objects.get(symbol="KOSPI")
+        Price.objects.create(
+            stock=kospi,
+            traded_at=today,
+            open_price=Decimal("1"),
+            high_price=Decimal("1"),
+            low_price=Decimal("1"),
+            close_price=Decimal("1"),
+            volume=1,
+        )
+        mock_fetch_alpha_vantage_quote.return_value = {
+            "status": "success",
+            "data": {
+                "open_price": Decimal("100"),
+                "high_price": Decimal("110"),
+                "low_price": Decimal("90"),
+                "close_price": Decimal("105"),
+                "volume": 10,
+                "traded_at": today,
+                "raw": {},
+            },
+        }
+
+        # Index sync, stocks, freshness check, existing-price read, upsert.
+        with self.assertNumQueries(5):
+            result = refresh_market_prices()
+        self.assertEqual(result["skipped"], ["KOSPI"])
+        self.assertEqual((result["inserted"], result["updated"]), (3, 0))
+
+        # force skips the freshness check.
+        with self.assertNumQueries(4):
+            forced = refresh_market_prices(force=True)
+        self.assertEqual((forced["inserted"], forced["updated"]), (0, 4))
+        self.assertEqual(Price.objects.get(stock=kospi).close_price, Decimal("105"))
+
+
+class AlphaVantageQuotaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _quote(self):
+        return {
+            "status": "success",
+            "data": {
+                "open_price": Decimal("1"),
+                "high_price": Decimal("1"),
+                "low_price": Decimal("1"),
+                "close_price": Decimal("1"),
+                "volume": 1,
+                "traded_at": timezone.localdate(),
+                "raw": {},
+            },
+        }
+
+    @override_settings(ALPHA_VANTAGE_DAILY_QUOTA=5)
+    def test_reservations_never_exceed_the_daily_quota(self):
+        self.assertEqual(reserve_quota(3), 3)
+        self.assertEqual(reserve_quota(4), 2)
+        self.assertEqual(reserve_quota(1), 0)
+        release_quota(2)
+        self.assertEqual(remaining_quota(), 2)
+        mark_quota_exhausted()
+        self.assertEqual(remaining_quota(), 0)
+
+    @override_settings(ALPHA_VANTAGE_DAILY_QUOTA=2)
+    def test_reaching_the_quota_is_logged(self):
+        with self.assertLogs("services.alpha_vantage_quota", level="WARNING") as logs:
+            self.assertEqual(reserve_quota(3), 2)
+
+        self.assertIn("daily quota of 2 calls reached", logs.output[0])
+
+    def test_zero_or_unset_quota_means_unmetered(self):
+        for quota in (0, None):
+            with self.subTest(quota=quota), self.settings(ALPHA_VANTAGE_DAILY_QUOTA=quota):
+                self.assertEqual(reserve_quota(500), 500)
+                self.assertIsNone(remaining_quota())
+
+    @override_settings(ALPHA_VANTAGE_DAILY_QUOTA=3, ALPHA_VANTAGE_CONCURRENCY=1)
+    @patch("services.stock_service.ALPHA_VANTAGE_MIN_INTERVAL_SEC", 0.01)
+    @patch("services.stock_service.fetch_alpha_vantage_quote")
+    def test_short_quota_goes_to_indices_then_followed_stocks(self, mock_fetch_alpha_vantage_quote):
+        ensure_index_stocks()
+        stocks = {
+            symbol: Stock.objects.create(symbol=symbol, name=symbol, market=Stock.Market.USA)
+            for symbol in ("AAA", "HOT", "WATCH")
+        }
+        user = get_user_model().objects.create_user(username="quota", password="pass1234")
+        watchlist = Watchlist.objects.create(user=user, name="Main")
+        WatchlistItem.objects.create(watchlist=watchlist, stock=stocks["WATCH"])
+        InterestAnomalyState.objects.create(
+            stock=stocks["HOT"],
+            bucket_start=timezone.now(),
+            is_anomalous=True,
+        )
+        mock_fetch_alpha_vantage_quote.return_value = self._quote()
+
+        result = refresh_market_prices(symbols=["AAA", "HOT", "WATCH", "KOSPI"], force=True)
+
+        called = [call.args[0] for call in mock_fetch_alpha_vantage_quote.call_args_list]
+        self.assertEqual(called[0], "^KS11")
+        self.assertEqual(sorted(called[1:]), ["HOT", "WATCH"])
+        self.assertEqual(result["skipped"], ["AAA"])
+        self.assertTrue(result["rate_limited"])
+        self.assertEqual(result["quota_remaining"], 0)
+
+    @override_settings(ALPHA_VANTAGE_DAILY_QUOTA=25, ALPHA_VANTAGE_CONCURRENCY=1)
+    @patch("services.stock_service.ALPHA_VANTAGE_MIN_INTERVAL_SEC", 0.01)
+    @patch("services.stock_service.fetch_alpha_vantage_quote")
+    def test_provider_daily_limit_stops_further_calls(self, mock_fetch_alpha_vantage_quote):
+        ensure_index_stocks()
+        mock_fetch_alpha_vantage_quote.return_value = {
+            "status": "error",
+            "code": "RATE_LIMIT",
+            "message": "Our standard API rate limit is 25 requests per day.",
+        }
+
+        first = refresh_market_prices(force=True, stop_on_rate_limit=False)
+        second = refresh_market_prices(force=True, stop_on_rate_limit=False)
+
+        self.assertEqual(mock_fetch_alpha_vantage_quote.call_count, 1)
+        self.assertEqual(first["quota_remaining"], 0)
+        self.assertEqual(len(second["skipped"]), len(INDEX_DEFINITIONS))
+
+
+class RequestBudgetTests(SimpleTestCase):
+    def test_slots_are_spaced_across_threads(self):
+        budget = RequestBudget(0.05)
+        granted = []
+        lock = threading.Lock()
+
+        def worker():
+            budget.acquire()
+            with lock:
+                granted.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        granted.sort()
+        gaps = [later - earlier for earlier, later in zip(granted, granted[1:])]
+        self.assertTrue(all(gap >= 0.04 for gap in gaps), gaps)
+
+    def test_close_releases_waiters(self):
+        budget = RequestBudget(10)
+        self.assertTrue(budget.acquire())
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(budget.acquire()))
+        waiter.start()
+
+        budget.close()
+        waiter.join(timeout=1)
+
+        self.assertEqual(results, [False])
+        self.assertFalse(budget.acquire())
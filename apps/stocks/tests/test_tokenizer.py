@@ -0,0 +1,70 @@
+from django.test import SimpleTestCase, TestCase
+
+from apps.stocks.models import Stock
+from services import tokenizer
+from services.tokenizer import count_tokens, extract_tokens, normalize_token, stock_stopwords
+
+
+class TokenizerTests(SimpleTestCase):
+    def test_korean_particles_are_stripped_longest_first(self):
+        self.assertEqual(normalize_token("삼성전자는"), "삼성전자")
+        self.assertEqual(normalize_token("미국으로부터"), "미국")
+        self.assertEqual(normalize_token("반도체에서는"), "반도체")
+
+    def test_nouns_ending_in_particle_like_syllables_are_kept(self):
+        for word in ("디스플레이", "에코프로", "공매도", "카카오페이", "마이크로", "민주주의", "전문가"):
+            with self.subTest(word=word):
+                self.assertEqual(normalize_token(word), word)
+        self.assertEqual(normalize_token("디스플레이는"), "디스플레이")
+        self.assertEqual(normalize_token("공매도를"), "공매도")
+        self.assertEqual(
+            extract_tokens("에코프로 공매도 전문가 전망"),
+            ["에코프로", "공매도", "전문가", "전망"],
+        )
+
+    def test_short_stems_and_particle_like_nouns_are_kept(self):
+        self.assertEqual(normalize_token("주가"), "주가")
+        self.assertEqual(normalize_token("국제유가"), "국제유가")
+        self.assertEqual(normalize_token("목표주가를"), "목표주가")
+        self.assertEqual(normalize_token("마을"), "마을")
+        self.assertEqual(normalize_token("rally"), "rally")
+
+    def test_batch_count_matches_per_title_extraction(self):
+        titles = ["SK하이닉스의 실적은 호조", "하이닉스 실적 발표", "Chip rally, chip demand"]
+
+        expected = {}
+        for title in titles:
+            for token in extract_tokens(title):
+                expected[token] = expected.get(token, 0) + 1
+
+        self.assertEqual(dict(count_tokens(titles)), expected)
+        self.assertEqual(count_tokens(titles)["실적"], 2)
+
+
+class StockStopwordsTests(TestCase):
+    def setUp(self):
+        tokenizer.invalidate_stock_stopwords()
+        self.stock = Stock.objects.create(
+            symbol="ACME",
+            name="Acme Holdings",
+            market=Stock.Market.USA,
+            is_active=True,
+        )
+
+    def test_stopwords_are_memoized_per_stock(self):
+        first = stock_stopwords(self.stock)
+
+        self.assertIs(stock_stopwords(self.stock), first)
+        self.assertIn("acme", first)
+        self.assertIn("holdings", first)
+
+    def test_saving_stock_refreshes_its_stopwords(self):
+        stock_stopwords(self.stock)
+
+        self.stock.name = "Acme Robotics"
+        self.stock.save()
+
+        self.assertNotIn(self.stock.pk, tokenizer._stock_stopwords)
+        refreshed = stock_stopwords(self.stock)
+        self.assertIn("robotics", refreshed)
+        self.assertNotIn("holdings", refreshed)
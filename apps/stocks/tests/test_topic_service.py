@@ -3,8 +3,13 @@ from datetime import timedelta
 from django.test import TestCase
 from django.utils import timezone
 
-from apps.stocks.models import Interest, NewsItem, Stock
-from services.topic_service import _collect_text_samples, build_stock_topic_cloud
+from apps.stocks.models import Interest, NewsItem, Stock, StockKeywordCounter
+from services.topic_service import (
+    build_stock_topic_cloud,
+    compute_topic_keywords,
+    rebuild_keyword_counters,
+    record_keyword_counts,
+)
 
 
 class TopicServiceTests(TestCase):
@@ -23,12 +28,9 @@ class TopicServiceTests(TestCase):
         self.assertEqual(cloud, [])
 
     def test_build_stock_topic_cloud_filters_stopwords_and_stock_tokens(self):
-        NewsItem.objects.create(
-            stock=self.stock,
-            title="ACME stock market breakout breakout holdings",
-            url="https://example.com/topic-filter",
-            publisher="Example",
-            published_at=timezone.now(),
+        record_keyword_counts(
+            {self.stock: ["ACME stock market breakout breakout holdings"]},
+            recorded_at=timezone.now(),
         )
 
         cloud = build_stock_topic_cloud(stock=self.stock, hours=72, max_keywords=10)
@@ -41,26 +43,10 @@ class TopicServiceTests(TestCase):
 
     def test_build_stock_topic_cloud_respects_max_keywords_and_weights(self):
         now = timezone.now()
-        NewsItem.objects.create(
-            stock=self.stock,
-            title="alpha alpha beta",
-            url="https://example.com/topic-1",
-            publisher="Example",
-            published_at=now,
-        )
-        NewsItem.objects.create(
-            stock=self.stock,
-            title="alpha gamma",
-            url="https://example.com/topic-2",
-            publisher="Example",
-            published_at=now - timedelta(minutes=1),
-        )
-        Interest.objects.create(
-            stock=self.stock,
-            source=Interest.Source.REDDIT,
-            recorded_at=now,
-            mentions=4,
-            metadata={"samples": [{"title": "beta delta"}]},
+        record_keyword_counts({self.stock: ["alpha alpha beta"]}, recorded_at=now)
+        record_keyword_counts(
+            {self.stock: ["alpha gamma", "beta delta"]},
+            recorded_at=now - timedelta(hours=2),
         )
 
         cloud = build_stock_topic_cloud(stock=self.stock, hours=72, max_keywords=2)
@@ -75,46 +61,115 @@ class TopicServiceTests(TestCase):
         self.assertEqual(cloud[1]["weight"], 0.6667)
         self.assertEqual(cloud[1]["font_size"], 1.353)
 
-    def test_collect_text_samples_respects_time_window_and_max_size(self):
+    def test_record_keyword_counts_accumulates_within_hour_bucket(self):
         now = timezone.now()
+        record_keyword_counts({self.stock: ["rally"]}, recorded_at=now)
+        record_keyword_counts({self.stock: ["rally rally"]}, recorded_at=now)
+        record_keyword_counts(
+            {self.stock: ["rally"]},
+            recorded_at=now - timedelta(hours=30),
+        )
 
-        for idx in range(130):
-            NewsItem.objects.create(
-                stock=self.stock,
-                title=f"recent-news-{idx}",
-                url=f"https://example.com/recent-news-{idx}",
-                publisher="Example",
-                published_at=now - timedelta(minutes=idx),
-            )
+        counter = StockKeywordCounter.objects.get(
+            stock=self.stock,
+            bucket_start=now.replace(minute=0, second=0, microsecond=0),
+        )
+        self.assertEqual(counter.count, 3)
+        cloud = build_stock_topic_cloud(stock=self.stock, hours=24, max_keywords=5)
+        self.assertEqual([(row["keyword"], row["count"]) for row in cloud], [("rally", 3)])
 
-        old_news = NewsItem.objects.create(
+    def test_record_keyword_counts_increments_rows_in_the_database(self):
+        bucket_start = timezone.now().replace(minute=0, second=0, microsecond=0)
+        counter = StockKeywordCounter.objects.create(
             stock=self.stock,
-            title="too-old-news",
-            url="https://example.com/too-old-news",
-            publisher="Example",
-            published_at=now - timedelta(hours=30),
+            bucket_start=bucket_start,
+            keyword="rally",
+            count=5,
+        )
+
+        record_keyword_counts({self.stock: ["rally"]}, recorded_at=bucket_start)
+
+        counter.refresh_from_db()
+        self.assertEqual(counter.count, 6)
+        self.assertEqual(StockKeywordCounter.objects.count(), 1)
+
+    def test_rebuild_keyword_counters_keeps_buckets_past_raw_retention(self):
+        now = timezone.now()
+        compacted_bucket = (now - timedelta(hours=100)).replace(minute=0, second=0, microsecond=0)
+        StockKeywordCounter.objects.create(
+            stock=self.stock, bucket_start=compacted_bucket, keyword="merger", count=4
         )
-        NewsItem.objects.filter(pk=old_news.pk).update(created_at=now - timedelta(hours=30))
-
-        for idx in range(90):
-            Interest.objects.create(
-                stock=self.stock,
-                source=Interest.Source.NEWS,
-                recorded_at=now - timedelta(minutes=idx),
-                mentions=1,
-                metadata={"samples": [{"title": f"recent-interest-{idx}"}]},
-            )
 
+        with self.settings(INTEREST_RAW_RETENTION_HOURS=72):
+            result = rebuild_keyword_counters(now - timedelta(hours=120), now, now=now)
+
+        self.assertGreater(result["start"], compacted_bucket)
+        self.assertEqual(
+            StockKeywordCounter.objects.get(bucket_start=compacted_bucket, keyword="merger").count,
+            4,
+        )
+
+    def test_rebuild_keyword_counters_reads_news_and_crawler_samples(self):
+        now = timezone.now()
+        NewsItem.objects.create(
+            stock=self.stock,
+            title="merger talks",
+            url="https://example.com/topic-rebuild",
+            publisher="Example",
+            published_at=now,
+        )
         Interest.objects.create(
             stock=self.stock,
             source=Interest.Source.REDDIT,
-            recorded_at=now - timedelta(hours=30),
+            recorded_at=now,
             mentions=1,
-            metadata={"samples": [{"title": "too-old-interest"}]},
+            metadata={"samples": [{"title": "merger vote"}]},
         )
+        Interest.objects.create(
+            stock=self.stock,
+            source=Interest.Source.NEWS,
+            recorded_at=now,
+            mentions=1,
+            metadata={"samples": [{"title": "merger talks"}]},
+        )
+
+        result = rebuild_keyword_counters(now - timedelta(hours=1), now + timedelta(minutes=1))
 
-        samples = _collect_text_samples(stock=self.stock, hours=24)
+        self.assertEqual(result["rows"], 3)
+        cloud = build_stock_topic_cloud(stock=self.stock, hours=24, max_keywords=5)
+        self.assertEqual(
+            [(row["keyword"], row["count"]) for row in cloud],
+            [("merger", 2), ("talks", 1), ("vote", 1)],
+        )
 
-        self.assertEqual(len(samples), 200)
-        self.assertNotIn("too-old-news", samples)
-        self.assertNotIn("too-old-interest", samples)
+    def test_compute_topic_keywords_demotes_terms_shared_across_stocks(self):
+        others = [
+            Stock.objects.create(
+                symbol=symbol,
+                name=f"{symbol} Corp",
+                market=Stock.Market.USA,
+                sector="Auto",
+                is_active=True,
+            )
+            for symbol in ("BOLT", "CRUX", "DYNE")
+        ]
+        record_keyword_counts(
+            {
+                self.stock: ["shares rally", "shares acquisition"],
+                **{other: ["shares"] for other in others},
+            },
+            recorded_at=timezone.now(),
+        )
+
+        result = compute_topic_keywords(hours=72, top_k=5)
+
+        self.assertEqual(result, {"stocks": 4, "terms": 3, "keywords": 6})
+        with self.assertNumQueries(1):
+            cloud = build_stock_topic_cloud(stock=self.stock, hours=72, max_keywords=5)
+        self.assertEqual(
+            [row["keyword"] for row in cloud],
+            ["acquisition", "rally", "shares"],
+        )
+        self.assertEqual(cloud[0]["weight"], 1.0)
+        self.assertEqual(cloud[2]["count"], 2)
+        self.assertLess(cloud[2]["weight"], cloud[1]["weight"])
@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+import redis
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from services.trending_terms import (
+    CountMinSketch,
+    SpaceSaving,
+    TrendingSketch,
+    TRENDING_LOCK_ATTEMPTS,
+    _bucket_key,
+    _hour_bucket,
+    get_trending_terms,
+    record_trending_terms,
+)
+
+
+class SketchTests(SimpleTestCase):
+    def test_count_min_sketch_never_undercounts(self):
+        sketch = CountMinSketch(width=16, depth=3)
+        for idx in range(200):
+            sketch.add(f"term-{idx % 40}")
+
+        for idx in range(40):
+            self.assertGreaterEqual(sketch.estimate(f"term-{idx}"), 5)
+
+    def test_space_saving_keeps_heavy_hitters_in_fixed_capacity(self):
+        summary = SpaceSaving(capacity=5)
+        for idx in range(500):
+            summary.add("rate" if idx % 3 == 0 else f"noise-{idx}")
+
+        self.assertEqual(len(summary.counters), 5)
+        count, error = summary.counters["rate"]
+        self.assertGreaterEqual(count, 167)
+        self.assertLessEqual(count - error, 167)
+
+    @override_settings(TRENDING_CMS_WIDTH=64, TRENDING_CMS_DEPTH=3, TRENDING_TOP_K=4)
+    def test_merged_sketches_rank_like_a_single_stream(self):
+        left = TrendingSketch()
+        right = TrendingSketch()
+        for term, count in (("chip", 6), ("rate", 2), ("oil", 1)):
+            left.add(term, count)
+        for term, count in (("rate", 5), ("chip", 1), ("ev", 3)):
+            right.add(term, count)
+
+        merged = TrendingSketch.from_payload(left.to_payload()).merge(right)
+
+        self.assertEqual(merged.top(2), [("chip", 7), ("rate", 7)])
+
+
+@override_settings(TRENDING_CMS_WIDTH=256, TRENDING_CMS_DEPTH=4, TRENDING_TOP_K=20)
+class TrendingTermsTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_recorded_batches_merge_into_window_ranking(self):
+        record_trending_terms(["Chip rally lifts exporters", "chip stocks rally"])
+        record_trending_terms(["Chip export curbs", "Oil slides"])
+
+        rows = get_trending_terms(hours=6, limit=3)
+
+        self.assertEqual([row["term"] for row in rows], ["chip", "rally", "curbs"])
+        self.assertEqual(rows[0]["count"], 3)
+        self.assertEqual(rows[0]["weight"], 1.0)
+
+    def test_empty_window_returns_no_terms(self):
+        self.assertEqual(get_trending_terms(hours=6, limit=5), [])
+
+    def test_cache_errors_do_not_escape_the_ingest_hook(self):
+        with patch(
+            "services.trending_terms.cache.get",
+            side_effect=redis.ConnectionError("redis down"),
+        ), self.assertLogs("services.trending_terms", level="WARNING"):
+            self.assertFalse(record_trending_terms(["Chip rally"]))
+
+    @patch("services.trending_terms.time.sleep")
+    def test_contended_bucket_is_skipped_after_bounded_wait(self, mock_sleep):
+        key = _bucket_key(_hour_bucket(timezone.now()))
+        cache.add(f"{key}:lock", 1)
+
+        with self.assertLogs("services.trending_terms", level="WARNING"):
+            self.assertFalse(record_trending_terms(["Chip rally"]))
+
+        self.assertEqual(mock_sleep.call_count, TRENDING_LOCK_ATTEMPTS - 1)
+        self.assertIsNone(cache.get(key))
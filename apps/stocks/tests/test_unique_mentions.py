@@ -0,0 +1,132 @@
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from apps.stocks.models import Interest, InterestUniqueSketch, Stock
+from services.hyperloglog import HyperLogLog
+from services.interest_service import (
+    ANOMALY_METRIC_UNIQUE,
+    collect_interest_snapshot,
+    detect_interest_anomalies,
+)
+from services.unique_mentions import (
+    get_unique_mentions,
+    mention_identity,
+    prune_unique_sketches,
+    record_unique_mentions,
+)
+
+
+class HyperLogLogTests(SimpleTestCase):
+    def test_estimates_stay_within_three_standard_errors(self):
+        # 1.04 / sqrt(1024) ~ 3.25% standard error at the default precision.
+        for size in (10, 1000, 50000):
+            sketch = HyperLogLog().update(f"user-{idx}" for idx in range(size))
+            self.assertAlmostEqual(sketch.count(), size, delta=max(1, size * 0.1))
+
+    def test_merge_is_a_union_and_bytes_round_trip(self):
+        left = HyperLogLog().update(f"user-{idx}" for idx in range(3000))
+        right = HyperLogLog().update(f"user-{idx}" for idx in range(2000, 5000))
+
+        restored = HyperLogLog.from_bytes(left.to_bytes()).merge(right)
+
+        self.assertEqual(len(left.to_bytes()), 1024)
+        self.assertAlmostEqual(restored.count(), 5000, delta=250)
+        with self.assertRaises(ValueError):
+            left.merge(HyperLogLog(precision=8))
+
+    def test_identity_prefers_author_over_post(self):
+        record = SimpleNamespace(url="https://r.example/1", title="t", metadata={"author": "kim"})
+        deleted = SimpleNamespace(
+            url="https://r.example/2", title="t", metadata={"author": "[deleted]"}
+        )
+
+        self.assertEqual(mention_identity("reddit", record), "reddit:author:kim")
+        self.assertEqual(mention_identity("reddit", deleted), "reddit:post:https://r.example/2")
+
+
+class UniqueMentionTests(TestCase):
+    def setUp(self):
+        self.stock = Stock.objects.create(
+            symbol="UNIQ",
+            name="Unique Inc",
+            market=Stock.Market.USA,
+            is_active=True,
+        )
+        self.now = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+    def test_sketches_merge_within_the_hour_and_across_the_window(self):
+        key = (self.stock.id, Interest.Source.REDDIT)
+        record_unique_mentions({key: ["a", "b", "a"]}, recorded_at=self.now)
+        record_unique_mentions({key: ["b", "c"]}, recorded_at=self.now + timedelta(minutes=30))
+        record_unique_mentions({key: ["c", "d"]}, recorded_at=self.now - timedelta(hours=1))
+
+        sketch = InterestUniqueSketch.objects.get(bucket_start=self.now)
+        self.assertEqual(InterestUniqueSketch.objects.count(), 2)
+        self.assertEqual(sketch.estimate, 3)
+        self.assertEqual(get_unique_mentions([self.stock.symbol], hours=2), {"UNIQ": 4})
+        self.assertEqual(get_unique_mentions([self.stock.symbol], hours=1), {"UNIQ": 3})
+
+    def test_prune_drops_sketches_past_retention(self):
+        key = (self.stock.id, Interest.Source.REDDIT)
+        record_unique_mentions({key: ["a"]}, recorded_at=self.now - timedelta(days=60))
+        record_unique_mentions({key: ["a"]}, recorded_at=self.now)
+
+        self.assertEqual(prune_unique_sketches(), 1)
+        self.assertEqual(InterestUniqueSketch.objects.count(), 1)
+
+    def test_snapshot_records_distinct_authors_per_source(self):
+        class SpamCrawler:
+            source = Interest.Source.REDDIT
+
+            def fetch(self, stocks, limit_per_symbol=3):
+                return [
+                    SimpleNamespace(
+                        symbol=stocks[0].symbol,
+                        source=Interest.Source.REDDIT,
+                        title=f"UNIQ buy now {idx}",
+                        url=f"https://reddit.example.com/{idx}",
+                        published_at=None,
+                        metadata={"author": "spammer" if idx < 8 else f"user{idx}"},
+                    )
+                    for idx in range(10)
+                ]
+
+        with patch("services.interest_service.DEFAULT_SOURCE_CRAWLERS", (SpamCrawler,)):
+            collect_interest_snapshot(limit_stocks=5)
+
+        sketch = InterestUniqueSketch.objects.get(stock=self.stock)
+        self.assertEqual(sketch.source, Interest.Source.REDDIT)
+        self.assertEqual(sketch.estimate, 3)
+
+    def test_unique_metric_ignores_a_single_author_flood(self):
+        key = (self.stock.id, Interest.Source.REDDIT)
+        for hours_ago in range(6, 78):
+            recorded_at = self.now - timedelta(hours=hours_ago)
+            Interest.objects.create(
+                stock=self.stock,
+                source=Interest.Source.REDDIT,
+                recorded_at=recorded_at,
+                mentions=1,
+            )
+            record_unique_mentions({key: [f"user-{hours_ago}"]}, recorded_at=recorded_at)
+        for hours_ago in range(0, 6):
+            recorded_at = self.now - timedelta(hours=hours_ago)
+            Interest.objects.create(
+                stock=self.stock,
+                source=Interest.Source.REDDIT,
+                recorded_at=recorded_at,
+                mentions=20,
+            )
+            record_unique_mentions({key: ["spammer"]}, recorded_at=recorded_at)
+
+        by_mentions = detect_interest_anomalies(limit=5)
+        by_unique = detect_interest_anomalies(limit=5, metric=ANOMALY_METRIC_UNIQUE)
+
+        self.assertEqual([row["symbol"] for row in by_mentions], ["UNIQ"])
+        self.assertEqual(by_unique, [])
+        with self.assertRaises(ValueError):
+            detect_interest_anomalies(metric="authors")
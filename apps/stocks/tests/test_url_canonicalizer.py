@@ -0,0 +1,30 @@
+from django.test import SimpleTestCase
+
+from services.url_canonicalizer import canonicalize_url, url_hash
+
+
+class UrlCanonicalizerTests(SimpleTestCase):
+    def test_tracking_params_fragments_and_default_ports_are_dropped(self):
+        self.assertEqual(
+            canonicalize_url(
+                "HTTPS://Example.com:443/news/story/?utm_source=rss&b=2&fbclid=x&a=1#top"
+            ),
+            "https://example.com/news/story?a=1&b=2",
+        )
+
+    def test_google_news_rss_links_collapse_to_article_id(self):
+        self.assertEqual(
+            canonicalize_url("https://news.google.com/rss/articles/CBMiQ2h0?oc=5&hl=en-US"),
+            "https://news.google.com/articles/CBMiQ2h0",
+        )
+
+    def test_google_redirects_resolve_to_target(self):
+        self.assertEqual(
+            canonicalize_url(
+                "https://www.google.com/url?rct=j&url=https%3A%2F%2Fexample.com%2Fa%3Futm_medium%3Dx"
+            ),
+            "https://example.com/a",
+        )
+
+    def test_url_hash_is_fixed_width(self):
+        self.assertEqual(len(url_hash(canonicalize_url("https://example.com/a"))), 40)
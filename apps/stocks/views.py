@@ -1,13 +1,16 @@
 from django.conf import settings
 from django.core.cache import cache
-from django.db.models import Q, Sum
-from django.db.models.functions import TruncDate
+from django.db.models import Q
 from django.shortcuts import get_object_or_404, render
-from django.utils import timezone
 
 from apps.watchlist.models import Watchlist, WatchlistItem
-from services.interest_service import get_stock_interest_anomaly
+from services.interest_service import (
+    get_recent_interest_records,
+    get_stock_daily_interest,
+    get_stock_interest_anomaly,
+)
 from services.news_service import get_related_news
+from services.related_stocks import get_related_stocks
 from services.topic_service import build_stock_topic_cloud
 from services.watchlist_service import get_watchlist_limit
 
@@ -16,34 +19,23 @@ from .models import Stock
 
 def _build_stock_detail_payload(stock):
     prices = list(stock.prices.order_by("-traded_at")[:30])[::-1]
-    interest = list(stock.interest_records.order_by("-recorded_at")[:50])[::-1]
+    interest = get_recent_interest_records(stock, limit=50)
     news = get_related_news(stock_symbol=stock.symbol, limit=5)
     topic_cloud = build_stock_topic_cloud(stock=stock, hours=72, max_keywords=24)
+    related_stocks = get_related_stocks(stock=stock, limit=8)
     stock_anomaly = get_stock_interest_anomaly(stock=stock)
-    start_date = timezone.localdate() - timezone.timedelta(days=60)
-    interest_by_day = (
-        stock.interest_records.filter(recorded_at__date__gte=start_date)
-        .annotate(day=TruncDate("recorded_at"))
-        .values("day")
-        .annotate(total_mentions=Sum("mentions"))
-        .order_by("day")
-    )
-
     price_chart_data = [
         {"date": row.traded_at.isoformat(), "close": float(row.close_price)}
         for row in prices
     ]
-    interest_chart_data = [
-        {"date": row["day"].isoformat(), "mentions": int(row["total_mentions"] or 0)}
-        for row in interest_by_day
-        if row["day"] is not None
-    ]
+    interest_chart_data = get_stock_daily_interest(stock, days=60)
 
     return {
         "prices": prices,
         "interest_records": interest,
         "news_items": news,
         "topic_cloud": topic_cloud,
+        "related_stocks": related_stocks,
         "stock_anomaly": stock_anomaly,
         "price_chart_data": price_chart_data,
         "interest_chart_data": interest_chart_data,
@@ -51,7 +43,7 @@ def _build_stock_detail_payload(stock):
 
 
 def _cached_stock_detail_payload(stock):
-    cache_key = f"stocks:detail:{stock.symbol}:v1"
+    cache_key = f"stocks:detail:{stock.symbol}:v2"
     cached = cache.get(cache_key)
     if cached is not None:
         return cached
@@ -284,6 +284,32 @@ CACHE_TTL_HEATMAP = _env_int("CACHE_TTL_HEATMAP", default=600)
 CACHE_TTL_TIMELINE = _env_int("CACHE_TTL_TIMELINE", default=600)
 CACHE_TTL_ANOMALIES = _env_int("CACHE_TTL_ANOMALIES", default=300)
 CACHE_TTL_STOCK_DETAIL = _env_int("CACHE_TTL_STOCK_DETAIL", default=300)
+CACHE_TTL_LEADERBOARD_WINDOW = _env_int("CACHE_TTL_LEADERBOARD_WINDOW", default=60)
+CACHE_TTL_TRENDING_TERMS = _env_int("CACHE_TTL_TRENDING_TERMS", default=120)
+INTEREST_LEADERBOARD_ENABLED = _env_bool("INTEREST_LEADERBOARD_ENABLED", default=not IS_TESTING)
+PARTITION_MONTHS_AHEAD = _env_int("PARTITION_MONTHS_AHEAD", default=3)
+PARTITION_RETENTION_MONTHS = _env_int("PARTITION_RETENTION_MONTHS", default=13)
+# Off by default: the monthly task then only creates upcoming partitions.
+PARTITION_DROP_EXPIRED = _env_bool("PARTITION_DROP_EXPIRED", default=False)
+INTEREST_RAW_RETENTION_HOURS = _env_int("INTEREST_RAW_RETENTION_HOURS", default=72)
+INTEREST_HOURLY_RETENTION_DAYS = _env_int("INTEREST_HOURLY_RETENTION_DAYS", default=35)
+INTEREST_COMPACTION_WINDOW_HOURS = _env_int("INTEREST_COMPACTION_WINDOW_HOURS", default=6)
+INTEREST_SKETCH_RETENTION_DAYS = _env_int("INTEREST_SKETCH_RETENTION_DAYS", default=35)
+# Must be storage shared by web, worker and beat; archiving is refused while unset.
+NEWS_ARCHIVE_DIR = os.getenv("NEWS_ARCHIVE_DIR", "")
+NEWS_ARCHIVE_AFTER_DAYS = _env_int("NEWS_ARCHIVE_AFTER_DAYS", default=90)
+NEWS_ARCHIVE_MAX_MONTHS_SCANNED = _env_int("NEWS_ARCHIVE_MAX_MONTHS_SCANNED", default=6)
+HEADLINE_CLUSTER_WINDOW_HOURS = _env_int("HEADLINE_CLUSTER_WINDOW_HOURS", default=72)
+TOPIC_KEYWORD_RETENTION_DAYS = _env_int("TOPIC_KEYWORD_RETENTION_DAYS", default=30)
+TOPIC_TFIDF_WINDOW_HOURS = _env_int("TOPIC_TFIDF_WINDOW_HOURS", default=72)
+TOPIC_TFIDF_TOP_K = _env_int("TOPIC_TFIDF_TOP_K", default=24)
+RELATED_STOCKS_WINDOW_HOURS = _env_int("RELATED_STOCKS_WINDOW_HOURS", default=24 * 7)
+RELATED_STOCKS_TOP_K = _env_int("RELATED_STOCKS_TOP_K", default=10)
+RELATED_STOCKS_MIN_CO_MENTIONS = _env_int("RELATED_STOCKS_MIN_CO_MENTIONS", default=2)
+TRENDING_CMS_WIDTH = _env_int("TRENDING_CMS_WIDTH", default=2048)
+TRENDING_CMS_DEPTH = _env_int("TRENDING_CMS_DEPTH", default=4)
+TRENDING_TOP_K = _env_int("TRENDING_TOP_K", default=200)
+TRENDING_RETENTION_HOURS = _env_int("TRENDING_RETENTION_HOURS", default=48)
 
 CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
@@ -298,12 +324,41 @@ if _module_exists("celery"):
         "daily-data-pipeline": {
             "task": "apps.briefing.tasks.run_daily_pipeline_task",
             "schedule": crontab(hour=7, minute=0),
-        }
+        },
+        "monthly-partition-maintenance": {
+            "task": "apps.stocks.tasks.manage_partitions_task",
+            "schedule": crontab(day_of_month=1, hour=3, minute=30),
+        },
+        "daily-interest-compaction": {
+            "task": "apps.stocks.tasks.compact_interest_task",
+            "schedule": crontab(hour=4, minute=0),
+        },
+        "hourly-topic-keywords": {
+            "task": "apps.stocks.tasks.compute_topic_keywords_task",
+            "schedule": crontab(minute=20),
+        },
+        "hourly-related-stocks": {
+            "task": "apps.stocks.tasks.compute_related_stocks_task",
+            "schedule": crontab(minute=40),
+        },
+        "daily-keyword-counter-prune": {
+            "task": "apps.stocks.tasks.prune_keyword_counters_task",
+            "schedule": crontab(hour=4, minute=15),
+        },
+        "daily-unique-sketch-prune": {
+            "task": "apps.stocks.tasks.prune_unique_sketches_task",
+            "schedule": crontab(hour=4, minute=25),
+        },
     }
 
 GEMINI_API_KEY = _require_env("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")
 ALPHA_VANTAGE_API_KEY = _require_env("ALPHA_VANTAGE_API_KEY")
+ALPHA_VANTAGE_CONCURRENCY = _env_int("ALPHA_VANTAGE_CONCURRENCY", default=4)
+# REALTIME_BULK_QUOTES needs a premium key; free keys stay on per-symbol quotes.
+ALPHA_VANTAGE_BULK_QUOTES = _env_bool("ALPHA_VANTAGE_BULK_QUOTES", default=False)
+# Calls per key per day (25 on the free tier). Unset or 0 leaves the key unmetered.
+ALPHA_VANTAGE_DAILY_QUOTA = _env_int("ALPHA_VANTAGE_DAILY_QUOTA", default=0)
 
 EMAIL_BACKEND = os.getenv(
     "EMAIL_BACKEND",
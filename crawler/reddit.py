@@ -35,7 +35,10 @@ class RedditCrawler(BaseCrawler):
                         title=data.get("title", "").strip() or f"{stock.symbol} mention",
                         url=f"https://www.reddit.com{data.get('permalink', '')}",
                         published_at=published_at,
-                        metadata={"subreddit": data.get("subreddit", "")},
+                        metadata={
+                            "subreddit": data.get("subreddit", ""),
+                            "author": data.get("author", ""),
+                        },
                     )
                 )
             return records
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import timeit
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.tokenizer import STOPWORDS, TOKEN_PATTERN, build_stopwords, count_tokens
+
+DEFAULT_CORPUS = ROOT / "scripts" / "data" / "headline_corpus.txt"
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare per-title tokenization cost of the legacy and batch tokenizers.",
+    )
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=25, help="Corpus copies per batch.")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5,
+        help="Titles per tokenizer call; ingest counts a handful of titles per stock.",
+    )
+    parser.add_argument(
+        "--capture",
+        type=int,
+        default=0,
+        help="Overwrite --corpus with the N most recent NewsItem titles before timing.",
+    )
+    return parser.parse_args()
+
+
+def _capture_corpus(path: Path, limit: int) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from apps.stocks.models import NewsItem
+
+    titles = NewsItem.objects.order_by("-id").values_list("title", flat=True)[:limit]
+    path.write_text("\n".join(titles) + "\n", encoding="utf-8")
+
+
+def _legacy_count(titles: list[str], symbol: str, name: str) -> Counter:
+    # The pre-tokenizer path: stopwords rebuilt per call, tokens filtered one by one.
+    stopwords = set(STOPWORDS)
+    stopwords.add(symbol.lower())
+    stopwords.update(TOKEN_PATTERN.findall(name.lower()))
+    counter = Counter()
+    for title in titles:
+        for raw in TOKEN_PATTERN.findall(title.lower()):
+            token = raw.strip()
+            if len(token) >= 2 and token not in stopwords:
+                counter[token] += 1
+    return counter
+
+
+def main() -> int:
+    args = _parse_args()
+    if args.capture:
+        _capture_corpus(args.corpus, args.capture)
+
+    corpus = [line.strip() for line in args.corpus.read_text(encoding="utf-8").splitlines()]
+    titles = [title for title in corpus if title] * args.repeat
+    if not titles:
+        print("corpus is empty", file=sys.stderr)
+        return 1
+
+    size = max(args.batch_size, 1)
+    batches = [titles[offset : offset + size] for offset in range(0, len(titles), size)]
+    stopwords = build_stopwords("005930", "삼성전자")
+
+    def run_legacy():
+        for batch in batches:
+            _legacy_count(batch, "005930", "삼성전자")
+
+    def run_batch():
+        for batch in batches:
+            count_tokens(batch, stopwords)
+
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=args.rounds))
+    batch = min(timeit.repeat(run_batch, number=1, repeat=args.rounds))
+
+    per_title = 1_000_000 / len(titles)
+    print(f"titles: {len(titles)} in calls of {size}")
+    print(f"legacy: {legacy * per_title:.2f} us/title")
+    print(f"batch:  {batch * per_title:.2f} us/title")
+    print(f"speedup: {legacy / batch:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+QUOTA_KEY_PREFIX = "alpha_vantage:quota"
+# Alpha Vantage resets daily allowances at US Eastern midnight.
+QUOTA_TIMEZONE = ZoneInfo("America/New_York")
+
+
+def _quota_day(now=None):
+    return (now or timezone.now()).astimezone(QUOTA_TIMEZONE).date()
+
+
+def _quota_key(now=None):
+    # Keys are namespaced by a digest so the raw API key never lands in Redis.
+    digest = hashlib.sha256(settings.ALPHA_VANTAGE_API_KEY.encode("utf-8")).hexdigest()[:12]
+    return f"{QUOTA_KEY_PREFIX}:{digest}:{_quota_day(now):%Y%m%d}"
+
+
+def _quota_timeout(now=None):
+    now = (now or timezone.now()).astimezone(QUOTA_TIMEZONE)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), QUOTA_TIMEZONE)
+    return int((midnight - now).total_seconds()) + 60
+
+
+def daily_quota():
+    """Calls allowed per key per day; 0 or None means the key is not metered."""
+    return settings.ALPHA_VANTAGE_DAILY_QUOTA or 0
+
+
+def used_quota(now=None):
+    return cache.get(_quota_key(now), 0)
+
+
+def remaining_quota(now=None):
+    if not daily_quota():
+        return None
+    return max(daily_quota() - used_quota(now), 0)
+
+
+def reserve_quota(count=1, now=None):
+    """Reserve up to ``count`` calls from today's allowance; returns the grant.
+
+    The counter is bumped atomically and any overshoot handed back, so
+    concurrent workers can never jointly exceed the quota.
+    """
+    quota = daily_quota()
+    if count <= 0 or not quota:
+        return max(count, 0)
+    key = _quota_key(now)
+    cache.add(key, 0, timeout=_quota_timeout(now))
+    try:
+        used = cache.incr(key, count)
+    except ValueError:
+        # The counter expired between add and incr (midnight rollover).
+        cache.add(key, count, timeout=_quota_timeout(now))
+        used = count
+    overshoot = min(max(used - quota, 0), count)
+    if overshoot:
+        cache.decr(key, overshoot)
+        logger.warning(
+            "Alpha Vantage daily quota of %s calls reached for %s; granted %s of %s",
+            quota,
+            _quota_day(now),
+            count - overshoot,
+            count,
+        )
+    return count - overshoot
+
+
+def release_quota(count, now=None):
+    """Hand back reservations that were never spent on a request."""
+    if count <= 0 or not daily_quota():
+        return
+    try:
+        cache.decr(_quota_key(now), count)
+    except ValueError:
+        pass
+
+
+def mark_quota_exhausted(now=None):
+    """Record that the provider refused today's calls, e.g. a shared key."""
+    if daily_quota():
+        logger.warning("Alpha Vantage refused further calls for %s", _quota_day(now))
+        cache.set(_quota_key(now), daily_quota(), timeout=_quota_timeout(now))
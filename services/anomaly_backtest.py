@@ -0,0 +1,245 @@
+import itertools
+import math
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from statistics import mean, median
+from zoneinfo import ZoneInfo
+
+from django.utils import timezone
+
+from services.anomaly_scoring import (
+    DEFAULT_MIN_RECENT_MENTIONS,
+    DEFAULT_MIN_SURGE_RATIO,
+    DEFAULT_MIN_Z_SCORE,
+    is_anomalous,
+)
+
+# Model imports stay inside load_backtest_dataset so spawned pool workers can
+# import this module without a configured Django app registry.
+
+DEFAULT_MOVE_THRESHOLD_PCT = 3.0
+DEFAULT_HORIZON_HOURS = 72
+MARKET_CLOSE_TIMES = {
+    "KR": (ZoneInfo("Asia/Seoul"), time(15, 30)),
+    "US": (ZoneInfo("America/New_York"), time(16, 0)),
+}
+
+_WORKER_DATASET = None
+
+
+@dataclass
+class BacktestDataset:
+    start: datetime
+    symbols: list
+    series: list
+    price_moves: list
+
+    @property
+    def hour_count(self):
+        return len(self.series[0]) if self.series else 0
+
+
+def _hour_index(start, moment):
+    return math.ceil((moment - start).total_seconds() / 3600)
+
+
+def load_backtest_dataset(days=30, symbols=None):
+    from apps.stocks.models import Price, Stock
+    from services.interest_service import hour_floor, hourly_mention_series
+
+    end = hour_floor(timezone.now())
+    start = end - timedelta(hours=days * 24 - 1)
+    stock_queryset = Stock.objects.filter(is_active=True)
+    if symbols:
+        stock_queryset = stock_queryset.filter(symbol__in=symbols)
+    stocks = list(stock_queryset.only("id", "symbol", "market").order_by("symbol"))
+    stock_ids = [stock.id for stock in stocks]
+    series_by_stock = hourly_mention_series(stock_ids, start, end)
+
+    closes_by_stock = {stock_id: [] for stock_id in stock_ids}
+    price_rows = (
+        Price.objects.filter(
+            stock_id__in=stock_ids,
+            traded_at__gte=timezone.localtime(start).date() - timedelta(days=7),
+        )
+        .order_by("stock_id", "traded_at")
+        .values_list("stock_id", "traded_at", "close_price")
+    )
+    for stock_id, traded_at, close_price in price_rows:
+        closes_by_stock[stock_id].append((traded_at, float(close_price)))
+
+    price_moves = []
+    for stock in stocks:
+        zone, close_time = MARKET_CLOSE_TIMES.get(stock.market, MARKET_CLOSE_TIMES["KR"])
+        moves = []
+        closes = closes_by_stock[stock.id]
+        for (_, previous_close), (traded_at, close) in zip(closes, closes[1:]):
+            if previous_close <= 0:
+                continue
+            closed_at = datetime.combine(traded_at, close_time, tzinfo=zone)
+            hour_index = _hour_index(start, closed_at)
+            if hour_index < 0:
+                continue
+            moves.append((hour_index, round((close / previous_close - 1) * 100, 4)))
+        price_moves.append(moves)
+
+    return BacktestDataset(
+        start=start,
+        symbols=[stock.symbol for stock in stocks],
+        series=[series_by_stock[stock.id] for stock in stocks],
+        price_moves=price_moves,
+    )
+
+
+def compute_anomaly_flags(
+    series,
+    recent_hours=6,
+    baseline_hours=72,
+    min_recent_mentions=DEFAULT_MIN_RECENT_MENTIONS,
+    min_surge_ratio=DEFAULT_MIN_SURGE_RATIO,
+    min_z_score=DEFAULT_MIN_Z_SCORE,
+):
+    # Prefix sums give every rolling recent/baseline window in O(1), so one
+    # pass flags every stock at every hour as detect_interest_anomalies would.
+    warmup = recent_hours + baseline_hours - 1
+    flags = []
+    for values in series:
+        prefix = list(itertools.accumulate(values, initial=0))
+        prefix_sq = list(itertools.accumulate((value * value for value in values), initial=0))
+        row = [False] * len(values)
+        for hour in range(warmup, len(values)):
+            recent_total = prefix[hour + 1] - prefix[hour + 1 - recent_hours]
+            if recent_total < min_recent_mentions:
+                continue
+            baseline_end = hour + 1 - recent_hours
+            baseline_start = baseline_end - baseline_hours
+            baseline_sum = prefix[baseline_end] - prefix[baseline_start]
+            baseline_avg = baseline_sum / baseline_hours if baseline_hours else 0.0
+            baseline_std = 0.0
+            if baseline_hours >= 2:
+                baseline_sq = prefix_sq[baseline_end] - prefix_sq[baseline_start]
+                variance = baseline_sq / baseline_hours - baseline_avg * baseline_avg
+                baseline_std = math.sqrt(variance) if variance > 1e-9 else 0.0
+            row[hour] = is_anomalous(
+                recent_total,
+                recent_hours,
+                baseline_avg,
+                baseline_std,
+                min_recent_mentions=min_recent_mentions,
+                min_surge_ratio=min_surge_ratio,
+                min_z_score=min_z_score,
+            )
+        flags.append(row)
+    return flags
+
+
+def evaluate_parameters(
+    dataset,
+    params,
+    move_threshold_pct=DEFAULT_MOVE_THRESHOLD_PCT,
+    horizon_hours=DEFAULT_HORIZON_HOURS,
+):
+    flags = compute_anomaly_flags(dataset.series, **params)
+    flagged_hours = 0
+    alerts = 0
+    lead_hours = []
+    for row, moves in zip(flags, dataset.price_moves):
+        move_hours = [hour for hour, change in moves if abs(change) >= move_threshold_pct]
+        previous = False
+        for hour, flagged in enumerate(row):
+            if flagged:
+                flagged_hours += 1
+                if not previous:
+                    alerts += 1
+                    next_move = bisect_right(move_hours, hour)
+                    if next_move < len(move_hours):
+                        lead = move_hours[next_move] - hour
+                        if lead <= horizon_hours:
+                            lead_hours.append(lead)
+            previous = flagged
+
+    hits = len(lead_hours)
+    return {
+        **params,
+        "flagged_hours": flagged_hours,
+        "alerts": alerts,
+        "hits": hits,
+        "hit_rate": round(hits / alerts, 4) if alerts else 0.0,
+        "avg_lead_hours": round(mean(lead_hours), 2) if lead_hours else None,
+        "median_lead_hours": median(lead_hours) if lead_hours else None,
+    }
+
+
+def build_parameter_grid(
+    recent_hours=(6,),
+    baseline_hours=(72,),
+    min_recent_mentions=(DEFAULT_MIN_RECENT_MENTIONS,),
+    min_surge_ratio=(DEFAULT_MIN_SURGE_RATIO,),
+    min_z_score=(DEFAULT_MIN_Z_SCORE,),
+):
+    keys = (
+        "recent_hours",
+        "baseline_hours",
+        "min_recent_mentions",
+        "min_surge_ratio",
+        "min_z_score",
+    )
+    combos = itertools.product(
+        recent_hours,
+        baseline_hours,
+        min_recent_mentions,
+        min_surge_ratio,
+        min_z_score,
+    )
+    return [dict(zip(keys, combo)) for combo in combos]
+
+
+def _init_worker(dataset):
+    global _WORKER_DATASET
+    _WORKER_DATASET = dataset
+
+
+def _evaluate_in_worker(task):
+    params, move_threshold_pct, horizon_hours = task
+    return evaluate_parameters(
+        _WORKER_DATASET,
+        params,
+        move_threshold_pct=move_threshold_pct,
+        horizon_hours=horizon_hours,
+    )
+
+
+def run_backtest_grid(
+    dataset,
+    grid,
+    workers=1,
+    move_threshold_pct=DEFAULT_MOVE_THRESHOLD_PCT,
+    horizon_hours=DEFAULT_HORIZON_HOURS,
+):
+    if not grid:
+        return []
+
+    worker_count = min(max(int(workers), 1), len(grid))
+    if worker_count == 1:
+        results = [
+            evaluate_parameters(
+                dataset,
+                params,
+                move_threshold_pct=move_threshold_pct,
+                horizon_hours=horizon_hours,
+            )
+            for params in grid
+        ]
+    else:
+        tasks = [(params, move_threshold_pct, horizon_hours) for params in grid]
+        with ProcessPoolExecutor(
+            max_workers=worker_count,
+            initializer=_init_worker,
+            initargs=(dataset,),
+        ) as executor:
+            results = list(executor.map(_evaluate_in_worker, tasks))
+
+    results.sort(key=lambda row: (-row["hit_rate"], -row["hits"], row["alerts"]))
+    return results
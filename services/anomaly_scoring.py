@@ -0,0 +1,75 @@
+import math
+
+# Kept free of Django imports so process-pool workers can load it directly.
+
+DEFAULT_MIN_RECENT_MENTIONS = 8
+DEFAULT_MIN_SURGE_RATIO = 2.5
+DEFAULT_MIN_Z_SCORE = 2.0
+
+
+def _surge_and_z(recent_total, window, baseline_avg, baseline_std):
+    expected_total = baseline_avg * window
+
+    if expected_total <= 0:
+        surge_ratio = float(recent_total) if recent_total > 0 else 0.0
+    else:
+        surge_ratio = recent_total / expected_total
+
+    if baseline_std <= 0:
+        z_score = 99.0 if recent_total > expected_total else 0.0
+    else:
+        z_score = (recent_total - expected_total) / (baseline_std * math.sqrt(window))
+
+    return expected_total, surge_ratio, z_score
+
+
+def is_anomalous(
+    recent_total,
+    recent_hours,
+    baseline_avg,
+    baseline_std,
+    min_recent_mentions=DEFAULT_MIN_RECENT_MENTIONS,
+    min_surge_ratio=DEFAULT_MIN_SURGE_RATIO,
+    min_z_score=DEFAULT_MIN_Z_SCORE,
+):
+    if recent_total < min_recent_mentions:
+        return False
+    _, surge_ratio, z_score = _surge_and_z(
+        recent_total,
+        max(recent_hours, 1),
+        baseline_avg,
+        baseline_std,
+    )
+    return surge_ratio >= min_surge_ratio or z_score >= min_z_score
+
+
+def score_anomaly(
+    recent_total,
+    recent_hours,
+    baseline_avg,
+    baseline_std,
+    min_recent_mentions=DEFAULT_MIN_RECENT_MENTIONS,
+    min_surge_ratio=DEFAULT_MIN_SURGE_RATIO,
+    min_z_score=DEFAULT_MIN_Z_SCORE,
+):
+    if recent_total < min_recent_mentions:
+        return None
+
+    expected_total, surge_ratio, z_score = _surge_and_z(
+        recent_total,
+        max(recent_hours, 1),
+        baseline_avg,
+        baseline_std,
+    )
+    if surge_ratio < min_surge_ratio and z_score < min_z_score:
+        return None
+
+    severity = "high" if surge_ratio >= 4.0 or z_score >= 4.0 else "medium"
+    return {
+        "recent_mentions": int(recent_total),
+        "expected_mentions": int(round(expected_total)),
+        "baseline_hourly_avg": round(baseline_avg, 2),
+        "surge_ratio": round(surge_ratio, 2),
+        "z_score": round(z_score, 2),
+        "severity": severity,
+    }
@@ -0,0 +1,65 @@
+import hashlib
+import math
+
+# Kept free of Django imports, like the other sketch helpers.
+
+HLL_PRECISION = 10
+_HASH_BITS = 64
+_INVERSE_POWERS = [2.0**-rank for rank in range(_HASH_BITS + 1)]
+
+
+class HyperLogLog:
+    """Distinct-count sketch: 2**precision one-byte registers, ~1.04/sqrt(m) error.
+
+    At the default precision a sketch is 1 KiB and estimates within ~3%;
+    sketches merge losslessly with a register-wise max.
+    """
+
+    def __init__(self, precision=HLL_PRECISION, registers=None):
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is None:
+            self.registers = bytearray(self.size)
+        elif len(registers) != self.size:
+            raise ValueError(f"Expected {self.size} registers, got {len(registers)}")
+        else:
+            self.registers = bytearray(registers)
+
+    def add(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        remaining_bits = _HASH_BITS - self.precision
+        index = value >> remaining_bits
+        rest = value & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+        return self
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        size = self.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(_INVERSE_POWERS[rank] for rank in self.registers)
+        empty = self.registers.count(0)
+        if estimate <= 2.5 * size and empty:
+            # Linear counting is far more accurate while most registers are empty.
+            return round(size * math.log(size / empty))
+        return round(estimate)
+
+    def to_bytes(self):
+        return bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data):
+        precision = len(data).bit_length() - 1
+        return cls(precision=precision, registers=data)
@@ -0,0 +1,148 @@
+import logging
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Min, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from apps.stocks.models import Interest
+
+logger = logging.getLogger(__name__)
+
+RESOLUTION_HOUR = "hour"
+RESOLUTION_DAY = "day"
+COMPACTION_BATCH_SIZE = 500
+
+
+def _hour_floor(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _day_floor(value):
+    local = timezone.localtime(value)
+    return timezone.make_aware(
+        datetime.combine(local.date(), time.min),
+        timezone.get_current_timezone(),
+    )
+
+
+def _aware(value):
+    if timezone.is_naive(value):
+        return timezone.make_aware(value, timezone.get_current_timezone())
+    return value
+
+
+def _has_resolution(resolution):
+    # Spelled with has_key so rows without the key (raw snapshots) survive negation.
+    return Q(metadata__has_key="resolution") & Q(metadata__resolution=resolution)
+
+
+def _compact_window(start, end, resolution):
+    trunc = TruncHour if resolution == RESOLUTION_HOUR else TruncDay
+    rows = Interest.objects.filter(recorded_at__gte=start, recorded_at__lt=end).exclude(
+        _has_resolution(RESOLUTION_DAY)
+    )
+    groups = list(
+        rows.annotate(bucket=trunc("recorded_at"))
+        .values("stock_id", "source", "bucket")
+        .annotate(
+            total_mentions=Sum("mentions"),
+            row_count=Count("id"),
+            pending_rows=Count("id", filter=~_has_resolution(resolution)),
+            weighted_sentiment=Sum(
+                F("sentiment_score") * F("mentions"),
+                output_field=FloatField(),
+            ),
+            scored_mentions=Sum("mentions", filter=Q(sentiment_score__isnull=False)),
+        )
+        .order_by()
+    )
+    if not any(group["pending_rows"] for group in groups):
+        return {"removed": 0, "created": 0}
+
+    compacted = []
+    for group in groups:
+        sentiment = None
+        if group["scored_mentions"]:
+            sentiment = round(group["weighted_sentiment"] / group["scored_mentions"], 2)
+        compacted.append(
+            Interest(
+                stock_id=group["stock_id"],
+                source=group["source"],
+                recorded_at=_aware(group["bucket"]),
+                mentions=int(group["total_mentions"] or 0),
+                sentiment_score=sentiment,
+                metadata={"resolution": resolution, "compacted_rows": group["row_count"]},
+            )
+        )
+
+    with transaction.atomic():
+        removed, _ = rows.delete()
+        Interest.objects.bulk_create(compacted, batch_size=COMPACTION_BATCH_SIZE)
+    return {"removed": removed, "created": len(compacted)}
+
+
+def _compact_stage(horizon, resolution, window, pending_filter, max_windows):
+    earliest = (
+        Interest.objects.filter(recorded_at__lt=horizon)
+        .filter(pending_filter)
+        .aggregate(earliest=Min("recorded_at"))["earliest"]
+    )
+    stats = {"windows": 0, "removed": 0, "created": 0}
+    if earliest is None:
+        return stats
+
+    start = _hour_floor(earliest) if resolution == RESOLUTION_HOUR else _day_floor(earliest)
+    while start < horizon and stats["windows"] < max_windows:
+        end = min(start + window, horizon)
+        result = _compact_window(start, end, resolution)
+        stats["windows"] += 1
+        stats["removed"] += result["removed"]
+        stats["created"] += result["created"]
+        start = end
+    return stats
+
+
+def compact_interest_snapshots(
+    raw_retention_hours=None,
+    hourly_retention_days=None,
+    window_hours=None,
+    max_windows=500,
+    now=None,
+):
+    """Fold aged raw snapshots into hourly rows, then hourly rows into daily rows.
+
+    Each window is compacted in its own short transaction and every window lies
+    behind the retention horizon, so rows still being written are never touched.
+    """
+    raw_retention_hours = raw_retention_hours or settings.INTEREST_RAW_RETENTION_HOURS
+    hourly_retention_days = hourly_retention_days or settings.INTEREST_HOURLY_RETENTION_DAYS
+    window_hours = window_hours or settings.INTEREST_COMPACTION_WINDOW_HOURS
+    now = now or timezone.now()
+
+    day_horizon = _day_floor(now - timedelta(days=hourly_retention_days))
+    hour_horizon = _hour_floor(now - timedelta(hours=raw_retention_hours))
+
+    daily = _compact_stage(
+        day_horizon,
+        RESOLUTION_DAY,
+        timedelta(days=1),
+        ~_has_resolution(RESOLUTION_DAY),
+        max_windows,
+    )
+    hourly = _compact_stage(
+        hour_horizon,
+        RESOLUTION_HOUR,
+        timedelta(hours=window_hours),
+        ~Q(metadata__has_key="resolution"),
+        max_windows,
+    )
+    if daily["removed"] or hourly["removed"]:
+        logger.info("Interest compaction: daily=%s hourly=%s", daily, hourly)
+    return {
+        "status": "success",
+        "hourly": hourly,
+        "daily": daily,
+    }
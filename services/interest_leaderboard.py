@@ -0,0 +1,104 @@
+import logging
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+import redis
+from django.conf import settings
+from django.utils import timezone
+
+from services.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_KEY_PREFIX = "interest:leaderboard"
+LEADERBOARD_MAX_WINDOW_HOURS = 720
+LEADERBOARD_RETENTION_SEC = (LEADERBOARD_MAX_WINDOW_HOURS + 2) * 3600
+
+
+def _hour_bucket(value):
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _hour_key(bucket):
+    return f"{LEADERBOARD_KEY_PREFIX}:hour:{bucket:%Y%m%d%H}"
+
+
+def _coverage_key():
+    return f"{LEADERBOARD_KEY_PREFIX}:since"
+
+
+def _leaderboard_client():
+    if not settings.INTEREST_LEADERBOARD_ENABLED:
+        return None
+    return get_redis_client()
+
+
+def record_leaderboard_mentions(mentions_by_stock, recorded_at):
+    client = _leaderboard_client()
+    if client is None or not mentions_by_stock:
+        return False
+
+    bucket = _hour_bucket(recorded_at)
+    key = _hour_key(bucket)
+    try:
+        pipe = client.pipeline(transaction=False)
+        for stock_id, mentions in mentions_by_stock.items():
+            if mentions > 0:
+                pipe.zincrby(key, int(mentions), str(stock_id))
+        pipe.expire(key, LEADERBOARD_RETENTION_SEC)
+        # Coverage starts at the first write and is kept alive by every later one,
+        # like the hour buckets it vouches for; it only lapses after writes stop
+        # for a full retention period, when the buckets are gone as well.
+        pipe.set(_coverage_key(), int(bucket.timestamp()), nx=True, ex=LEADERBOARD_RETENTION_SEC)
+        pipe.expire(_coverage_key(), LEADERBOARD_RETENTION_SEC)
+        pipe.execute()
+    except redis.RedisError as exc:
+        logger.warning("Interest leaderboard update failed: %s", exc)
+        _reset_coverage(client)
+        return False
+    return True
+
+
+def _reset_coverage(client):
+    # A lost write leaves a hole in the buckets, so the totals must stop being
+    # served as authoritative until coverage restarts from a later write.
+    try:
+        client.delete(_coverage_key())
+    except redis.RedisError as exc:
+        logger.warning("Interest leaderboard coverage reset failed: %s", exc)
+
+
+def get_leaderboard_scores(hours=24, limit=10):
+    """Return [(stock_id, mentions)] for the window, or None when the DB must answer."""
+    client = _leaderboard_client()
+    if client is None or hours > LEADERBOARD_MAX_WINDOW_HOURS:
+        return None
+
+    now_bucket = _hour_bucket(timezone.now())
+    window_start = now_bucket - timedelta(hours=max(hours, 1) - 1)
+    try:
+        covered_since = client.get(_coverage_key())
+        if covered_since is None or int(covered_since) > int(window_start.timestamp()):
+            return None
+
+        window_key = f"{LEADERBOARD_KEY_PREFIX}:window:{hours}:{now_bucket:%Y%m%d%H}"
+        if not client.exists(window_key):
+            hour_keys = [
+                _hour_key(window_start + timedelta(hours=offset)) for offset in range(hours)
+            ]
+            pipe = client.pipeline(transaction=False)
+            pipe.zunionstore(window_key, hour_keys)
+            pipe.expire(window_key, settings.CACHE_TTL_LEADERBOARD_WINDOW)
+            pipe.execute()
+
+        head = client.zrevrange(window_key, 0, max(limit, 1) - 1, withscores=True)
+        if len(head) < limit or not head:
+            rows = head
+        else:
+            # Pull every member tied with the cut-off so ties can be ordered by symbol.
+            rows = client.zrevrangebyscore(window_key, "+inf", head[-1][1], withscores=True)
+    except redis.RedisError as exc:
+        logger.warning("Interest leaderboard read failed: %s", exc)
+        return None
+
+    return [(int(member), int(score)) for member, score in rows]
@@ -1,20 +1,69 @@
 import logging
 import math
 from collections import defaultdict
-from datetime import timedelta
+from datetime import datetime, time, timedelta
+from itertools import islice
 from statistics import mean, pstdev
 
 from django.db import transaction
-from django.db.models import Q, Sum
-from django.db.models.functions import Coalesce
-from django.db.models.functions import TruncHour
+from django.db.models import Avg, Count, F, FloatField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Trim
+from django.db.models.functions import TruncDate, TruncHour
 from django.utils import timezone
 
-from apps.stocks.models import Interest, NewsItem, Stock
+from apps.stocks.models import (
+    Interest,
+    InterestAnomalyState,
+    InterestUniqueSketch,
+    NewsItem,
+    SectorInterestRollup,
+    Stock,
+)
 from crawler import NaverCrawler, RedditCrawler
+from services.anomaly_scoring import score_anomaly as _score_anomaly
+from services.interest_leaderboard import get_leaderboard_scores, record_leaderboard_mentions
+from services.news_clustering import HeadlineIndex, cluster_heads
+from services.query_helpers import top_n_per_group
+from services.sentiment import mean_sentiment, score_titles, to_sentiment_decimal
+from services.simhash import simhash
+from services.topic_service import record_keyword_counts
+from services.trending_terms import record_trending_terms
+from services.unique_mentions import mention_identity, record_unique_mentions
 
 logger = logging.getLogger(__name__)
 
+INTEREST_SAMPLE_LIMIT = 5
+INTEREST_BULK_BATCH_SIZE = 500
+SECTOR_UNKNOWN = "Unknown"
+
+ANOMALY_MODE_FLAT = "flat"
+ANOMALY_MODE_SEASONAL = "seasonal"
+ANOMALY_MODES = (ANOMALY_MODE_FLAT, ANOMALY_MODE_SEASONAL)
+ANOMALY_METRIC_MENTIONS = "mentions"
+ANOMALY_METRIC_UNIQUE = "unique"
+ANOMALY_METRICS = (ANOMALY_METRIC_MENTIONS, ANOMALY_METRIC_UNIQUE)
+HOURS_PER_WEEK = 24 * 7
+SEASONAL_BASELINE_WEEKS = 4
+SEASONAL_EWMA_ALPHA = 0.5
+
+ANOMALY_STATE_RECENT_HOURS = 6
+ANOMALY_STATE_BASELINE_HOURS = 72
+ANOMALY_STATE_REBUILD_HOURS = 24 * 14
+ANOMALY_STATE_FIELDS = [
+    "bucket_start",
+    "recent_window",
+    "baseline_mean",
+    "baseline_var",
+    "baseline_count",
+    "recent_mentions",
+    "expected_mentions",
+    "surge_ratio",
+    "z_score",
+    "severity",
+    "is_anomalous",
+    "updated_at",
+]
+
 DEFAULT_SOURCE_CRAWLERS = (
     RedditCrawler,
     NaverCrawler,
@@ -25,6 +74,43 @@ def _active_target_stocks(limit=20):
     return list(Stock.objects.filter(is_active=True).order_by("symbol")[:limit])
 
 
+def _aggregate_recent_news(stocks, since, sample_limit=INTEREST_SAMPLE_LIMIT):
+    # One windowed query returns each stock's total count alongside only its
+    # newest sample rows, instead of instantiating every recent NewsItem.
+    # Syndicated copies of one story count once, via their cluster head.
+    stock_by_id = {stock.id: stock for stock in stocks}
+    rows = top_n_per_group(
+        cluster_heads(
+            NewsItem.objects.filter(stock_id__in=list(stock_by_id), created_at__gte=since)
+        ),
+        partition_by=["stock_id"],
+        order_by=[F("published_at").desc(), F("id").desc()],
+        limit=sample_limit,
+        fields=["stock_id", "title", "url", "published_at", "cluster_id"],
+        group_annotations={"stock_count": Count("id"), "stock_sentiment": Avg("sentiment")},
+    )
+
+    news_by_stock = {}
+    for row in rows:
+        bucket = news_by_stock.setdefault(
+            stock_by_id[row["stock_id"]],
+            {
+                "count": row["stock_count"],
+                "sentiment": to_sentiment_decimal(row["stock_sentiment"]),
+                "samples": [],
+            },
+        )
+        bucket["samples"].append(
+            {
+                "title": row["title"],
+                "url": row["url"],
+                "published_at": row["published_at"].isoformat() if row["published_at"] else None,
+                "cluster_id": row["cluster_id"],
+            }
+        )
+    return news_by_stock
+
+
 def collect_interest_snapshot(limit_stocks=20, limit_per_symbol=3):
     stocks = _active_target_stocks(limit=limit_stocks)
     if not stocks:
@@ -39,6 +125,10 @@ def collect_interest_snapshot(limit_stocks=20, limit_per_symbol=3):
     now = timezone.now()
     grouped = {}
     stock_by_symbol = {stock.symbol: stock for stock in stocks}
+    headline_index = HeadlineIndex()
+    # News titles were counted when collect_news_items stored them.
+    crawler_titles = defaultdict(list)
+    identities = defaultdict(list)
 
     for crawler_cls in DEFAULT_SOURCE_CRAWLERS:
         crawler = crawler_cls()
@@ -69,9 +159,20 @@ def collect_interest_snapshot(limit_stocks=20, limit_per_symbol=3):
                     "source": record.source,
                     "mentions": 0,
                     "samples": [],
+                    "clusters": set(),
+                    "titles": [],
                 }
+            # Unique authors see every record, reposts included.
+            identities[key].append(mention_identity(record.source, record))
+            # Reposts of one headline within a source count as a single mention.
+            cluster_id = headline_index.assign(simhash(record.title))
+            if cluster_id in grouped[key]["clusters"]:
+                continue
+            grouped[key]["clusters"].add(cluster_id)
             grouped[key]["mentions"] += 1
-            if len(grouped[key]["samples"]) < 5:
+            grouped[key]["titles"].append(record.title)
+            crawler_titles[stock].append(record.title)
+            if len(grouped[key]["samples"]) < INTEREST_SAMPLE_LIMIT:
                 grouped[key]["samples"].append(
                     {
                         "title": record.title,
@@ -79,45 +180,22 @@ def collect_interest_snapshot(limit_stocks=20, limit_per_symbol=3):
                         "published_at": (
                             record.published_at.isoformat() if record.published_at else None
                         ),
+                        "cluster_id": cluster_id,
                     }
                 )
 
     news_since = timezone.now() - timedelta(hours=24)
-    news_records = (
-        NewsItem.objects.select_related("stock")
-        .filter(stock__in=stocks, created_at__gte=news_since)
-        .order_by("-published_at", "-id")
-    )
-    news_by_symbol = {}
-    for item in news_records:
-        bucket = news_by_symbol.setdefault(
-            item.stock.symbol,
-            {
-                "count": 0,
-                "samples": [],
-            },
-        )
-        bucket["count"] += 1
-        if len(bucket["samples"]) < 5:
-            bucket["samples"].append(
-                {
-                    "title": item.title,
-                    "url": item.url,
-                    "published_at": item.published_at.isoformat() if item.published_at else None,
-                }
-            )
+    news_by_stock = _aggregate_recent_news(list(stock_by_symbol.values()), news_since)
 
     news_total_mentions = 0
-    for symbol, payload in news_by_symbol.items():
-        stock = stock_by_symbol.get(symbol)
-        if not stock:
-            continue
+    for stock, payload in news_by_stock.items():
         key = (stock.id, Interest.Source.NEWS)
         grouped[key] = {
             "stock": stock,
             "source": Interest.Source.NEWS,
             "mentions": payload["count"],
             "samples": payload["samples"],
+            "sentiment": payload["sentiment"],
         }
         news_total_mentions += payload["count"]
     source_stats[str(Interest.Source.NEWS)] = news_total_mentions
@@ -132,19 +210,41 @@ def collect_interest_snapshot(limit_stocks=20, limit_per_symbol=3):
             "errors": errors,
         }
 
-    inserted = 0
+    # Crawler mentions are scored in one batch; news groups already carry the
+    # mean of their cluster heads' stored scores.
+    crawler_groups = [group for group in grouped.values() if "titles" in group]
+    scores = iter(score_titles([title for group in crawler_groups for title in group["titles"]]))
+    for group in crawler_groups:
+        group["sentiment"] = mean_sentiment(islice(scores, len(group["titles"])))
+
     total_mentions = 0
-    with transaction.atomic():
-        for group in grouped.values():
-            Interest.objects.create(
+    mentions_by_stock = defaultdict(int)
+    rows = []
+    for group in grouped.values():
+        rows.append(
+            Interest(
                 stock=group["stock"],
                 source=group["source"],
                 recorded_at=now,
                 mentions=group["mentions"],
+                sentiment_score=group["sentiment"],
                 metadata={"samples": group["samples"]},
             )
-            inserted += 1
-            total_mentions += group["mentions"]
+        )
+        total_mentions += group["mentions"]
+        mentions_by_stock[group["stock"].id] += group["mentions"]
+
+    with transaction.atomic():
+        inserted = len(Interest.objects.bulk_create(rows, batch_size=INTEREST_BULK_BATCH_SIZE))
+        update_interest_anomaly_states(mentions_by_stock, recorded_at=now)
+        refresh_sector_rollups(now)
+        record_keyword_counts(crawler_titles, recorded_at=now)
+        record_unique_mentions(identities, recorded_at=now)
+        trending_titles = [title for titles in crawler_titles.values() for title in titles]
+        transaction.on_commit(lambda: record_trending_terms(trending_titles, recorded_at=now))
+        transaction.on_commit(
+            lambda: record_leaderboard_mentions(dict(mentions_by_stock), recorded_at=now)
+        )
 
     return {
         "status": "success",
@@ -155,8 +255,78 @@ def collect_interest_snapshot(limit_stocks=20, limit_per_symbol=3):
     }
 
 
+def _recent_sentiment(since, stock_field="pk"):
+    # Mention-weighted mean of the stock's scored snapshots, as a correlated
+    # subquery so callers keep their existing single query.
+    weighted = (
+        Interest.objects.filter(
+            stock_id=OuterRef(stock_field),
+            recorded_at__gte=since,
+            sentiment_score__isnull=False,
+        )
+        .order_by()
+        .values("stock_id")
+        .annotate(
+            value=Cast(
+                Sum(F("sentiment_score") * F("mentions"), output_field=FloatField())
+                / NullIf(Sum("mentions"), 0),
+                FloatField(),
+            )
+        )
+        .values("value")
+    )
+    return Subquery(weighted[:1], output_field=FloatField())
+
+
+def _round_sentiment(value):
+    return round(value, 2) if value is not None else None
+
+
+def _stocks_from_leaderboard(hours, limit, only_positive, since):
+    # Inactive stocks still hold leaderboard members, so over-fetch and widen
+    # until the page fills or the window runs out of members.
+    fetch_limit = max(limit, 1) * 2
+    while True:
+        scores = get_leaderboard_scores(hours=hours, limit=fetch_limit)
+        if scores is None:
+            return None
+        mentions_by_id = {stock_id: mentions for stock_id, mentions in scores if mentions > 0}
+        stocks = list(
+            Stock.objects.filter(is_active=True, id__in=list(mentions_by_id)).annotate(
+                avg_sentiment=_recent_sentiment(since)
+            )
+        )
+        if len(stocks) >= limit or len(scores) < fetch_limit:
+            break
+        fetch_limit *= 2
+
+    for stock in stocks:
+        stock.total_mentions = mentions_by_id[stock.id]
+        stock.avg_sentiment = _round_sentiment(stock.avg_sentiment)
+    stocks.sort(key=lambda stock: (-stock.total_mentions, stock.symbol))
+    stocks = stocks[:limit]
+    if only_positive or len(stocks) >= limit:
+        return stocks
+
+    fillers = (
+        Stock.objects.filter(is_active=True)
+        .exclude(id__in=[stock.id for stock in stocks])
+        .annotate(avg_sentiment=_recent_sentiment(since))
+        .order_by("symbol")[: limit - len(stocks)]
+    )
+    for stock in fillers:
+        stock.total_mentions = 0
+        stock.avg_sentiment = _round_sentiment(stock.avg_sentiment)
+        stocks.append(stock)
+    return stocks
+
+
 def get_top_interest_stocks(limit=10, hours=24, only_positive=False):
     since = timezone.now() - timedelta(hours=hours)
+    stocks = _stocks_from_leaderboard(hours, limit, only_positive, since)
+    if stocks is not None:
+        return stocks
+
     queryset = (
         Stock.objects.filter(is_active=True)
         .annotate(
@@ -166,53 +336,199 @@ def get_top_interest_stocks(limit=10, hours=24, only_positive=False):
                     filter=Q(interest_records__recorded_at__gte=since),
                 ),
                 0,
-            )
+            ),
+            avg_sentiment=_recent_sentiment(since),
         )
         .order_by("-total_mentions", "symbol")
     )
     if only_positive:
         queryset = queryset.filter(total_mentions__gt=0)
-    return list(queryset[:limit])
+    stocks = list(queryset[:limit])
+    for stock in stocks:
+        stock.avg_sentiment = _round_sentiment(stock.avg_sentiment)
+    return stocks
 
 
-def get_sector_interest_heatmap(hours=24, limit=12):
-    since = timezone.now() - timedelta(hours=hours)
+def _normalized_sector():
+    return Coalesce(NullIf(Trim("stock__sector"), Value("")), Value(SECTOR_UNKNOWN))
+
+
+def refresh_sector_rollups(start, end=None):
+    # Rollup rows are recomputed from Interest for whole hour buckets and
+    # upserted, so overlapping refreshes never collide on (sector, bucket_start)
+    # and cannot abort the snapshot transaction they run in.
+    start = hour_floor(start)
+    end = hour_floor(end or start)
     rows = (
-        Stock.objects.filter(is_active=True)
+        Interest.objects.filter(
+            stock__is_active=True,
+            recorded_at__gte=start,
+            recorded_at__lt=end + timedelta(hours=1),
+        )
+        .annotate(bucket=TruncHour("recorded_at"), sector_name=_normalized_sector())
+        .values("sector_name", "bucket")
         .annotate(
-            total_mentions=Coalesce(
-                Sum(
-                    "interest_records__mentions",
-                    filter=Q(interest_records__recorded_at__gte=since),
-                ),
-                0,
-            )
+            total_mentions=Sum("mentions"),
+            stock_total=Count("stock_id", distinct=True),
         )
-        .filter(total_mentions__gt=0)
-        .values("sector", "total_mentions")
-        .order_by("-total_mentions", "sector")
+        .order_by()
     )
 
-    merged = {}
+    rollups = []
+    sectors_by_bucket = defaultdict(list)
     for row in rows:
-        sector = (row.get("sector") or "").strip() or "Unknown"
-        merged[sector] = merged.get(sector, 0) + int(row.get("total_mentions") or 0)
+        bucket = row.get("bucket")
+        if bucket is None:
+            continue
+        if timezone.is_naive(bucket):
+            bucket = timezone.make_aware(bucket, timezone.get_current_timezone())
+        rollups.append(
+            SectorInterestRollup(
+                sector=row["sector_name"],
+                bucket_start=bucket,
+                mentions=int(row.get("total_mentions") or 0),
+                stock_count=int(row.get("stock_total") or 0),
+            )
+        )
+        sectors_by_bucket[bucket].append(row["sector_name"])
+
+    # Only sectors that no longer have data in a bucket are deleted.
+    stale = SectorInterestRollup.objects.filter(bucket_start__gte=start, bucket_start__lte=end)
+    for bucket, sectors in sectors_by_bucket.items():
+        stale = stale.exclude(bucket_start=bucket, sector__in=sectors)
+    with transaction.atomic(savepoint=False):
+        SectorInterestRollup.objects.bulk_create(
+            rollups,
+            batch_size=INTEREST_BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["sector", "bucket_start"],
+            update_fields=["mentions", "stock_count", "updated_at"],
+        )
+        stale.delete()
+    return {"buckets": _hours_between(start, end) + 1, "rows": len(rollups)}
 
-    sorted_items = sorted(
-        merged.items(),
-        key=lambda item: (-item[1], item[0]),
-    )[:limit]
-    if not sorted_items:
+
+def get_sector_interest_heatmap(hours=24, limit=12):
+    since = hour_floor(timezone.now()) - timedelta(hours=max(hours, 1) - 1)
+    rows = list(
+        SectorInterestRollup.objects.filter(bucket_start__gte=since)
+        .values("sector")
+        .annotate(total_mentions=Sum("mentions"))
+        .filter(total_mentions__gt=0)
+        .order_by("-total_mentions", "sector")[:limit]
+    )
+    if not rows:
         return []
 
-    max_mentions = max(mentions for _, mentions in sorted_items) or 1
+    max_mentions = max(int(row["total_mentions"]) for row in rows) or 1
     return [
         {
-            "sector": sector,
-            "mentions": mentions,
-            "intensity": round(mentions / max_mentions, 4),
+            "sector": row["sector"],
+            "mentions": int(row["total_mentions"]),
+            "intensity": round(int(row["total_mentions"]) / max_mentions, 4),
         }
-        for sector, mentions in sorted_items
+        for row in rows
+    ]
+
+
+def _sector_hourly_series(start, end):
+    hour_count = _hours_between(start, end) + 1
+    rows = SectorInterestRollup.objects.filter(
+        bucket_start__gte=start,
+        bucket_start__lte=end,
+    ).values_list("sector", "bucket_start", "mentions")
+
+    series_by_sector = {}
+    for sector, bucket, mentions in rows:
+        offset = _hours_between(start, bucket)
+        if 0 <= offset < hour_count:
+            series = series_by_sector.setdefault(sector, [0] * hour_count)
+            series[offset] += mentions
+    return series_by_sector
+
+
+def get_sector_interest_timeline(hours=24, limit=6):
+    end = hour_floor(timezone.now())
+    start = end - timedelta(hours=max(hours, 1) - 1)
+    series_by_sector = _sector_hourly_series(start, end)
+    top_sectors = sorted(
+        series_by_sector.items(),
+        key=lambda item: (-sum(item[1]), item[0]),
+    )[:limit]
+
+    return {
+        "labels": [
+            timezone.localtime(start + timedelta(hours=offset)).strftime("%m-%d %H:00")
+            for offset in range(_hours_between(start, end) + 1)
+        ],
+        "sectors": [
+            {
+                "sector": sector,
+                "total_mentions": sum(series),
+                "mentions": series,
+            }
+            for sector, series in top_sectors
+        ],
+    }
+
+
+def detect_sector_anomalies(
+    limit=10,
+    recent_hours=6,
+    baseline_hours=72,
+    min_recent_mentions=8,
+    min_surge_ratio=2.5,
+    min_z_score=2.0,
+):
+    recent_hours = max(recent_hours, 1)
+    now = hour_floor(timezone.now())
+    baseline_start = now - timedelta(hours=recent_hours - 1 + baseline_hours)
+    series_by_sector = _sector_hourly_series(baseline_start, now)
+
+    anomalies = []
+    for sector, series in series_by_sector.items():
+        metrics = _calc_anomaly_metrics(
+            recent_values=series[baseline_hours:],
+            baseline_values=series[:baseline_hours],
+            min_recent_mentions=min_recent_mentions,
+            min_surge_ratio=min_surge_ratio,
+            min_z_score=min_z_score,
+        )
+        if metrics:
+            anomalies.append({"sector": sector, **metrics})
+
+    anomalies.sort(
+        key=lambda row: (
+            0 if row["severity"] == "high" else 1,
+            -row["surge_ratio"],
+            -row["z_score"],
+            row["sector"],
+        )
+    )
+    return anomalies[:limit]
+
+
+def get_recent_interest_records(stock, limit=50):
+    """Latest ``limit`` snapshots for one stock, oldest first; an index-ordered read."""
+    return list(Interest.objects.filter(stock=stock).order_by("-recorded_at")[:limit])[::-1]
+
+
+def get_stock_daily_interest(stock, days=60):
+    """Daily mention totals for one stock, oldest first, for its chart."""
+    start_date = timezone.localdate() - timedelta(days=days)
+    # A bound on the raw column keeps the (stock, recorded_at) index usable.
+    since = timezone.make_aware(datetime.combine(start_date, time.min))
+    rows = (
+        Interest.objects.filter(stock=stock, recorded_at__gte=since)
+        .annotate(day=TruncDate("recorded_at"))
+        .values("day")
+        .annotate(total_mentions=Sum("mentions"))
+        .order_by("day")
+    )
+    return [
+        {"date": row["day"].isoformat(), "mentions": int(row["total_mentions"] or 0)}
+        for row in rows
+        if row["day"] is not None
     ]
 
 
@@ -259,128 +575,254 @@ def _calc_anomaly_metrics(
     min_surge_ratio=2.5,
     min_z_score=2.0,
 ):
-    recent_total = sum(recent_values)
-    if recent_total < min_recent_mentions:
-        return None
+    return _score_anomaly(
+        recent_total=sum(recent_values),
+        recent_hours=len(recent_values),
+        baseline_avg=mean(baseline_values) if baseline_values else 0.0,
+        baseline_std=pstdev(baseline_values) if len(baseline_values) >= 2 else 0.0,
+        min_recent_mentions=min_recent_mentions,
+        min_surge_ratio=min_surge_ratio,
+        min_z_score=min_z_score,
+    )
+
+
+def hour_floor(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
 
-    baseline_avg = mean(baseline_values) if baseline_values else 0.0
-    expected_total = baseline_avg * max(len(recent_values), 1)
-    baseline_std = pstdev(baseline_values) if len(baseline_values) >= 2 else 0.0
+def _hours_between(start, end):
+    return int((end - start).total_seconds() // 3600)
 
-    if expected_total <= 0:
-        surge_ratio = float(recent_total) if recent_total > 0 else 0.0
-    else:
-        surge_ratio = recent_total / expected_total
 
-    if baseline_std <= 0:
-        z_score = 99.0 if recent_total > expected_total else 0.0
-    else:
-        z_score = (recent_total - expected_total) / (
-            baseline_std * math.sqrt(max(len(recent_values), 1))
+def _fold_baseline(baseline_mean, baseline_var, baseline_count, value):
+    # Welford while warming up, EWMA once the span is filled.
+    baseline_count += 1
+    alpha = max(2.0 / (ANOMALY_STATE_BASELINE_HOURS + 1), 1.0 / baseline_count)
+    diff = value - baseline_mean
+    increment = alpha * diff
+    baseline_mean += increment
+    baseline_var = (1 - alpha) * (baseline_var + diff * increment)
+    return baseline_mean, baseline_var, baseline_count
+
+
+def _roll_anomaly_state(snapshot, target_bucket):
+    window = list(snapshot["recent_window"])
+    baseline_mean = snapshot["baseline_mean"]
+    baseline_var = snapshot["baseline_var"]
+    baseline_count = snapshot["baseline_count"]
+
+    steps = _hours_between(snapshot["bucket_start"], target_bucket)
+    # Hours beyond the EWMA horizon only decay the baseline further; cap the work.
+    for _ in range(min(max(steps, 0), ANOMALY_STATE_RECENT_HOURS + ANOMALY_STATE_BASELINE_HOURS)):
+        window.append(0)
+        expired = window.pop(0)
+        baseline_mean, baseline_var, baseline_count = _fold_baseline(
+            baseline_mean,
+            baseline_var,
+            baseline_count,
+            expired,
         )
 
-    if surge_ratio < min_surge_ratio and z_score < min_z_score:
-        return None
+    return {
+        "bucket_start": max(snapshot["bucket_start"], target_bucket),
+        "recent_window": window,
+        "baseline_mean": baseline_mean,
+        "baseline_var": baseline_var,
+        "baseline_count": baseline_count,
+    }
+
 
-    severity = "high" if surge_ratio >= 4.0 or z_score >= 4.0 else "medium"
+def _state_snapshot(state):
     return {
-        "recent_mentions": int(recent_total),
-        "expected_mentions": int(round(expected_total)),
-        "baseline_hourly_avg": round(baseline_avg, 2),
-        "surge_ratio": round(surge_ratio, 2),
-        "z_score": round(z_score, 2),
-        "severity": severity,
+        "bucket_start": state.bucket_start,
+        "recent_window": list(state.recent_window or [0] * ANOMALY_STATE_RECENT_HOURS),
+        "baseline_mean": state.baseline_mean,
+        "baseline_var": state.baseline_var,
+        "baseline_count": state.baseline_count,
     }
 
 
-def get_stock_interest_anomaly(
-    stock,
-    recent_hours=6,
-    baseline_hours=72,
-    min_recent_mentions=8,
-    min_surge_ratio=2.5,
-    min_z_score=2.0,
-):
-    now = timezone.now().replace(minute=0, second=0, microsecond=0)
-    recent_start = now - timedelta(hours=max(recent_hours - 1, 0))
-    baseline_start = recent_start - timedelta(hours=baseline_hours)
+def _score_anomaly_snapshot(snapshot):
+    return _score_anomaly(
+        recent_total=sum(snapshot["recent_window"]),
+        recent_hours=len(snapshot["recent_window"]),
+        baseline_avg=snapshot["baseline_mean"],
+        baseline_std=math.sqrt(max(snapshot["baseline_var"], 0.0)),
+    )
 
+
+def _apply_anomaly_snapshot(state, snapshot):
+    metrics = _score_anomaly_snapshot(snapshot)
+    expected_total = snapshot["baseline_mean"] * len(snapshot["recent_window"])
+    state.bucket_start = snapshot["bucket_start"]
+    state.recent_window = snapshot["recent_window"]
+    state.baseline_mean = snapshot["baseline_mean"]
+    state.baseline_var = snapshot["baseline_var"]
+    state.baseline_count = snapshot["baseline_count"]
+    state.recent_mentions = sum(snapshot["recent_window"])
+    state.expected_mentions = int(round(expected_total))
+    state.surge_ratio = metrics["surge_ratio"] if metrics else 0.0
+    state.z_score = metrics["z_score"] if metrics else 0.0
+    state.severity = metrics["severity"] if metrics else ""
+    state.is_anomalous = metrics is not None
+    state.updated_at = timezone.now()
+
+
+def _observe_anomaly_state(state, bucket, mentions):
+    snapshot = _roll_anomaly_state(_state_snapshot(state), bucket)
+    offset = _hours_between(bucket, snapshot["bucket_start"])
+    window = snapshot["recent_window"]
+    # Late observations older than the recent window cannot be folded back into the EWMA.
+    if 0 <= offset < len(window):
+        window[len(window) - 1 - offset] += int(mentions)
+    _apply_anomaly_snapshot(state, snapshot)
+
+
+def update_interest_anomaly_states(mentions_by_stock, recorded_at):
+    if not mentions_by_stock:
+        return {"created": 0, "updated": 0}
+
+    bucket = hour_floor(recorded_at)
+    states = {
+        state.stock_id: state
+        for state in InterestAnomalyState.objects.filter(stock_id__in=list(mentions_by_stock))
+    }
+    created = []
+    updated = []
+    for stock_id, mentions in mentions_by_stock.items():
+        state = states.get(stock_id)
+        if state is None:
+            state = InterestAnomalyState(
+                stock_id=stock_id,
+                bucket_start=bucket,
+                recent_window=[0] * ANOMALY_STATE_RECENT_HOURS,
+            )
+            created.append(state)
+        else:
+            updated.append(state)
+        _observe_anomaly_state(state, bucket, mentions)
+
+    if created:
+        InterestAnomalyState.objects.bulk_create(created)
+    if updated:
+        InterestAnomalyState.objects.bulk_update(updated, fields=ANOMALY_STATE_FIELDS)
+    return {"created": len(created), "updated": len(updated)}
+
+
+def rebuild_interest_anomaly_states(stock_ids=None, hours=ANOMALY_STATE_REBUILD_HOURS):
+    if stock_ids is None:
+        stock_ids = list(Stock.objects.filter(is_active=True).values_list("id", flat=True))
+    stock_ids = list(stock_ids)
+    if not stock_ids:
+        return {"stocks": 0, "buckets": 0}
+
+    since = hour_floor(timezone.now()) - timedelta(hours=hours)
     rows = (
-        Interest.objects.filter(
-            stock=stock,
-            recorded_at__gte=baseline_start,
-            recorded_at__lte=now,
-        )
+        Interest.objects.filter(stock_id__in=stock_ids, recorded_at__gte=since)
         .annotate(bucket=TruncHour("recorded_at"))
-        .values("bucket")
+        .values("stock_id", "bucket")
         .annotate(total_mentions=Sum("mentions"))
-        .order_by("bucket")
+        .order_by("bucket", "stock_id")
     )
 
-    mentions_by_bucket = {}
+    states = {}
+    bucket_count = 0
     for row in rows:
         bucket = row.get("bucket")
         if bucket is None:
             continue
         if timezone.is_naive(bucket):
             bucket = timezone.make_aware(bucket, timezone.get_current_timezone())
-        mentions_by_bucket[bucket] = int(row.get("total_mentions") or 0)
-
-    recent_values = []
-    cursor = recent_start
-    while cursor <= now:
-        recent_values.append(mentions_by_bucket.get(cursor, 0))
-        cursor += timedelta(hours=1)
-
-    baseline_values = []
-    cursor = baseline_start
-    baseline_end = recent_start - timedelta(hours=1)
-    while cursor <= baseline_end:
-        baseline_values.append(mentions_by_bucket.get(cursor, 0))
-        cursor += timedelta(hours=1)
-
-    metrics = _calc_anomaly_metrics(
-        recent_values=recent_values,
-        baseline_values=baseline_values,
-        min_recent_mentions=min_recent_mentions,
-        min_surge_ratio=min_surge_ratio,
-        min_z_score=min_z_score,
-    )
+        state = states.get(row["stock_id"])
+        if state is None:
+            state = InterestAnomalyState(
+                stock_id=row["stock_id"],
+                bucket_start=bucket,
+                recent_window=[0] * ANOMALY_STATE_RECENT_HOURS,
+            )
+            states[row["stock_id"]] = state
+        _observe_anomaly_state(state, bucket, int(row.get("total_mentions") or 0))
+        bucket_count += 1
+
+    with transaction.atomic():
+        InterestAnomalyState.objects.filter(stock_id__in=stock_ids).delete()
+        InterestAnomalyState.objects.bulk_create(states.values())
+    return {"stocks": len(states), "buckets": bucket_count}
+
+
+def _state_anomaly_payload(state, now_bucket):
+    snapshot = _roll_anomaly_state(_state_snapshot(state), now_bucket)
+    metrics = _score_anomaly_snapshot(snapshot)
     if not metrics:
         return None
-
     return {
-        "symbol": stock.symbol,
-        "name": stock.name,
+        "symbol": state.stock.symbol,
+        "name": state.stock.name,
+        "sentiment": _round_sentiment(state.recent_sentiment),
         **metrics,
     }
 
 
-def detect_interest_anomalies(
-    limit=10,
-    recent_hours=6,
-    baseline_hours=72,
-    min_recent_mentions=8,
-    min_surge_ratio=2.5,
-    min_z_score=2.0,
-):
-    target_stocks = list(
-        Stock.objects.filter(is_active=True).only("id", "symbol", "name").order_by("symbol")
+def _state_recent_start(now_bucket):
+    return now_bucket - timedelta(hours=ANOMALY_STATE_RECENT_HOURS - 1)
+
+
+def get_current_interest_anomalies(limit=10):
+    now_bucket = hour_floor(timezone.now())
+    recent_start = _state_recent_start(now_bucket)
+    states = (
+        InterestAnomalyState.objects.select_related("stock")
+        .annotate(recent_sentiment=_recent_sentiment(recent_start, stock_field="stock_id"))
+        .filter(
+            is_anomalous=True,
+            bucket_start__gte=recent_start,
+            stock__is_active=True,
+        )
+        .order_by("-surge_ratio", "-z_score")
     )
-    if not target_stocks:
-        return []
 
-    now = timezone.now().replace(minute=0, second=0, microsecond=0)
-    recent_start = now - timedelta(hours=max(recent_hours - 1, 0))
-    baseline_start = recent_start - timedelta(hours=baseline_hours)
-    baseline_end = recent_start - timedelta(hours=1)
-    stock_ids = [stock.id for stock in target_stocks]
+    anomalies = []
+    for state in states:
+        payload = _state_anomaly_payload(state, now_bucket)
+        if payload:
+            anomalies.append(payload)
+    anomalies.sort(key=_anomaly_sort_key)
+    return anomalies[:limit]
+
 
+def get_stock_interest_anomaly(stock):
+    now_bucket = hour_floor(timezone.now())
+    state = (
+        InterestAnomalyState.objects.filter(stock=stock)
+        .annotate(
+            recent_sentiment=_recent_sentiment(
+                _state_recent_start(now_bucket), stock_field="stock_id"
+            )
+        )
+        .first()
+    )
+    if state is None:
+        return None
+    state.stock = stock
+    return _state_anomaly_payload(state, now_bucket)
+
+
+def _anomaly_sort_key(row):
+    return (
+        0 if row["severity"] == "high" else 1,
+        -row["surge_ratio"],
+        -row["z_score"],
+        row["symbol"],
+    )
+
+
+def hourly_mention_series(stock_ids, start, end):
+    hour_count = _hours_between(start, end) + 1
     rows = (
         Interest.objects.filter(
             stock_id__in=stock_ids,
-            recorded_at__gte=baseline_start,
-            recorded_at__lte=now,
+            recorded_at__gte=start,
+            recorded_at__lt=end + timedelta(hours=1),
         )
         .annotate(bucket=TruncHour("recorded_at"))
         .values("stock_id", "bucket")
@@ -388,37 +830,165 @@ def detect_interest_anomalies(
         .order_by("stock_id", "bucket")
     )
 
-    mentions_by_stock_bucket = defaultdict(dict)
+    return _bucket_series(rows, stock_ids, start, hour_count)
+
+
+def _hourly_unique_series(stock_ids, start, end):
+    # Per-hour distinct authors/posts, summed over sources from each sketch's
+    # stored estimate; the registers themselves are never loaded.
+    hour_count = _hours_between(start, end) + 1
+    rows = (
+        InterestUniqueSketch.objects.filter(
+            stock_id__in=stock_ids,
+            bucket_start__gte=start,
+            bucket_start__lt=end + timedelta(hours=1),
+        )
+        .values("stock_id", bucket=F("bucket_start"))
+        .annotate(total_mentions=Sum("estimate"))
+        .order_by("stock_id", "bucket")
+    )
+    return _bucket_series(rows, stock_ids, start, hour_count)
+
+
+def _bucket_series(rows, stock_ids, start, hour_count):
+    series_by_stock = {stock_id: [0] * hour_count for stock_id in stock_ids}
     for row in rows:
         bucket = row.get("bucket")
         if bucket is None:
             continue
         if timezone.is_naive(bucket):
             bucket = timezone.make_aware(bucket, timezone.get_current_timezone())
-        mentions_by_stock_bucket[row["stock_id"]][bucket] = int(row.get("total_mentions") or 0)
+        offset = _hours_between(start, bucket)
+        if 0 <= offset < hour_count:
+            series_by_stock[row["stock_id"]][offset] += int(row.get("total_mentions") or 0)
+    return series_by_stock
+
+
+def _seasonal_baselines(series_rows, recent_hours, weeks, alpha=SEASONAL_EWMA_ALPHA):
+    # Column-wise EWMA over the same hour-of-week in previous weeks, for every
+    # (stock, recent hour) cell at once. Returns flat expected/variance vectors.
+    offset = weeks * HOURS_PER_WEEK
+    cells = [
+        (row, offset + hour)
+        for row in range(len(series_rows))
+        for hour in range(recent_hours)
+    ]
+    means = [float(series_rows[row][col - offset]) for row, col in cells]
+    variances = [0.0] * len(cells)
+    for week in range(weeks - 1, 0, -1):
+        observed = [float(series_rows[row][col - week * HOURS_PER_WEEK]) for row, col in cells]
+        diffs = [value - avg for value, avg in zip(observed, means)]
+        means = [avg + alpha * diff for avg, diff in zip(means, diffs)]
+        variances = [
+            (1 - alpha) * (var + alpha * diff * diff) for var, diff in zip(variances, diffs)
+        ]
+    return means, variances
+
+
+def _detect_seasonal_anomalies(
+    target_stocks,
+    recent_start,
+    now,
+    recent_hours,
+    weeks,
+    thresholds,
+    series_fn,
+):
+    history_start = recent_start - timedelta(hours=weeks * HOURS_PER_WEEK)
+    series_by_stock = series_fn(
+        [stock.id for stock in target_stocks],
+        history_start,
+        now,
+    )
+    series_rows = [series_by_stock[stock.id] for stock in target_stocks]
+    means, variances = _seasonal_baselines(series_rows, recent_hours, weeks)
 
     anomalies = []
-    for stock in target_stocks:
-        stock_mentions = mentions_by_stock_bucket.get(stock.id, {})
+    for index, stock in enumerate(target_stocks):
+        cell_slice = slice(index * recent_hours, (index + 1) * recent_hours)
+        expected_total = sum(means[cell_slice])
+        variance_total = sum(variances[cell_slice])
+        metrics = _score_anomaly(
+            recent_total=sum(series_rows[index][-recent_hours:]),
+            recent_hours=recent_hours,
+            baseline_avg=expected_total / recent_hours,
+            baseline_std=math.sqrt(variance_total / recent_hours),
+            **thresholds,
+        )
+        if metrics:
+            anomalies.append(
+                {
+                    "symbol": stock.symbol,
+                    "name": stock.name,
+                    "sentiment": _round_sentiment(stock.recent_sentiment),
+                    **metrics,
+                }
+            )
+    return anomalies
 
-        recent_values = []
-        cursor = recent_start
-        while cursor <= now:
-            recent_values.append(stock_mentions.get(cursor, 0))
-            cursor += timedelta(hours=1)
 
-        baseline_values = []
-        cursor = baseline_start
-        while cursor <= baseline_end:
-            baseline_values.append(stock_mentions.get(cursor, 0))
-            cursor += timedelta(hours=1)
+def detect_interest_anomalies(
+    limit=10,
+    recent_hours=6,
+    baseline_hours=72,
+    min_recent_mentions=8,
+    min_surge_ratio=2.5,
+    min_z_score=2.0,
+    mode=ANOMALY_MODE_FLAT,
+    seasonal_weeks=SEASONAL_BASELINE_WEEKS,
+    metric=ANOMALY_METRIC_MENTIONS,
+):
+    if mode not in ANOMALY_MODES:
+        raise ValueError(f"Unsupported anomaly mode: {mode}")
+    if metric not in ANOMALY_METRICS:
+        raise ValueError(f"Unsupported anomaly metric: {metric}")
+    series_fn = _hourly_unique_series if metric == ANOMALY_METRIC_UNIQUE else hourly_mention_series
+
+    recent_hours = max(recent_hours, 1)
+    now = hour_floor(timezone.now())
+    recent_start = now - timedelta(hours=recent_hours - 1)
+    target_stocks = list(
+        Stock.objects.filter(is_active=True)
+        .only("id", "symbol", "name")
+        .annotate(recent_sentiment=_recent_sentiment(recent_start))
+        .order_by("symbol")
+    )
+    if not target_stocks:
+        return []
+
+    thresholds = {
+        "min_recent_mentions": min_recent_mentions,
+        "min_surge_ratio": min_surge_ratio,
+        "min_z_score": min_z_score,
+    }
 
+    if mode == ANOMALY_MODE_SEASONAL:
+        anomalies = _detect_seasonal_anomalies(
+            target_stocks,
+            recent_start=recent_start,
+            now=now,
+            recent_hours=recent_hours,
+            weeks=max(seasonal_weeks, 1),
+            thresholds=thresholds,
+            series_fn=series_fn,
+        )
+        anomalies.sort(key=_anomaly_sort_key)
+        return anomalies[:limit]
+
+    baseline_start = recent_start - timedelta(hours=baseline_hours)
+    series_by_stock = series_fn(
+        [stock.id for stock in target_stocks],
+        baseline_start,
+        now,
+    )
+
+    anomalies = []
+    for stock in target_stocks:
+        series = series_by_stock[stock.id]
         metrics = _calc_anomaly_metrics(
-            recent_values=recent_values,
-            baseline_values=baseline_values,
-            min_recent_mentions=min_recent_mentions,
-            min_surge_ratio=min_surge_ratio,
-            min_z_score=min_z_score,
+            recent_values=series[baseline_hours:],
+            baseline_values=series[:baseline_hours],
+            **thresholds,
         )
         if not metrics:
             continue
@@ -427,16 +997,10 @@ def detect_interest_anomalies(
             {
                 "symbol": stock.symbol,
                 "name": stock.name,
+                "sentiment": _round_sentiment(stock.recent_sentiment),
                 **metrics,
             }
         )
 
-    anomalies.sort(
-        key=lambda row: (
-            0 if row["severity"] == "high" else 1,
-            -row["surge_ratio"],
-            -row["z_score"],
-            row["symbol"],
-        )
-    )
+    anomalies.sort(key=_anomaly_sort_key)
     return anomalies[:limit]
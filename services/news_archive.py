@@ -0,0 +1,230 @@
+import gzip
+import json
+import logging
+import os
+import tempfile
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.stocks.models import NewsItem
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_CHUNK_SIZE = 1000
+MANIFEST_NAME = "manifest.json"
+ARCHIVE_FIELDS = (
+    "id",
+    "stock_id",
+    "stock__symbol",
+    "source",
+    "title",
+    "url",
+    "publisher",
+    "published_at",
+    "created_at",
+    "metadata",
+    "archive_at",
+)
+
+
+def _archive_root(root=None):
+    root = root or settings.NEWS_ARCHIVE_DIR
+    return Path(root) if root else None
+
+
+def _is_writable(root):
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=root, prefix=".write-check-"):
+            pass
+    except OSError as exc:
+        logger.warning("News archive root %s is not writable: %s", root, exc)
+        return False
+    return True
+
+
+def _month_key(value):
+    return timezone.localtime(value).strftime("%Y-%m")
+
+
+def _month_file(month):
+    return f"{month[:4]}/news-{month}.ndjson.gz"
+
+
+def load_manifest(root=None):
+    root = _archive_root(root)
+    path = root / MANIFEST_NAME if root else None
+    if path is None or not path.exists():
+        return {"archived_before": None, "months": {}}
+    with path.open(encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _save_manifest(root, manifest):
+    path = root / MANIFEST_NAME
+    temp_path = path.with_suffix(".json.tmp")
+    with temp_path.open("w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def _serialize(row):
+    return {
+        "id": row["id"],
+        "stock_id": row["stock_id"],
+        "symbol": row["stock__symbol"],
+        "source": row["source"],
+        "title": row["title"],
+        "url": row["url"],
+        "publisher": row["publisher"],
+        "published_at": row["published_at"].isoformat() if row["published_at"] else None,
+        "created_at": row["created_at"].isoformat(),
+        "metadata": row["metadata"],
+    }
+
+
+def _append_month(root, month, rows):
+    path = root / _month_file(month)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Appending writes a new gzip member; readers see one continuous stream.
+    with gzip.open(path, "at", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(_serialize(row), ensure_ascii=False) + "\n")
+
+
+def archive_news_items(older_than_days=None, chunk_size=ARCHIVE_CHUNK_SIZE, root=None, now=None):
+    older_than_days = older_than_days or settings.NEWS_ARCHIVE_AFTER_DAYS
+    root = _archive_root(root)
+    # Rows are deleted once archived, so never archive into storage that is
+    # missing or that the web process may not share.
+    if root is None:
+        return {
+            "status": "error",
+            "code": "ARCHIVE_NOT_CONFIGURED",
+            "message": "NEWS_ARCHIVE_DIR is not set",
+            "archived": 0,
+            "archived_before": None,
+        }
+    if not _is_writable(root):
+        return {
+            "status": "error",
+            "code": "ARCHIVE_NOT_WRITABLE",
+            "message": f"News archive root {root} is not writable",
+            "archived": 0,
+            "archived_before": None,
+        }
+    cutoff = (now or timezone.now()) - timedelta(days=older_than_days)
+    manifest = load_manifest(root)
+    queryset = NewsItem.objects.filter(created_at__lt=cutoff).annotate(
+        archive_at=Coalesce("published_at", "created_at")
+    )
+
+    archived = 0
+    last_id = 0
+    while True:
+        rows = list(
+            queryset.filter(id__gt=last_id).order_by("id").values(*ARCHIVE_FIELDS)[:chunk_size]
+        )
+        if not rows:
+            break
+
+        rows_by_month = defaultdict(list)
+        for row in rows:
+            rows_by_month[_month_key(row["archive_at"])].append(row)
+        for month, month_rows in rows_by_month.items():
+            _append_month(root, month, month_rows)
+            entry = manifest["months"].setdefault(
+                month,
+                {"file": _month_file(month), "rows": 0, "symbols": []},
+            )
+            entry["rows"] += len(month_rows)
+            entry["symbols"] = sorted(
+                set(entry["symbols"]) | {row["stock__symbol"] for row in month_rows}
+            )
+        _save_manifest(root, manifest)
+
+        # Rows leave the hot table only after their chunk is durably on disk; a
+        # crash in between leaves duplicates that readers drop by id.
+        with transaction.atomic():
+            NewsItem.objects.filter(id__in=[row["id"] for row in rows]).delete()
+        archived += len(rows)
+        last_id = rows[-1]["id"]
+
+    manifest["archived_before"] = cutoff.isoformat()
+    _save_manifest(root, manifest)
+    if archived:
+        logger.info("Archived %s news items older than %s", archived, cutoff)
+    return {
+        "status": "success",
+        "archived": archived,
+        "archived_before": manifest["archived_before"],
+    }
+
+
+def _record_time(record):
+    return parse_datetime(record["published_at"] or record["created_at"])
+
+
+def read_archived_news(stock_symbol, start=None, end=None, limit=20, root=None, max_months=None):
+    """Newest-first archived rows for a symbol.
+
+    At most ``max_months`` month files holding the symbol are opened per call
+    (NEWS_ARCHIVE_MAX_MONTHS_SCANNED), which bounds request-time work for
+    sparsely covered stocks.
+    """
+    max_months = settings.NEWS_ARCHIVE_MAX_MONTHS_SCANNED if max_months is None else max_months
+    root = _archive_root(root)
+    if root is None:
+        return []
+    manifest = load_manifest(root)
+    start_month = _month_key(start) if start else None
+    end_month = _month_key(end) if end else None
+
+    records = []
+    seen_ids = set()
+    scanned = 0
+    for month, entry in sorted(manifest["months"].items(), reverse=True):
+        if end_month and month > end_month:
+            continue
+        if start_month and month < start_month:
+            break
+        if stock_symbol not in entry["symbols"]:
+            continue
+        if scanned >= max_months:
+            break
+        scanned += 1
+        with gzip.open(root / entry["file"], "rt", encoding="utf-8") as handle:
+            for line in handle:
+                record = json.loads(line)
+                if record["symbol"] != stock_symbol or record["id"] in seen_ids:
+                    continue
+                moment = _record_time(record)
+                if (start and moment < start) or (end and moment >= end):
+                    continue
+                seen_ids.add(record["id"])
+                records.append(record)
+        # Month files are keyed by the same timestamp we sort on, so once a
+        # month fills the page no older month can contribute a newer row.
+        if len(records) >= limit:
+            break
+
+    records.sort(key=lambda record: (_record_time(record), record["id"]), reverse=True)
+    return [
+        {
+            "title": record["title"],
+            "url": record["url"],
+            "publisher": record["publisher"],
+            "published_at": (
+                parse_datetime(record["published_at"]) if record["published_at"] else None
+            ),
+            "archived": True,
+        }
+        for record in records[:limit]
+    ]
@@ -0,0 +1,123 @@
+import operator
+from collections import defaultdict
+from datetime import timedelta
+from functools import reduce
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.stocks.models import HeadlineSignature
+from services.query_helpers import top_n_per_group
+from services.simhash import SIMHASH_MAX_DISTANCE, band_values, hamming_distance, simhash
+
+
+class HeadlineIndex:
+    """In-memory LSH over SimHash bands.
+
+    A lookup only compares signatures that share a band bucket, so matching
+    cost tracks the number of near collisions rather than the index size.
+    """
+
+    def __init__(self):
+        self._buckets = defaultdict(list)
+        self._clusters = {}
+
+    def __contains__(self, signature):
+        return signature in self._clusters
+
+    def add(self, signature, cluster_id):
+        if signature in self._clusters:
+            return
+        self._clusters[signature] = cluster_id
+        for key in band_values(signature):
+            self._buckets[key].append(signature)
+
+    def match(self, signature):
+        if signature in self._clusters:
+            return self._clusters[signature]
+        best = None
+        for key in band_values(signature):
+            for candidate in self._buckets.get(key, ()):
+                distance = hamming_distance(signature, candidate)
+                if distance <= SIMHASH_MAX_DISTANCE and (best is None or distance < best[0]):
+                    best = (distance, self._clusters[candidate])
+        return best[1] if best else None
+
+    def assign(self, signature):
+        cluster_id = self.match(signature)
+        if cluster_id is None:
+            # A new cluster is named after its first headline's signature.
+            cluster_id = signature
+        self.add(signature, cluster_id)
+        return cluster_id
+
+
+def _window_start(now):
+    return now - timedelta(hours=settings.HEADLINE_CLUSTER_WINDOW_HOURS)
+
+
+def assign_headline_clusters(items, now=None):
+    """Set ``simhash``/``cluster_id`` on unsaved NewsItems and index new signatures.
+
+    Candidates come from one indexed band lookup against headlines seen within
+    HEADLINE_CLUSTER_WINDOW_HOURS; items earlier in ``items`` also match later ones.
+    """
+    if not items:
+        return 0
+
+    now = now or timezone.now()
+    values_by_band = defaultdict(set)
+    for item in items:
+        item.simhash = simhash(item.title)
+        for band, value in band_values(item.simhash):
+            values_by_band[band].add(value)
+
+    index = HeadlineIndex()
+    lookup = reduce(
+        operator.or_,
+        (Q(band=band, value__in=values) for band, values in values_by_band.items()),
+    )
+    known = HeadlineSignature.objects.filter(lookup, seen_at__gte=_window_start(now))
+    for signature, cluster_id in known.values_list("simhash", "cluster_id").distinct():
+        index.add(signature, cluster_id)
+
+    new_signatures = []
+    for item in items:
+        is_new = item.simhash not in index
+        item.cluster_id = index.assign(item.simhash)
+        if is_new:
+            new_signatures.extend(
+                HeadlineSignature(
+                    band=band,
+                    value=value,
+                    simhash=item.simhash,
+                    cluster_id=item.cluster_id,
+                    seen_at=now,
+                )
+                for band, value in band_values(item.simhash)
+            )
+
+    if new_signatures:
+        HeadlineSignature.objects.bulk_create(new_signatures)
+    return len(new_signatures)
+
+
+def prune_headline_signatures(now=None):
+    deleted, _ = HeadlineSignature.objects.filter(
+        seen_at__lt=_window_start(now or timezone.now())
+    ).delete()
+    return deleted
+
+
+def cluster_heads(queryset):
+    """Restrict a NewsItem queryset to the first-seen item of each (stock, cluster)."""
+    return queryset.filter(
+        id__in=top_n_per_group(
+            queryset,
+            partition_by=["stock_id", "cluster_id"],
+            order_by=[F("id").asc()],
+            limit=1,
+            fields=["id"],
+        )
+    )
@@ -0,0 +1,43 @@
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from apps.stocks.models import NewsItem
+
+SEARCH_TERM_LIMIT = 8
+SQLITE_FTS_MATCH_SQL = "SELECT rowid FROM stocks_newsitem_fts WHERE stocks_newsitem_fts MATCH %s"
+_TERM_SPLIT = re.compile(r"[\s\"'*():^]+")
+
+
+def _search_terms(query):
+    return [term for term in _TERM_SPLIT.split(query or "") if term][:SEARCH_TERM_LIMIT]
+
+
+def _fts_match_expression(terms):
+    # Prefix terms so Korean particles glued to a word ("삼성전자가") still match.
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_news(query, symbol=None, start=None, end=None):
+    """Return a NewsItem queryset matching every term of ``query`` in the title."""
+    terms = _search_terms(query)
+    queryset = NewsItem.objects.select_related("stock")
+    if not terms:
+        return queryset.none()
+
+    if connection.vendor == "sqlite":
+        # Constant SQL; the user's terms only reach the database as a bound parameter.
+        match_ids = RawSQL(SQLITE_FTS_MATCH_SQL, [_fts_match_expression(terms)])  # nosec B611
+        queryset = queryset.filter(id__in=match_ids)
+    else:
+        for term in terms:
+            queryset = queryset.filter(title__icontains=term)
+
+    if symbol:
+        queryset = queryset.filter(stock__symbol=symbol)
+    if start:
+        queryset = queryset.filter(published_at__gte=start)
+    if end:
+        queryset = queryset.filter(published_at__lt=end)
+    return queryset.order_by("-id")
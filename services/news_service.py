@@ -1,15 +1,46 @@
+import hashlib
+import json
 import logging
 from collections import defaultdict
 from datetime import timedelta
 
 from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from apps.stocks.models import NewsItem, Stock
 from crawler import NewsCrawler
+from services.news_archive import read_archived_news
+from services.news_clustering import (
+    assign_headline_clusters,
+    cluster_heads,
+    prune_headline_signatures,
+)
+from services.query_helpers import top_n_per_group
+from services.sentiment import score_titles, to_sentiment_decimal
+from services.topic_service import record_keyword_counts
+from services.trending_terms import record_trending_terms
+from services.unique_mentions import record_unique_mentions
+from services.url_canonicalizer import canonicalize_url, url_hash
 
 logger = logging.getLogger(__name__)
 
+# Recent rows scanned per requested headline when collapsing duplicate stories.
+RELATED_NEWS_SCAN_FACTOR = 10
+NEWS_UPSERT_BATCH_SIZE = 500
+NEWS_UPSERT_FIELDS = [
+    "source",
+    "title",
+    "publisher",
+    "published_at",
+    "metadata",
+    "content_hash",
+    "simhash",
+    "sentiment",
+    "updated_at",
+]
+
 
 def _active_target_stocks(limit=20):
     return list(Stock.objects.filter(is_active=True).order_by("symbol")[:limit])
@@ -23,6 +54,22 @@ def _normalize_datetime(value):
     return value
 
 
+def _news_content_hash(item):
+    payload = json.dumps(
+        [
+            item.source,
+            item.title,
+            item.publisher,
+            item.published_at.isoformat() if item.published_at else None,
+            item.metadata,
+        ],
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
 def collect_news_items(limit_stocks=20, limit_per_symbol=3):
     stocks = _active_target_stocks(limit=limit_stocks)
     if not stocks:
@@ -52,46 +99,105 @@ def collect_news_items(limit_stocks=20, limit_per_symbol=3):
         }
 
     stock_by_symbol = {stock.symbol: stock for stock in stocks}
+    candidates = []
+    for record in records:
+        stock = stock_by_symbol.get(record.symbol)
+        if not stock or not record.title or not record.url:
+            continue
+
+        metadata = record.metadata or {}
+        item = NewsItem(
+            stock=stock,
+            url=record.url[:500],
+            source=record.source or NewsItem.Source.NEWS,
+            title=record.title[:300],
+            publisher=metadata.get("publisher", "")[:120],
+            published_at=_normalize_datetime(record.published_at),
+            metadata=metadata,
+        )
+        item.canonical_url = canonicalize_url(item.url)[:500]
+        item.url_hash = url_hash(item.canonical_url)
+        item.content_hash = _news_content_hash(item)
+        candidates.append(item)
+
     inserted = 0
     updated = 0
-
+    unchanged = 0
+    now = timezone.now()
+    new_titles = defaultdict(list)
+    counted_clusters = set()
     with transaction.atomic():
-        for record in records:
-            stock = stock_by_symbol.get(record.symbol)
-            if not stock or not record.title or not record.url:
-                continue
-
-            publisher = (record.metadata or {}).get("publisher", "")
-            defaults = {
-                "source": record.source or NewsItem.Source.NEWS,
-                "title": record.title[:300],
-                "publisher": publisher[:120],
-                "published_at": _normalize_datetime(record.published_at),
-                "metadata": record.metadata or {},
+        for offset in range(0, len(candidates), NEWS_UPSERT_BATCH_SIZE):
+            batch = candidates[offset : offset + NEWS_UPSERT_BATCH_SIZE]
+            # Updates keep the stored cluster_id; only new rows take the assignment.
+            assign_headline_clusters(batch, now=now)
+            for item, score in zip(batch, score_titles([item.title for item in batch])):
+                item.sentiment = to_sentiment_decimal(score)
+            known_hashes = {
+                (stock_id, key): content_hash
+                for stock_id, key, content_hash in NewsItem.objects.filter(
+                    stock_id__in={item.stock_id for item in batch},
+                    url_hash__in={item.url_hash for item in batch},
+                ).values_list("stock_id", "url_hash", "content_hash")
             }
-            _, created = NewsItem.objects.update_or_create(
-                stock=stock,
-                url=record.url[:500],
-                defaults=defaults,
-            )
-            if created:
-                inserted += 1
-            else:
-                updated += 1
+
+            # Records are replayed in crawl order so an article seen twice in one
+            # run (even behind different tracking URLs) counts as an insert
+            # followed by an update.
+            pending = {}
+            for item in batch:
+                key = (item.stock_id, item.url_hash)
+                if key not in known_hashes:
+                    inserted += 1
+                    if (item.stock_id, item.cluster_id) not in counted_clusters:
+                        counted_clusters.add((item.stock_id, item.cluster_id))
+                        new_titles[item.stock].append(item.title)
+                elif known_hashes[key] != item.content_hash:
+                    updated += 1
+                else:
+                    unchanged += 1
+                    continue
+                known_hashes[key] = item.content_hash
+                pending[key] = item
+
+            if pending:
+                NewsItem.objects.bulk_create(
+                    list(pending.values()),
+                    update_conflicts=True,
+                    unique_fields=["stock", "url_hash"],
+                    update_fields=NEWS_UPSERT_FIELDS,
+                )
+        prune_headline_signatures(now)
+        record_keyword_counts(new_titles, recorded_at=now)
+        news_identities = defaultdict(list)
+        for stock_id, cluster_id in counted_clusters:
+            news_identities[(stock_id, NewsItem.Source.NEWS)].append(f"news:cluster:{cluster_id}")
+        record_unique_mentions(news_identities, recorded_at=now)
+        # A story tagged to several stocks trends once market-wide.
+        trending_titles = list(
+            dict.fromkeys(title for titles in new_titles.values() for title in titles)
+        )
+        transaction.on_commit(lambda: record_trending_terms(trending_titles, recorded_at=now))
 
     return {
         "status": "success",
         "inserted": inserted,
         "updated": updated,
+        "unchanged": unchanged,
         "total_records": len(records),
     }
 
 
 def get_related_news(stock_symbol, limit=5):
-    news_records = (
+    # Dedupe only a capped recent slice so the window never spans full history.
+    recent_ids = (
         NewsItem.objects.filter(stock__symbol=stock_symbol)
-        .order_by("-published_at", "-id")[:limit]
+        .order_by("-published_at", "-id")
+        .values("id")[: limit * RELATED_NEWS_SCAN_FACTOR]
     )
+    news_records = cluster_heads(NewsItem.objects.filter(id__in=recent_ids)).order_by(
+        "-published_at", "-id"
+    )[:limit]
     return [
         {
             "title": record.title,
@@ -103,6 +209,36 @@ def get_related_news(stock_symbol, limit=5):
     ]
 
 
+def get_news_history(stock_symbol, start=None, end=None, limit=20):
+    news_records = NewsItem.objects.filter(stock__symbol=stock_symbol).annotate(
+        sort_at=Coalesce("published_at", "created_at")
+    )
+    if start:
+        news_records = news_records.filter(sort_at__gte=start)
+    if end:
+        news_records = news_records.filter(sort_at__lt=end)
+    rows = [
+        {
+            "title": record.title,
+            "url": record.url,
+            "publisher": record.publisher,
+            "published_at": record.published_at,
+            "archived": False,
+        }
+        for record in news_records.order_by("-sort_at", "-id")[:limit]
+    ]
+    if len(rows) < limit:
+        rows.extend(
+            read_archived_news(
+                stock_symbol,
+                start=start,
+                end=end,
+                limit=limit - len(rows),
+            )
+        )
+    return rows
+
+
 def get_latest_news_for_symbols(symbols, limit_per_symbol=2, since_hours=24):
     if not symbols or limit_per_symbol <= 0:
         return []
@@ -110,26 +246,31 @@ def get_latest_news_for_symbols(symbols, limit_per_symbol=2, since_hours=24):
     since = timezone.now() - timedelta(hours=since_hours)
     symbol_order = list(dict.fromkeys(symbols))
     grouped_records = defaultdict(list)
-    records = (
-        NewsItem.objects.filter(stock__symbol__in=symbol_order, created_at__gte=since)
-        .select_related("stock")
-        .order_by("stock__symbol", "-published_at", "-id")
+    rows = top_n_per_group(
+        cluster_heads(
+            NewsItem.objects.filter(stock__symbol__in=symbol_order, created_at__gte=since)
+        ),
+        partition_by=["stock_id"],
+        order_by=[F("published_at").desc(), F("id").desc()],
+        limit=limit_per_symbol,
+        fields=["stock__symbol", "title", "publisher", "cluster_id"],
     )
-    for record in records:
-        symbol = record.stock.symbol
-        bucket = grouped_records[symbol]
-        if len(bucket) >= limit_per_symbol:
+    symbol_rank = {symbol: rank for rank, symbol in enumerate(symbol_order)}
+    seen_clusters = set()
+    for row in sorted(rows, key=lambda row: symbol_rank[row["stock__symbol"]]):
+        # A wire story tagged to several symbols is briefed once, under the first.
+        if row["cluster_id"] in seen_clusters:
             continue
-        bucket.append(record)
+        seen_clusters.add(row["cluster_id"])
+        grouped_records[row["stock__symbol"]].append(
+            {
+                "symbol": row["stock__symbol"],
+                "title": row["title"],
+                "publisher": row["publisher"],
+            }
+        )
 
     payload = []
     for symbol in symbol_order:
-        for record in grouped_records.get(symbol, []):
-            payload.append(
-                {
-                    "symbol": symbol,
-                    "title": record.title,
-                    "publisher": record.publisher,
-                }
-            )
+        payload.extend(grouped_records.get(symbol, []))
     return payload
@@ -0,0 +1,130 @@
+import logging
+import re
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# NewsItem stays a plain table: PostgreSQL unique indexes on a partitioned
+# table must include the partition key, which would break the (stock, url)
+# upsert that collect_news_items relies on.
+PARTITIONED_TABLES = {
+    "stocks_interest": "recorded_at",
+}
+PARTITION_NAME_PATTERN = re.compile(r"_p(?P<year>\d{4})(?P<month>\d{2})$")
+
+
+def partitioning_supported():
+    return connection.vendor == "postgresql"
+
+
+def _month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def _month_bound(month):
+    return timezone.make_aware(datetime.combine(month, time.min), timezone.get_current_timezone())
+
+
+def list_partitions(table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            ORDER BY child.relname
+            """,
+            [table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def create_month_partition(cursor, table, month):
+    name = partition_name(table, month)
+    # Partition bounds are DDL literals; both come from date arithmetic, not input.
+    lower = _month_bound(month).isoformat()
+    upper = _month_bound(_add_months(month, 1)).isoformat()
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    )
+    return name
+
+
+def ensure_partitions(months_ahead=None, reference=None):
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    first_month = _month_start(timezone.localtime(reference or timezone.now()))
+    created = []
+    for table in PARTITIONED_TABLES:
+        existing = set(list_partitions(table))
+        with transaction.atomic(), connection.cursor() as cursor:
+            for offset in range(months_ahead + 1):
+                month = _add_months(first_month, offset)
+                if partition_name(table, month) in existing:
+                    continue
+                created.append(create_month_partition(cursor, table, month))
+    return created
+
+
+def detach_old_partitions(retention_months=None, drop=False, reference=None):
+    retention_months = (
+        settings.PARTITION_RETENTION_MONTHS if retention_months is None else retention_months
+    )
+    cutoff = _add_months(
+        _month_start(timezone.localtime(reference or timezone.now())),
+        -retention_months,
+    )
+    detached = []
+    for table in PARTITIONED_TABLES:
+        for name in list_partitions(table):
+            match = PARTITION_NAME_PATTERN.search(name)
+            if not match:
+                continue
+            month = date(int(match["year"]), int(match["month"]), 1)
+            if month >= cutoff:
+                continue
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+                if drop:
+                    cursor.execute(f'DROP TABLE "{name}"')
+            detached.append(name)
+    return detached
+
+
+def manage_partitions(months_ahead=None, retention_months=None, detach=False, drop=False):
+    if not partitioning_supported():
+        return {
+            "status": "skipped",
+            "code": "UNSUPPORTED_VENDOR",
+            "message": f"Partitioning is not available on {connection.vendor}",
+            "created": [],
+            "detached": [],
+        }
+
+    created = ensure_partitions(months_ahead=months_ahead)
+    detached = []
+    if detach:
+        detached = detach_old_partitions(retention_months=retention_months, drop=drop)
+    if created or detached:
+        logger.info("Partitions updated: created=%s detached=%s", created, detached)
+    return {
+        "status": "success",
+        "created": created,
+        "detached": detached,
+        "dropped": detach and drop,
+    }
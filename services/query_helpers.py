@@ -0,0 +1,24 @@
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+
+def top_n_per_group(queryset, *, partition_by, order_by, limit, fields, group_annotations=None):
+    """Return values() rows holding only the first ``limit`` rows of each group.
+
+    ``group_annotations`` maps names to aggregates evaluated over the whole
+    partition (e.g. a per-group Count), so totals survive the row cut-off.
+    """
+    partition = [F(field) for field in partition_by]
+    windows = {
+        name: Window(expression, partition_by=partition)
+        for name, expression in (group_annotations or {}).items()
+    }
+    return (
+        queryset.annotate(
+            group_rank=Window(RowNumber(), partition_by=partition, order_by=order_by),
+            **windows,
+        )
+        .filter(group_rank__lte=limit)
+        .order_by(*partition_by, "group_rank")
+        .values(*fields, *windows)
+    )
@@ -0,0 +1,18 @@
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+
+
+@lru_cache(maxsize=4)
+def _build_client(url):
+    return redis.Redis.from_url(
+        url,
+        socket_timeout=2.0,
+        socket_connect_timeout=2.0,
+        decode_responses=True,
+    )
+
+
+def get_redis_client():
+    return _build_client(settings.REDIS_URL)
@@ -0,0 +1,162 @@
+import math
+import re
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.stocks.models import Interest, NewsItem, RelatedStock, Stock
+from services.simhash import simhash
+from services.tokenizer import count_tokens
+
+RELATED_BULK_BATCH_SIZE = 500
+# Ticker-shaped words in the original casing; "OpenAI" does not yield "AI".
+SYMBOL_TOKEN_PATTERN = re.compile(r"(?<![A-Za-z0-9])[A-Z][A-Z0-9]+(?![A-Za-z0-9])")
+
+
+def _stock_aliases(stocks):
+    """Return (symbol_aliases, name_aliases) used to spot stocks in titles.
+
+    Symbols with letters ("NVDA") are matched case-sensitively so tickers such
+    as ON, IT or NOW do not fire on ordinary words; single-token names
+    ("카카오") are matched on normalized tokens. Multi-word names are skipped.
+    """
+    symbol_aliases = defaultdict(set)
+    name_aliases = defaultdict(set)
+    for stock in stocks:
+        if any(char.isalpha() for char in stock.symbol) and len(stock.symbol) >= 2:
+            symbol_aliases[stock.symbol.upper()].add(stock.id)
+        name_tokens = list(count_tokens([stock.name], stopwords=frozenset()))
+        if len(name_tokens) == 1:
+            name_aliases[name_tokens[0]].add(stock.id)
+    return symbol_aliases, name_aliases
+
+
+def _mentioned_stocks(title, aliases):
+    symbol_aliases, name_aliases = aliases
+    mentioned = {
+        stock_id
+        for token in count_tokens([title], stopwords=frozenset())
+        for stock_id in name_aliases.get(token, ())
+    }
+    # An all-caps headline gives no casing signal, so tickers are not trusted there.
+    if any(char.islower() for char in title):
+        for token in SYMBOL_TOKEN_PATTERN.findall(title):
+            mentioned.update(symbol_aliases.get(token, ()))
+    return mentioned
+
+
+def build_incidence(since):
+    """Return {document: set(stock_id)} for headline clusters and crawler posts.
+
+    A document is one story (a NewsItem cluster or a sample's cluster id); it
+    is incident to every stock it was attributed to or names in its title.
+    """
+    stocks = list(Stock.objects.filter(is_active=True).only("id", "symbol", "name"))
+    active_ids = {stock.id for stock in stocks}
+    aliases = _stock_aliases(stocks)
+    documents = defaultdict(set)
+
+    news_rows = NewsItem.objects.filter(created_at__gte=since).values_list(
+        "cluster_id", "stock_id", "title"
+    )
+    for cluster_id, stock_id, title in news_rows.iterator():
+        document = documents[cluster_id if cluster_id is not None else simhash(title)]
+        document.add(stock_id)
+        document.update(_mentioned_stocks(title, aliases))
+
+    records = (
+        Interest.objects.filter(recorded_at__gte=since)
+        .exclude(source=Interest.Source.NEWS)
+        .values_list("stock_id", "metadata")
+    )
+    for stock_id, metadata in records.iterator():
+        samples = (metadata or {}).get("samples", [])
+        if not isinstance(samples, list):
+            continue
+        for sample in samples:
+            if not isinstance(sample, dict) or not sample.get("title"):
+                continue
+            title = str(sample["title"])
+            document = documents[sample.get("cluster_id") or simhash(title)]
+            document.add(stock_id)
+            document.update(_mentioned_stocks(title, aliases))
+
+    incidence = {}
+    for key, stock_ids in documents.items():
+        stock_ids &= active_ids
+        if stock_ids:
+            incidence[key] = stock_ids
+    return incidence
+
+
+def co_mention_counts(documents):
+    """Return (pair_counts, stock_counts) for the incidence A as C = A @ A.T.
+
+    Each document adds the outer product of its own (few) stocks, so the work
+    is the sum of squared document sizes rather than stocks squared.
+    """
+    pair_counts = defaultdict(int)
+    stock_counts = defaultdict(int)
+    for stock_ids in documents.values():
+        ordered = sorted(stock_ids)
+        for index, stock_id in enumerate(ordered):
+            stock_counts[stock_id] += 1
+            for other_id in ordered[index + 1 :]:
+                pair_counts[(stock_id, other_id)] += 1
+    return pair_counts, stock_counts
+
+
+def compute_related_stocks(hours=None, top_k=None, min_co_mentions=None):
+    hours = hours or settings.RELATED_STOCKS_WINDOW_HOURS
+    top_k = top_k or settings.RELATED_STOCKS_TOP_K
+    if min_co_mentions is None:
+        min_co_mentions = settings.RELATED_STOCKS_MIN_CO_MENTIONS
+    now = timezone.now()
+    documents = build_incidence(now - timedelta(hours=hours))
+    pair_counts, stock_counts = co_mention_counts(documents)
+    document_count = len(documents)
+
+    neighbours = defaultdict(list)
+    for (left, right), count in pair_counts.items():
+        if count < min_co_mentions:
+            continue
+        pmi = math.log(count * document_count / (stock_counts[left] * stock_counts[right]))
+        neighbours[left].append((pmi, count, right))
+        neighbours[right].append((pmi, count, left))
+
+    rows = []
+    for stock_id, candidates in neighbours.items():
+        candidates.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        rows.extend(
+            RelatedStock(
+                stock_id=stock_id,
+                related_id=related_id,
+                co_mentions=count,
+                pmi=round(pmi, 6),
+                rank=rank,
+                computed_at=now,
+            )
+            for rank, (pmi, count, related_id) in enumerate(candidates[:top_k], start=1)
+        )
+
+    with transaction.atomic():
+        RelatedStock.objects.all().delete()
+        RelatedStock.objects.bulk_create(rows, batch_size=RELATED_BULK_BATCH_SIZE)
+    return {"documents": document_count, "pairs": len(pair_counts), "related": len(rows)}
+
+
+def get_related_stocks(stock, limit=5):
+    return [
+        {
+            "symbol": row.related.symbol,
+            "name": row.related.name,
+            "co_mentions": row.co_mentions,
+            "pmi": row.pmi,
+        }
+        for row in RelatedStock.objects.filter(stock=stock)
+        .select_related("related")
+        .order_by("rank")[:limit]
+    ]
@@ -0,0 +1,222 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from functools import lru_cache
+
+from services.tokenizer import lower_tokens
+
+# Kept free of Django imports so process-pool workers can load it bare.
+
+SENTIMENT_QUANTUM = Decimal("0.01")
+# Squashes a title's summed weights into (-1, 1); one strong term lands near 0.7.
+SENTIMENT_ALPHA = 4.0
+SENTIMENT_NEGATION_WINDOW = 3
+SENTIMENT_CACHE_SIZE = 65536
+SENTIMENT_POOL_CHUNK_SIZE = 2000
+
+ENGLISH_LEXICON = {
+    "surge": 2.0,
+    "surges": 2.0,
+    "soar": 2.0,
+    "soars": 2.0,
+    "skyrocket": 2.5,
+    "jump": 1.5,
+    "jumps": 1.5,
+    "rally": 1.5,
+    "rallies": 1.5,
+    "rebound": 1.0,
+    "rebounds": 1.0,
+    "gain": 1.0,
+    "gains": 1.0,
+    "rise": 1.0,
+    "rises": 1.0,
+    "beat": 1.5,
+    "beats": 1.5,
+    "record": 1.0,
+    "upgrade": 1.5,
+    "upgrades": 1.5,
+    "upgraded": 1.5,
+    "outperform": 1.5,
+    "bullish": 1.5,
+    "profit": 1.0,
+    "profits": 1.0,
+    "growth": 1.0,
+    "strong": 1.0,
+    "boost": 1.0,
+    "boosts": 1.0,
+    "approval": 1.0,
+    "approved": 1.0,
+    "buyback": 1.0,
+    "dividend": 0.5,
+    "optimism": 1.0,
+    "plunge": -2.0,
+    "plunges": -2.0,
+    "crash": -2.5,
+    "crashes": -2.5,
+    "tumble": -2.0,
+    "tumbles": -2.0,
+    "slump": -1.5,
+    "slumps": -1.5,
+    "drop": -1.0,
+    "drops": -1.0,
+    "fall": -1.0,
+    "falls": -1.0,
+    "decline": -1.0,
+    "declines": -1.0,
+    "loss": -1.5,
+    "losses": -1.5,
+    "miss": -1.5,
+    "misses": -1.5,
+    "downgrade": -1.5,
+    "downgrades": -1.5,
+    "downgraded": -1.5,
+    "underperform": -1.5,
+    "bearish": -1.5,
+    "weak": -1.0,
+    "selloff": -1.5,
+    "lawsuit": -1.0,
+    "probe": -1.0,
+    "fraud": -2.5,
+    "recall": -1.0,
+    "layoffs": -1.0,
+    "warning": -1.0,
+    "concerns": -1.0,
+    "fears": -1.0,
+    "slowdown": -1.0,
+    "bankruptcy": -2.5,
+    "default": -2.0,
+}
+ENGLISH_NEGATORS = frozenset({"not", "no", "never", "without", "fails", "failed"})
+
+# Korean terms are stems matched inside a token, so particles and compounds
+# need no normalization ("흑자전환으로" hits "흑자").
+KOREAN_LEXICON = {
+    "급등": 2.0,
+    "폭등": 2.5,
+    "상승": 1.0,
+    "강세": 1.0,
+    "반등": 1.0,
+    "돌파": 1.0,
+    "호재": 1.5,
+    "호실적": 2.0,
+    "호조": 1.5,
+    "흑자": 1.5,
+    "신고가": 2.0,
+    "수혜": 1.0,
+    "성장": 1.0,
+    "상향": 1.0,
+    "순매수": 1.0,
+    "개선": 1.0,
+    "수주": 1.0,
+    "낙관": 1.0,
+    "랠리": 1.5,
+    "기대": 0.5,
+    "급락": -2.0,
+    "폭락": -2.5,
+    "하락": -1.0,
+    "약세": -1.0,
+    "악재": -1.5,
+    "적자": -1.5,
+    "부진": -1.5,
+    "신저가": -2.0,
+    "우려": -1.0,
+    "하향": -1.0,
+    "순매도": -1.0,
+    "악화": -1.5,
+    "손실": -1.5,
+    "쇼크": -1.5,
+    "둔화": -1.0,
+    "위기": -1.5,
+    "리콜": -1.0,
+    "소송": -1.0,
+    "제재": -1.0,
+    "파산": -2.5,
+    "경고": -1.0,
+}
+# Korean negation follows the predicate ("상승하지 않았다"), so it flips backwards.
+KOREAN_NEGATION_PREFIXES = ("않", "못", "아니", "없")
+_KOREAN_TERMS = sorted(KOREAN_LEXICON, key=len, reverse=True)
+
+
+@lru_cache(maxsize=SENTIMENT_CACHE_SIZE)
+def _token_weight(token):
+    if token in ENGLISH_LEXICON:
+        return ENGLISH_LEXICON[token]
+    if not ("가" <= token[0] <= "힣"):
+        return 0.0
+    weight = 0.0
+    # Longest stems first, each consumed once, so "신고가" is not also "고가".
+    for term in _KOREAN_TERMS:
+        if term in token:
+            weight += KOREAN_LEXICON[term]
+            token = token.replace(term, " ")
+    return weight
+
+
+def _score_tokens(tokens):
+    weights = []
+    negate_next = 0
+    for token in tokens:
+        if token in ENGLISH_NEGATORS:
+            negate_next = SENTIMENT_NEGATION_WINDOW
+            continue
+        if token.startswith(KOREAN_NEGATION_PREFIXES):
+            for index in range(len(weights) - 1, -1, -1):
+                if weights[index]:
+                    weights[index] = -weights[index]
+                    break
+            continue
+        weight = _token_weight(token)
+        if weight and negate_next:
+            weight = -weight
+            negate_next = 0
+        elif negate_next:
+            negate_next -= 1
+        weights.append(weight)
+
+    total = sum(weights)
+    if not total:
+        return 0.0
+    return total / math.sqrt(total * total + SENTIMENT_ALPHA)
+
+
+def score_title(title):
+    if not title:
+        return 0.0
+    return _score_tokens(lower_tokens(title))
+
+
+def score_titles(titles):
+    """Score a batch of titles in order, each in [-1, 1].
+
+    Term weights come from a memoized lookup, so repeated vocabulary across
+    the batch costs one dict hit.
+    """
+    if not titles:
+        return []
+    return [_score_tokens(lower_tokens(title or "")) for title in titles]
+
+
+def score_titles_parallel(titles, workers=1, chunk_size=SENTIMENT_POOL_CHUNK_SIZE):
+    """Score ``titles`` across a process pool; meant for backfills, not ingest."""
+    titles = list(titles)
+    worker_count = min(max(int(workers), 1), math.ceil(len(titles) / chunk_size) or 1)
+    if worker_count == 1:
+        return score_titles(titles)
+
+    chunks = [titles[offset : offset + chunk_size] for offset in range(0, len(titles), chunk_size)]
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        return [score for scores in executor.map(score_titles, chunks) for score in scores]
+
+
+def to_sentiment_decimal(value):
+    if value is None:
+        return None
+    return Decimal(value).quantize(SENTIMENT_QUANTUM)
+
+
+def mean_sentiment(scores):
+    scores = list(scores)
+    if not scores:
+        return None
+    return to_sentiment_decimal(sum(scores) / len(scores))
@@ -0,0 +1,79 @@
+from apps.stocks.models import Interest, NewsItem
+from services.sentiment import mean_sentiment, score_titles_parallel, to_sentiment_decimal
+
+SENTIMENT_BACKFILL_BATCH_SIZE = 5000
+SENTIMENT_UPDATE_BATCH_SIZE = 500
+
+
+def _unscored_batches(queryset, fields, batch_size):
+    # Keyset pagination: rows scored by an earlier batch drop out of the filter.
+    last_id = 0
+    while True:
+        rows = list(
+            queryset.filter(id__gt=last_id).order_by("id").values_list("id", *fields)[:batch_size]
+        )
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield rows
+
+
+def backfill_news_sentiment(since=None, workers=1, batch_size=SENTIMENT_BACKFILL_BATCH_SIZE):
+    queryset = NewsItem.objects.filter(sentiment__isnull=True)
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+
+    scored = 0
+    for rows in _unscored_batches(queryset, ["title"], batch_size):
+        scores = score_titles_parallel([title for _, title in rows], workers=workers)
+        items = [
+            NewsItem(id=item_id, sentiment=to_sentiment_decimal(score))
+            for (item_id, _), score in zip(rows, scores)
+        ]
+        NewsItem.objects.bulk_update(items, ["sentiment"], batch_size=SENTIMENT_UPDATE_BATCH_SIZE)
+        scored += len(items)
+    return scored
+
+
+def backfill_interest_sentiment(since=None, workers=1, batch_size=SENTIMENT_BACKFILL_BATCH_SIZE):
+    """Score unscored snapshots from the sample titles kept in their metadata.
+
+    Compacted rows carry no samples and stay unscored.
+    """
+    queryset = Interest.objects.filter(sentiment_score__isnull=True)
+    if since is not None:
+        queryset = queryset.filter(recorded_at__gte=since)
+
+    scored = 0
+    for rows in _unscored_batches(queryset, ["metadata"], batch_size):
+        titles_by_row = []
+        for row_id, metadata in rows:
+            samples = (metadata or {}).get("samples") or []
+            titles = [
+                sample["title"]
+                for sample in samples
+                if isinstance(sample, dict) and sample.get("title")
+            ]
+            if titles:
+                titles_by_row.append((row_id, titles))
+        if not titles_by_row:
+            continue
+
+        scores = iter(
+            score_titles_parallel(
+                [title for _, titles in titles_by_row for title in titles],
+                workers=workers,
+            )
+        )
+        records = [
+            Interest(
+                id=row_id,
+                sentiment_score=mean_sentiment(next(scores) for _ in titles),
+            )
+            for row_id, titles in titles_by_row
+        ]
+        Interest.objects.bulk_update(
+            records, ["sentiment_score"], batch_size=SENTIMENT_UPDATE_BATCH_SIZE
+        )
+        scored += len(records)
+    return scored
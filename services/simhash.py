@@ -0,0 +1,67 @@
+import hashlib
+import re
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+SIMHASH_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+SIMHASH_SHINGLE = 3
+# Figures ("Q3", "10%") separate otherwise identical headlines, so tokens with
+# digits are added as whole features that outweigh a few shared shingles.
+SIMHASH_NUMBER_WEIGHT = 4
+# With 4 bands of 16 bits, any pair within 3 bits shares at least one band
+# exactly (pigeonhole), so band equality lookups never miss a near-duplicate.
+SIMHASH_MAX_DISTANCE = SIMHASH_BANDS - 1
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+# Aggregators append " - Publisher" to syndicated headlines.
+_PUBLISHER_SUFFIX = re.compile(r"\s+[-–|]\s+[^-–|]{1,40}$")
+_BAND_MASK = (1 << SIMHASH_BAND_BITS) - 1
+_SIGN_BIT = 1 << (SIMHASH_BITS - 1)
+
+
+def _features(text):
+    text = _PUBLISHER_SUFFIX.sub("", (text or "").strip())
+    normalized = _NON_WORD.sub(" ", text.lower()).strip()
+    if not normalized:
+        return []
+    features = [
+        (normalized[index : index + SIMHASH_SHINGLE], 1)
+        for index in range(max(len(normalized) - SIMHASH_SHINGLE + 1, 1))
+    ]
+    features.extend(
+        (f"#{token}", SIMHASH_NUMBER_WEIGHT)
+        for token in normalized.split()
+        if any(char.isdigit() for char in token)
+    )
+    return features
+
+
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text):
+    """Return a signed 64-bit SimHash of character shingles (fits BigIntegerField)."""
+    counters = [0] * SIMHASH_BITS
+    for feature, weight in _features(text):
+        value = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            counters[bit] += weight if value >> bit & 1 else -weight
+
+    signature = 0
+    for bit, weight in enumerate(counters):
+        if weight > 0:
+            signature |= 1 << bit
+    return signature - (1 << SIMHASH_BITS) if signature & _SIGN_BIT else signature
+
+
+def hamming_distance(left, right):
+    return ((left ^ right) & ((1 << SIMHASH_BITS) - 1)).bit_count()
+
+
+def band_values(signature):
+    unsigned = signature & ((1 << SIMHASH_BITS) - 1)
+    return [
+        (band, unsigned >> (band * SIMHASH_BAND_BITS) & _BAND_MASK)
+        for band in range(SIMHASH_BANDS)
+    ]
@@ -1,21 +1,37 @@
 import logging
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import date
 from decimal import Decimal, InvalidOperation
 
 import httpx
 from django.conf import settings
 from django.db import transaction
-from django.db.models import OuterRef, Subquery
+from django.db.models import OuterRef, Q, Subquery
 from django.utils import timezone
 
 from apps.stocks.models import Price, Stock
+from services.alpha_vantage_quota import (
+    mark_quota_exhausted,
+    release_quota,
+    remaining_quota,
+    reserve_quota,
+)
 
 logger = logging.getLogger(__name__)
 
 ALPHA_VANTAGE_BASE_URL = "https://www.alphavantage.co/query"
 ALPHA_VANTAGE_MIN_INTERVAL_SEC = 1.1
 ALPHA_VANTAGE_MAX_RETRIES = 3
+# Per-minute throttles clear within a minute; back off long enough to span one.
+ALPHA_VANTAGE_RATE_LIMIT_BACKOFF_SEC = 20.0
+ALPHA_VANTAGE_TIMEOUT_SEC = 15.0
+ALPHA_VANTAGE_BULK_SIZE = 100
+ALPHA_VANTAGE_RETRYABLE = ("API_ERROR", "RATE_LIMIT")
+PRICE_BULK_BATCH_SIZE = 500
+PRICE_UPSERT_FIELDS = ["open_price", "high_price", "low_price", "close_price", "volume"]
+STOCK_SYNC_FIELDS = ["name", "market", "sector", "is_active"]
 
 INDEX_DEFINITIONS = {
     "KOSPI": {
@@ -78,93 +94,268 @@ def _is_rate_limited_message(message):
     )
 
 
+def _is_daily_limit_message(message):
+    return "per day" in str(message or "").lower()
+
+
 def ensure_index_stocks():
-    created_count = 0
-    updated_count = 0
-    with transaction.atomic():
-        for definition in INDEX_DEFINITIONS.values():
-            stock, created = Stock.objects.update_or_create(
-                symbol=definition["symbol"],
-                defaults={
-                    "name": definition["name"],
-                    "market": definition["market"],
-                    "sector": "INDEX",
-                    "is_active": True,
-                },
-            )
-            if created:
-                created_count += 1
-            else:
-                updated_count += 1
+    """Idempotently sync INDEX_DEFINITIONS into Stock rows.
+
+    One read; rows are only written when missing or out of date, so the
+    common call (everything already in place) costs a single query.
+    """
+    wanted = {
+        definition["symbol"]: {
+            "name": definition["name"],
+            "market": definition["market"],
+            "sector": "INDEX",
+            "is_active": True,
+        }
+        for definition in INDEX_DEFINITIONS.values()
+    }
+    existing = {stock.symbol: stock for stock in Stock.objects.filter(symbol__in=wanted)}
+    to_create = [
+        Stock(symbol=symbol, **fields) for symbol, fields in wanted.items() if symbol not in existing
+    ]
+    to_update = []
+    for symbol, stock in existing.items():
+        fields = wanted[symbol]
+        if any(getattr(stock, name) != value for name, value in fields.items()):
+            for name, value in fields.items():
+                setattr(stock, name, value)
+            stock.updated_at = timezone.now()
+            to_update.append(stock)
+
+    if to_create or to_update:
+        with transaction.atomic():
+            if to_create:
+                # ignore_conflicts keeps concurrent first calls from failing.
+                Stock.objects.bulk_create(to_create, ignore_conflicts=True)
+            if to_update:
+                Stock.objects.bulk_update(to_update, [*STOCK_SYNC_FIELDS, "updated_at"])
     return {
         "status": "success",
-        "created": created_count,
-        "updated": updated_count,
+        "created": len(to_create),
+        "updated": len(to_update),
     }
 
 
-def fetch_alpha_vantage_quote(symbol, max_retries=ALPHA_VANTAGE_MAX_RETRIES):
-    params = {
-        "function": "GLOBAL_QUOTE",
-        "symbol": symbol,
-        "apikey": settings.ALPHA_VANTAGE_API_KEY,
+def _store_prices(quotes_by_stock):
+    """Upsert fetched quotes in one batch; returns ``(inserted, updated)``."""
+    if not quotes_by_stock:
+        return 0, 0
+    existing = set(
+        Price.objects.filter(
+            stock_id__in=[stock.id for stock in quotes_by_stock],
+            traded_at__in={quote["traded_at"] for quote in quotes_by_stock.values()},
+        )
+        .order_by()
+        .values_list("stock_id", "traded_at")
+    )
+    rows = [
+        Price(
+            stock=stock,
+            traded_at=quote["traded_at"],
+            **{field: quote[field] for field in PRICE_UPSERT_FIELDS},
+        )
+        for stock, quote in quotes_by_stock.items()
+    ]
+    Price.objects.bulk_create(
+        rows,
+        batch_size=PRICE_BULK_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["stock", "traded_at"],
+        update_fields=PRICE_UPSERT_FIELDS,
+    )
+    updated = sum((row.stock_id, row.traded_at) in existing for row in rows)
+    return len(rows) - updated, updated
+
+
+class RequestBudget:
+    """Hands out request slots no faster than one per ``interval`` seconds.
+
+    Slots are reserved in arrival order and shared by every worker, so pacing
+    no longer depends on which thread sleeps; ``close`` releases all waiters.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._next_slot = time.monotonic()
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            if self._closed:
+                return False
+            slot = max(time.monotonic(), self._next_slot)
+            self._next_slot = slot + self.interval
+            while not self._closed:
+                remaining = slot - time.monotonic()
+                if remaining <= 0:
+                    return True
+                self._condition.wait(remaining)
+            return False
+
+    def defer(self, seconds):
+        # Provider throttling pauses every worker, not only the one that hit it.
+        with self._condition:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+def _quote_data(open_price, high_price, low_price, close_price, volume, traded_at, raw):
+    return {
+        "open_price": _to_decimal(open_price),
+        "high_price": _to_decimal(high_price),
+        "low_price": _to_decimal(low_price),
+        "close_price": _to_decimal(close_price),
+        "volume": int(float(volume or 0)),
+        "traded_at": _to_date(traded_at),
+        "raw": raw,
     }
-    last_error = ""
-
-    for attempt in range(1, max_retries + 1):
-        try:
-            with httpx.Client(timeout=15.0) as client:
-                response = client.get(ALPHA_VANTAGE_BASE_URL, params=params)
-                response.raise_for_status()
-                payload = response.json()
-        except (httpx.HTTPError, ValueError) as exc:
-            last_error = str(exc)
-            logger.error(
-                "Alpha Vantage quote request failed (%s, attempt %s/%s): %s",
-                symbol,
-                attempt,
-                max_retries,
-                exc,
-            )
-            if attempt < max_retries:
-                time.sleep(ALPHA_VANTAGE_MIN_INTERVAL_SEC * attempt)
-                continue
-            return {"status": "error", "code": "API_ERROR", "message": last_error}
-
-        quote = payload.get("Global Quote") or {}
-        if quote and quote.get("05. price"):
-            return {
-                "status": "success",
-                "data": {
-                    "open_price": _to_decimal(quote.get("02. open")),
-                    "high_price": _to_decimal(quote.get("03. high")),
-                    "low_price": _to_decimal(quote.get("04. low")),
-                    "close_price": _to_decimal(quote.get("05. price")),
-                    "volume": int(float(quote.get("06. volume") or 0)),
-                    "traded_at": _to_date(quote.get("07. latest trading day")),
-                    "raw": quote,
-                },
-            }
 
-        note = payload.get("Note") or payload.get("Information") or "Empty quote payload"
-        last_error = str(note)
-        if _is_rate_limited_message(note):
-            logger.warning(
-                "Alpha Vantage rate-limited (%s, attempt %s/%s): %s",
-                symbol,
-                attempt,
-                max_retries,
-                note,
+
+def _get_alpha_vantage_payload(params, client=None):
+    params = {**params, "apikey": settings.ALPHA_VANTAGE_API_KEY}
+    if client is not None:
+        response = client.get(ALPHA_VANTAGE_BASE_URL, params=params)
+        response.raise_for_status()
+        return response.json()
+    with httpx.Client(timeout=ALPHA_VANTAGE_TIMEOUT_SEC) as own_client:
+        return _get_alpha_vantage_payload(params, client=own_client)
+
+
+def fetch_alpha_vantage_quote(symbol, client=None):
+    """Issue one GLOBAL_QUOTE request; pacing and retries belong to the caller."""
+    try:
+        payload = _get_alpha_vantage_payload(
+            {"function": "GLOBAL_QUOTE", "symbol": symbol},
+            client=client,
+        )
+    except (httpx.HTTPError, ValueError) as exc:
+        logger.error("Alpha Vantage quote request failed (%s): %s", symbol, exc)
+        return {"status": "error", "code": "API_ERROR", "message": str(exc)}
+
+    quote = payload.get("Global Quote") or {}
+    if quote and quote.get("05. price"):
+        return {
+            "status": "success",
+            "data": _quote_data(
+                quote.get("02. open"),
+                quote.get("03. high"),
+                quote.get("04. low"),
+                quote.get("05. price"),
+                quote.get("06. volume"),
+                quote.get("07. latest trading day"),
+                quote,
+            ),
+        }
+
+    note = payload.get("Note") or payload.get("Information") or "Empty quote payload"
+    if _is_rate_limited_message(note):
+        logger.warning("Alpha Vantage rate-limited (%s): %s", symbol, note)
+        return {"status": "error", "code": "RATE_LIMIT", "message": str(note)}
+
+    logger.warning("Alpha Vantage empty quote (%s): %s", symbol, note)
+    return {"status": "error", "code": "EMPTY_QUOTE", "message": str(note)}
+
+
+def fetch_alpha_vantage_bulk_quotes(symbols, client=None):
+    """Quote up to ALPHA_VANTAGE_BULK_SIZE symbols in one request.
+
+    Returns ``{symbol: data}`` for the symbols the endpoint answered; an
+    unsupported key or a failed request yields ``{}`` so callers fall back.
+    """
+    try:
+        payload = _get_alpha_vantage_payload(
+            {"function": "REALTIME_BULK_QUOTES", "symbol": ",".join(symbols)},
+            client=client,
+        )
+    except (httpx.HTTPError, ValueError) as exc:
+        logger.error("Alpha Vantage bulk quote request failed (%s symbols): %s", len(symbols), exc)
+        return {}
+
+    rows = payload.get("data")
+    if not isinstance(rows, list):
+        note = payload.get("Note") or payload.get("Information") or payload.get("message")
+        logger.warning("Alpha Vantage bulk quotes unavailable: %s", note)
+        return {}
+
+    quotes = {}
+    for row in rows:
+        if row.get("symbol") and row.get("close"):
+            quotes[row["symbol"]] = _quote_data(
+                row.get("open"),
+                row.get("high"),
+                row.get("low"),
+                row.get("close"),
+                row.get("volume"),
+                (row.get("timestamp") or "")[:10],
+                row,
             )
-            if attempt < max_retries:
-                time.sleep(ALPHA_VANTAGE_MIN_INTERVAL_SEC * attempt)
-                continue
-            return {"status": "error", "code": "RATE_LIMIT", "message": last_error}
+    return quotes
+
 
-        logger.warning("Alpha Vantage empty quote (%s): %s", symbol, note)
-        return {"status": "error", "code": "EMPTY_QUOTE", "message": str(note)}
+def _api_symbol(stock):
+    for definition in INDEX_DEFINITIONS.values():
+        if definition["symbol"] == stock.symbol:
+            return definition["api_symbol"]
+    return stock.symbol
+
+
+def _prioritize_jobs(jobs):
+    """Order jobs so a short quota goes to indices, then watched or anomalous
+    stocks, then everything else; ties keep their original order."""
+    index_symbols = {definition["symbol"] for definition in INDEX_DEFINITIONS.values()}
+    candidate_ids = [stock.id for stock, _ in jobs if stock.symbol not in index_symbols]
+    followed_ids = set()
+    if candidate_ids:
+        followed_ids = set(
+            Stock.objects.filter(id__in=candidate_ids)
+            .filter(Q(watchlist_items__isnull=False) | Q(anomaly_state__is_anomalous=True))
+            .order_by()
+            .values_list("id", flat=True)
+            .distinct()
+        )
 
-    return {"status": "error", "code": "UNKNOWN", "message": last_error or "Unknown error"}
+    def rank(job):
+        stock = job[0]
+        if stock.symbol in index_symbols:
+            return 0
+        return 1 if stock.id in followed_ids else 2
+
+    return sorted(jobs, key=rank)
+
+
+def _fetch_bulk_quotes(jobs, budget, client):
+    # Indices (^KS11 ...) are not served by the bulk endpoint.
+    plain = [(stock, api_symbol) for stock, api_symbol in jobs if not api_symbol.startswith("^")]
+    quotes = {}
+    for offset in range(0, len(plain), ALPHA_VANTAGE_BULK_SIZE):
+        chunk = plain[offset : offset + ALPHA_VANTAGE_BULK_SIZE]
+        if not reserve_quota(1):
+            break
+        if not budget.acquire():
+            release_quota(1)
+            break
+        answered = fetch_alpha_vantage_bulk_quotes([symbol for _, symbol in chunk], client=client)
+        if not answered:
+            break
+        for stock, api_symbol in chunk:
+            if api_symbol in answered:
+                quotes[stock.symbol] = answered[api_symbol]
+    return quotes
+
+
+def _fetch_with_budget(api_symbol, budget, client):
+    if not budget.acquire():
+        return None
+    return fetch_alpha_vantage_quote(api_symbol, client=client)
 
 
 def refresh_market_prices(symbols=None, force=False, stop_on_rate_limit=True):
@@ -175,62 +366,109 @@ def refresh_market_prices(symbols=None, force=False, stop_on_rate_limit=True):
         index_symbols = [item["symbol"] for item in INDEX_DEFINITIONS.values()]
         stock_queryset = Stock.objects.filter(symbol__in=index_symbols, is_active=True)
 
-    inserted = 0
-    updated = 0
     skipped = []
     failed = []
     rate_limited = False
-    today = timezone.localdate()
-    api_call_count = 0
-    for stock in stock_queryset:
-        if rate_limited and stop_on_rate_limit:
-            skipped.append(stock.symbol)
-            continue
-
-        if not force and Price.objects.filter(stock=stock, traded_at=today).exists():
-            skipped.append(stock.symbol)
-            continue
-
-        api_symbol = stock.symbol
-        for definition in INDEX_DEFINITIONS.values():
-            if definition["symbol"] == stock.symbol:
-                api_symbol = definition["api_symbol"]
-                break
-
-        if api_call_count > 0:
-            time.sleep(ALPHA_VANTAGE_MIN_INTERVAL_SEC)
-        api_call_count += 1
-        quote_result = fetch_alpha_vantage_quote(api_symbol)
-        if quote_result["status"] != "success":
-            reason = quote_result.get("code", "UNKNOWN")
-            message = quote_result.get("message", "")
-            failed.append(
-                {
-                    "symbol": stock.symbol,
-                    "reason": reason,
-                    "message": message,
-                }
+    stocks = list(stock_queryset)
+    priced_today = set()
+    if not force:
+        priced_today = set(
+            Price.objects.filter(
+                stock_id__in=[stock.id for stock in stocks],
+                traded_at=timezone.localdate(),
             )
-            if reason == "RATE_LIMIT":
-                rate_limited = True
-            continue
-
-        quote = quote_result["data"]
-        _, created = Price.objects.update_or_create(
-            stock=stock,
-            traded_at=quote["traded_at"],
-            defaults={
-                "open_price": quote["open_price"],
-                "high_price": quote["high_price"],
-                "low_price": quote["low_price"],
-                "close_price": quote["close_price"],
-                "volume": quote["volume"],
-            },
+            .order_by()
+            .values_list("stock_id", flat=True)
         )
-        if created:
-            inserted += 1
-        else:
-            updated += 1
+    jobs = []
+    for stock in stocks:
+        if stock.id in priced_today:
+            skipped.append(stock.symbol)
+            continue
+        jobs.append((stock, _api_symbol(stock)))
+    jobs = _prioritize_jobs(jobs)
+
+    quotes_by_stock = {}
+    quota_exhausted = False
+    unspent = 0
+    # Workers only talk HTTP; quotes are collected here and written in one batch.
+    budget = RequestBudget(ALPHA_VANTAGE_MIN_INTERVAL_SEC)
+    with httpx.Client(timeout=ALPHA_VANTAGE_TIMEOUT_SEC) as client:
+        if jobs and settings.ALPHA_VANTAGE_BULK_QUOTES:
+            bulk_quotes = _fetch_bulk_quotes(jobs, budget, client)
+            for stock, _ in jobs:
+                if stock.symbol in bulk_quotes:
+                    quotes_by_stock[stock] = bulk_quotes[stock.symbol]
+            jobs = [job for job in jobs if job[0].symbol not in bulk_quotes]
+
+        # Calls the quota cannot cover are refused up front, lowest priority first.
+        granted = reserve_quota(len(jobs))
+        if granted < len(jobs):
+            quota_exhausted = True
+            skipped.extend(stock.symbol for stock, _ in jobs[granted:])
+            jobs = jobs[:granted]
+
+        worker_count = min(max(settings.ALPHA_VANTAGE_CONCURRENCY, 1), len(jobs))
+        if jobs:
+            with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                pending = {}
+
+                def submit(stock, api_symbol, attempt):
+                    future = executor.submit(_fetch_with_budget, api_symbol, budget, client)
+                    pending[future] = (stock, api_symbol, attempt)
+
+                for stock, api_symbol in jobs:
+                    submit(stock, api_symbol, 1)
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stock, api_symbol, attempt = pending.pop(future)
+                        quote_result = None if future.cancelled() else future.result()
+                        if quote_result is None:
+                            unspent += 1
+                            skipped.append(stock.symbol)
+                            continue
+                        if quote_result["status"] == "success":
+                            quotes_by_stock[stock] = quote_result["data"]
+                            continue
+
+                        reason = quote_result.get("code", "UNKNOWN")
+                        if reason == "RATE_LIMIT":
+                            rate_limited = True
+                            if _is_daily_limit_message(quote_result.get("message")):
+                                # The provider is the source of truth for the day.
+                                quota_exhausted = True
+                                mark_quota_exhausted()
+                            elif attempt < ALPHA_VANTAGE_MAX_RETRIES:
+                                budget.defer(ALPHA_VANTAGE_RATE_LIMIT_BACKOFF_SEC * attempt)
+                            # A per-minute throttle only ends the run once a symbol
+                            # stays throttled through every retry.
+                            if quota_exhausted or (
+                                stop_on_rate_limit and attempt >= ALPHA_VANTAGE_MAX_RETRIES
+                            ):
+                                budget.close()
+                                for queued in list(pending):
+                                    queued.cancel()
+                        if (
+                            reason in ALPHA_VANTAGE_RETRYABLE
+                            and attempt < ALPHA_VANTAGE_MAX_RETRIES
+                            and not quota_exhausted
+                            and reserve_quota(1)
+                        ):
+                            submit(stock, api_symbol, attempt + 1)
+                            continue
+                        failed.append(
+                            {
+                                "symbol": stock.symbol,
+                                "reason": reason,
+                                "message": quote_result.get("message", ""),
+                            }
+                        )
+
+    if not quota_exhausted:
+        release_quota(unspent)
+    inserted, updated = _store_prices(quotes_by_stock)
 
     status = "success" if not failed else "partial"
     return {
@@ -239,7 +477,8 @@ def refresh_market_prices(symbols=None, force=False, stop_on_rate_limit=True):
         "updated": updated,
         "skipped": skipped,
         "failed": failed,
-        "rate_limited": rate_limited,
+        "rate_limited": rate_limited or quota_exhausted,
+        "quota_remaining": remaining_quota(),
     }
 
 
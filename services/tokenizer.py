@@ -0,0 +1,167 @@
+import re
+from collections import Counter
+from functools import lru_cache
+
+# Kept free of Django imports so scripts/benchmark_tokenizer.py can load it bare.
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z]{2,}|[가-힣]{2,}")
+# Input is lowered first, so the scan only needs the lowercase class.
+_LOWER_TOKEN_PATTERN = re.compile(r"[a-z]{2,}|[가-힣]{2,}")
+NORMALIZE_CACHE_SIZE = 65536
+
+STOPWORDS = frozenset(
+    {
+        "stock",
+        "stocks",
+        "market",
+        "news",
+        "today",
+        "update",
+        "breaking",
+        "finance",
+        "financial",
+        "investing",
+        "analysis",
+        "report",
+        "korea",
+        "usa",
+        "global",
+        "관련",
+        "속보",
+        "단독",
+        "시장",
+        "증시",
+        "종목",
+        "주식",
+        "투자",
+        "분석",
+        "브리핑",
+        "관심도",
+        "이슈",
+        "뉴스",
+    }
+)
+
+# Particles and copula endings stripped from Korean tokens, longest match first.
+# Single syllables that also end common nouns (이, 가, 도, 로, 의, 과, 만, ...) are
+# left out: stripping them turns 디스플레이, 공매도 or 전문가 into non-words.
+KOREAN_SUFFIXES = (
+    "으로부터",
+    "에서부터",
+    "으로서",
+    "으로써",
+    "에서는",
+    "에서도",
+    "에게서",
+    "이라는",
+    "이라고",
+    "까지",
+    "부터",
+    "에서",
+    "에게",
+    "께서",
+    "으로",
+    "로서",
+    "로써",
+    "라는",
+    "라고",
+    "이다",
+    "보다",
+    "처럼",
+    "마저",
+    "조차",
+    "은",
+    "는",
+    "을",
+    "를",
+    "에",
+)
+KOREAN_MIN_STEM = 2
+
+
+def _build_suffix_trie(suffixes):
+    # Reversed-suffix trie: walking a token from its last character finds
+    # every particle it ends with in one pass, whatever the suffix count.
+    root = {}
+    for suffix in suffixes:
+        node = root
+        for char in reversed(suffix):
+            node = node.setdefault(char, {})
+        node[None] = len(suffix)
+    return root
+
+
+_SUFFIX_TRIE = _build_suffix_trie(KOREAN_SUFFIXES)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_token(token):
+    if not ("가" <= token[-1] <= "힣"):
+        return token
+    node = _SUFFIX_TRIE
+    strip = 0
+    for char in reversed(token):
+        node = node.get(char)
+        if node is None:
+            break
+        strip = node.get(None, strip)
+    if strip and len(token) - strip >= KOREAN_MIN_STEM:
+        return token[:-strip]
+    return token
+
+
+def lower_tokens(text):
+    """Lowercase word tokens of ``text`` before particle normalization."""
+    return _LOWER_TOKEN_PATTERN.findall(text.lower())
+
+
+def build_stopwords(symbol="", name=""):
+    extra = {symbol.lower()} if symbol else set()
+    extra.update(normalize_token(token) for token in TOKEN_PATTERN.findall(name.lower()))
+    return STOPWORDS | extra if extra else STOPWORDS
+
+
+_stock_stopwords = {}
+
+
+def stock_stopwords(stock):
+    """Return the memoized stopword set for ``stock``.
+
+    Entries are keyed by pk and re-checked against symbol/name, so a rename in
+    another process is still picked up; the post_save hook only frees memory.
+    """
+    cached = _stock_stopwords.get(stock.pk)
+    if cached is not None and cached[0] == stock.symbol and cached[1] == stock.name:
+        return cached[2]
+    stopwords = build_stopwords(stock.symbol, stock.name)
+    if stock.pk is not None:
+        _stock_stopwords[stock.pk] = (stock.symbol, stock.name, stopwords)
+    return stopwords
+
+
+def invalidate_stock_stopwords(stock_id=None):
+    if stock_id is None:
+        _stock_stopwords.clear()
+    else:
+        _stock_stopwords.pop(stock_id, None)
+
+
+def count_tokens(titles, stopwords=STOPWORDS):
+    """Count normalized tokens across ``titles`` in one pass.
+
+    The titles are lowered and scanned as a single string, normalization goes
+    through the memoized trie walk, and stopwords are dropped with one set
+    intersection, so no Python-level loop runs per token.
+    """
+    text = "\n".join(titles).lower()
+    counts = Counter(map(normalize_token, _LOWER_TOKEN_PATTERN.findall(text)))
+    for stopword in counts.keys() & stopwords:
+        del counts[stopword]
+    return counts
+
+
+def extract_tokens(text, stopwords=STOPWORDS):
+    if not text:
+        return []
+    tokens = (normalize_token(raw) for raw in lower_tokens(text))
+    return [token for token in tokens if token not in stopwords]
@@ -1,118 +1,207 @@
-import re
-from collections import Counter
+import math
+from collections import Counter, defaultdict
 from datetime import timedelta
 
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Sum
 from django.utils import timezone
 
-from apps.stocks.models import Interest, NewsItem
-
-TOKEN_PATTERN = re.compile(r"[A-Za-z]{2,}|[가-힣]{2,}")
-MAX_TEXT_SAMPLES = 200
-
-STOPWORDS = {
-    "stock",
-    "stocks",
-    "market",
-    "news",
-    "today",
-    "update",
-    "breaking",
-    "finance",
-    "financial",
-    "investing",
-    "analysis",
-    "report",
-    "korea",
-    "usa",
-    "global",
-    "관련",
-    "속보",
-    "단독",
-    "시장",
-    "증시",
-    "종목",
-    "주식",
-    "투자",
-    "분석",
-    "브리핑",
-    "관심도",
-    "이슈",
-    "뉴스",
-}
-
-
-def _normalize_stopwords(stock):
-    dynamic = set(STOPWORDS)
-    dynamic.add(stock.symbol.lower())
-    for token in TOKEN_PATTERN.findall(stock.name.lower()):
-        dynamic.add(token)
-    return dynamic
-
-
-def _extract_tokens(text, stopwords):
-    if not text:
-        return []
-    tokens = []
-    for raw in TOKEN_PATTERN.findall(text.lower()):
-        token = raw.strip()
-        if len(token) < 2:
-            continue
-        if token in stopwords:
-            continue
-        tokens.append(token)
-    return tokens
+from apps.stocks.models import Interest, NewsItem, StockKeywordCounter, StockTopicKeyword
+from services.news_clustering import cluster_heads
+from services.tokenizer import count_tokens, stock_stopwords
 
+KEYWORD_MAX_LENGTH = 64
+KEYWORD_BULK_BATCH_SIZE = 500
+# Supported by both SQLite (3.24+) and PostgreSQL.
+KEYWORD_INCREMENT_SQL = """
+    INSERT INTO stocks_stockkeywordcounter (stock_id, bucket_start, keyword, "count")
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (stock_id, bucket_start, keyword)
+    DO UPDATE SET "count" = stocks_stockkeywordcounter."count" + excluded."count"
+"""
 
-def _collect_text_samples(stock, hours):
-    since = timezone.now() - timedelta(hours=hours)
 
-    news_titles = list(
-        NewsItem.objects.filter(stock=stock, created_at__gte=since)
-        .order_by("-published_at", "-id")
-        .values_list("title", flat=True)[:120]
-    )
+def _hour_floor(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def count_stock_keywords(stock, titles):
+    counter = Counter()
+    for token, count in count_tokens(titles, stock_stopwords(stock)).items():
+        counter[token[:KEYWORD_MAX_LENGTH]] += count
+    return counter
+
+
+def record_keyword_counts(titles_by_stock, recorded_at):
+    """Fold newly ingested titles into per-stock hourly keyword counters.
+
+    ``titles_by_stock`` maps Stock instances to title lists. Counts are added
+    in the database, so concurrent news and interest runs never lose increments.
+    """
+    bucket_start = _hour_floor(recorded_at)
+    counts = {}
+    for stock, titles in titles_by_stock.items():
+        for keyword, count in count_stock_keywords(stock, titles).items():
+            counts[(stock.id, keyword)] = counts.get((stock.id, keyword), 0) + count
+    if not counts:
+        return 0
+
+    bucket_value = connection.ops.adapt_datetimefield_value(bucket_start)
+    rows = [
+        (stock_id, bucket_value, keyword, count) for (stock_id, keyword), count in counts.items()
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(KEYWORD_INCREMENT_SQL, rows)
+    return len(counts)
+
+
+def rebuild_keyword_counters(start, end=None, now=None):
+    """Recount a window from stored headlines and crawler samples (ops backfill).
+
+    Compaction drops crawler samples once snapshots pass the raw retention, so
+    ``start`` is clamped to that horizon; older counters are kept as they are.
+    """
+    now = now or timezone.now()
+    end = end or now
+    raw_horizon = _hour_floor(now - timedelta(hours=settings.INTEREST_RAW_RETENTION_HOURS))
+    start = max(_hour_floor(start), raw_horizon)
+    titles = defaultdict(lambda: defaultdict(list))
+    news = cluster_heads(
+        NewsItem.objects.filter(created_at__gte=start, created_at__lte=end)
+    ).select_related("stock")
+    for item in news.only("title", "created_at", "stock"):
+        titles[_hour_floor(item.created_at)][item.stock].append(item.title)
 
-    sample_titles = []
     records = (
-        Interest.objects.filter(stock=stock, recorded_at__gte=since)
-        .order_by("-recorded_at", "-id")[:80]
+        Interest.objects.filter(recorded_at__gte=start, recorded_at__lte=end)
+        .exclude(source=Interest.Source.NEWS)
+        .select_related("stock")
     )
-    for record in records:
+    for record in records.only("metadata", "recorded_at", "stock"):
         samples = (record.metadata or {}).get("samples", [])
         if not isinstance(samples, list):
             continue
-        for item in samples:
-            if not isinstance(item, dict):
-                continue
-            title = str(item.get("title", "")).strip()
-            if title:
-                sample_titles.append(title)
+        for sample in samples:
+            if isinstance(sample, dict) and str(sample.get("title", "")).strip():
+                titles[_hour_floor(record.recorded_at)][record.stock].append(sample["title"])
+
+    rows = 0
+    with transaction.atomic():
+        StockKeywordCounter.objects.filter(
+            bucket_start__gte=start,
+            bucket_start__lte=end,
+        ).delete()
+        for bucket_start, titles_by_stock in titles.items():
+            rows += record_keyword_counts(titles_by_stock, recorded_at=bucket_start)
+    return {"start": start, "buckets": len(titles), "rows": rows}
+
+
+def prune_keyword_counters(now=None):
+    cutoff = (now or timezone.now()) - timedelta(days=settings.TOPIC_KEYWORD_RETENTION_DAYS)
+    deleted, _ = StockKeywordCounter.objects.filter(bucket_start__lt=cutoff).delete()
+    return deleted
+
+
+def _stock_term_matrix(since):
+    # Sparse stock x term matrix as {stock_id: {term_index: count}}; only the
+    # non-zero cells come back from one grouped query over the counters.
+    term_index = {}
+    rows = defaultdict(dict)
+    cells = (
+        StockKeywordCounter.objects.filter(bucket_start__gte=since, stock__is_active=True)
+        .values("stock_id", "keyword")
+        .annotate(total=Sum("count"))
+        .values_list("stock_id", "keyword", "total")
+    )
+    for stock_id, keyword, total in cells:
+        column = term_index.setdefault(keyword, len(term_index))
+        rows[stock_id][column] = total
+    terms = [None] * len(term_index)
+    for keyword, column in term_index.items():
+        terms[column] = keyword
+    return rows, terms
+
+
+def compute_topic_keywords(hours=None, top_k=None):
+    """Score every stock's window keywords with TF-IDF across the stock universe.
+
+    Each stock is a document, so terms that show up for every stock ("실적",
+    "shares") get a low inverse document frequency and drop out of the top list.
+    """
+    hours = hours or settings.TOPIC_TFIDF_WINDOW_HOURS
+    top_k = top_k or settings.TOPIC_TFIDF_TOP_K
+    now = timezone.now()
+    rows, terms = _stock_term_matrix(_hour_floor(now - timedelta(hours=hours)))
+
+    document_frequency = [0] * len(terms)
+    for row in rows.values():
+        for column in row:
+            document_frequency[column] += 1
+    document_count = len(rows)
+    idf = [math.log((1 + document_count) / (1 + df)) + 1 for df in document_frequency]
+
+    keywords = []
+    for stock_id, row in rows.items():
+        scores = {column: (1 + math.log(count)) * idf[column] for column, count in row.items()}
+        norm = math.sqrt(sum(score * score for score in scores.values())) or 1.0
+        ranked = sorted(scores.items(), key=lambda cell: (-cell[1], terms[cell[0]]))[:top_k]
+        keywords.extend(
+            StockTopicKeyword(
+                stock_id=stock_id,
+                keyword=terms[column],
+                count=row[column],
+                score=round(score / norm, 6),
+                rank=rank,
+                computed_at=now,
+            )
+            for rank, (column, score) in enumerate(ranked, start=1)
+        )
 
-    merged = news_titles + sample_titles
-    return merged[:MAX_TEXT_SAMPLES]
+    with transaction.atomic():
+        StockTopicKeyword.objects.all().delete()
+        StockTopicKeyword.objects.bulk_create(keywords, batch_size=KEYWORD_BULK_BATCH_SIZE)
+    return {"stocks": document_count, "terms": len(terms), "keywords": len(keywords)}
 
 
-def build_stock_topic_cloud(stock, hours=72, max_keywords=24):
-    text_samples = _collect_text_samples(stock=stock, hours=hours)
-    if not text_samples:
-        return []
+def _topic_keyword_rows(stock, max_keywords):
+    return [
+        (row.keyword, row.count, row.score)
+        for row in StockTopicKeyword.objects.filter(stock=stock).order_by("rank")[:max_keywords]
+    ]
 
-    stopwords = _normalize_stopwords(stock)
-    counter = Counter()
-    for text in text_samples:
-        counter.update(_extract_tokens(text, stopwords))
 
-    if not counter:
+def _counter_keyword_rows(stock, hours, max_keywords):
+    since = _hour_floor(timezone.now() - timedelta(hours=hours))
+    return [
+        (keyword, total, total)
+        for keyword, total in StockKeywordCounter.objects.filter(
+            stock=stock,
+            bucket_start__gte=since,
+        )
+        .values("keyword")
+        .annotate(total=Sum("count"))
+        .order_by("-total", "keyword")
+        .values_list("keyword", "total")[:max_keywords]
+    ]
+
+
+def build_stock_topic_cloud(stock, hours=72, max_keywords=24):
+    # The scheduled TF-IDF pass covers the default window; other windows, or
+    # stocks it has not reached yet, fall back to raw counter totals.
+    rows = []
+    if hours == settings.TOPIC_TFIDF_WINDOW_HOURS:
+        rows = _topic_keyword_rows(stock, max_keywords)
+    if not rows:
+        rows = _counter_keyword_rows(stock, hours, max_keywords)
+    if not rows:
         return []
 
-    most_common = counter.most_common(max_keywords)
-    max_count = most_common[0][1] if most_common else 1
-    if max_count <= 0:
-        max_count = 1
+    max_score = rows[0][2] if rows[0][2] > 0 else 1
 
     result = []
-    for keyword, count in most_common:
-        weight = count / max_count
+    for keyword, count, score in rows:
+        weight = score / max_score
         # 0.86rem ~ 1.6rem
         font_size = round(0.86 + (0.74 * weight), 3)
         result.append(
@@ -0,0 +1,216 @@
+import hashlib
+import logging
+import time
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from services.tokenizer import count_tokens
+
+logger = logging.getLogger(__name__)
+
+TRENDING_KEY_PREFIX = "trending:terms"
+TRENDING_LOCK_TIMEOUT_SEC = 10
+# Ingest waits at most (ATTEMPTS - 1) * WAIT_SEC before dropping a contended batch.
+TRENDING_LOCK_ATTEMPTS = 3
+TRENDING_LOCK_WAIT_SEC = 0.05
+
+
+class CountMinSketch:
+    """Fixed ``depth`` x ``width`` counter table; estimates never undercount."""
+
+    def __init__(self, width, depth, table=None):
+        self.width = width
+        self.depth = depth
+        self.table = table or [[0] * width for _ in range(depth)]
+
+    def _columns(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        return [(first + row * second) % self.width for row in range(self.depth)]
+
+    def add(self, item, count=1):
+        for row, column in enumerate(self._columns(item)):
+            self.table[row][column] += count
+
+    def estimate(self, item):
+        return min(self.table[row][column] for row, column in enumerate(self._columns(item)))
+
+    def merge(self, other):
+        for row, other_row in zip(self.table, other.table):
+            for column, value in enumerate(other_row):
+                if value:
+                    row[column] += value
+
+
+class SpaceSaving:
+    """Top-``capacity`` heavy hitters; each count overshoots by at most its error."""
+
+    def __init__(self, capacity, counters=None):
+        self.capacity = capacity
+        self.counters = counters or {}
+
+    def _floor(self):
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(count for count, _ in self.counters.values())
+
+    def add(self, item, count=1):
+        if item in self.counters:
+            current, error = self.counters[item]
+            self.counters[item] = (current + count, error)
+            return
+        if len(self.counters) < self.capacity:
+            self.counters[item] = (count, 0)
+            return
+        evicted = min(self.counters, key=lambda key: self.counters[key][0])
+        floor = self.counters.pop(evicted)[0]
+        self.counters[item] = (floor + count, floor)
+
+    def merge(self, other):
+        # An item missing from a full summary may have been counted up to that
+        # summary's minimum, so it is charged that floor as count and error.
+        floor, other_floor = self._floor(), other._floor()
+        merged = {}
+        for item in self.counters.keys() | other.counters.keys():
+            count, error = self.counters.get(item, (floor, floor))
+            other_count, other_error = other.counters.get(item, (other_floor, other_floor))
+            merged[item] = (count + other_count, error + other_error)
+        ranked = sorted(merged.items(), key=lambda entry: -entry[1][0])[: self.capacity]
+        self.counters = dict(ranked)
+
+
+class TrendingSketch:
+    def __init__(self, cms=None, heavy_hitters=None):
+        self.cms = cms or CountMinSketch(
+            width=settings.TRENDING_CMS_WIDTH,
+            depth=settings.TRENDING_CMS_DEPTH,
+        )
+        self.heavy_hitters = heavy_hitters or SpaceSaving(settings.TRENDING_TOP_K)
+
+    def add(self, term, count=1):
+        self.cms.add(term, count)
+        self.heavy_hitters.add(term, count)
+
+    def merge(self, other):
+        self.cms.merge(other.cms)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        return self
+
+    def top(self, limit):
+        # Space-Saving picks the candidates; the sketch gives the tighter count.
+        rows = [
+            (term, min(count, self.cms.estimate(term)))
+            for term, (count, _) in self.heavy_hitters.counters.items()
+        ]
+        rows.sort(key=lambda row: (-row[1], row[0]))
+        return rows[:limit]
+
+    def to_payload(self):
+        return {
+            "width": self.cms.width,
+            "depth": self.cms.depth,
+            "table": self.cms.table,
+            "capacity": self.heavy_hitters.capacity,
+            "counters": {term: list(entry) for term, entry in self.heavy_hitters.counters.items()},
+        }
+
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(
+            cms=CountMinSketch(payload["width"], payload["depth"], payload["table"]),
+            heavy_hitters=SpaceSaving(
+                payload["capacity"],
+                {term: tuple(entry) for term, entry in payload["counters"].items()},
+            ),
+        )
+
+
+def _hour_bucket(value):
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _bucket_key(bucket):
+    return f"{TRENDING_KEY_PREFIX}:hour:{bucket:%Y%m%d%H}"
+
+
+def _bucket_timeout():
+    return (settings.TRENDING_RETENTION_HOURS + 1) * 3600
+
+
+def build_trending_sketch(titles):
+    sketch = TrendingSketch()
+    for token, count in count_tokens(titles).items():
+        sketch.add(token, count)
+    return sketch
+
+
+def _acquire_bucket_lock(lock_key):
+    for attempt in range(TRENDING_LOCK_ATTEMPTS):
+        if attempt:
+            time.sleep(TRENDING_LOCK_WAIT_SEC)
+        if cache.add(lock_key, 1, timeout=TRENDING_LOCK_TIMEOUT_SEC):
+            return True
+    return False
+
+
+def record_trending_terms(titles, recorded_at=None):
+    """Merge a batch of titles into the hour bucket shared by every worker.
+
+    Called from ingest ``on_commit`` hooks, so cache errors and lock contention
+    drop this batch with a warning instead of failing the committed ingest.
+    """
+    titles = [title for title in titles if title]
+    if not titles:
+        return False
+
+    batch = build_trending_sketch(titles)
+    key = _bucket_key(_hour_bucket(recorded_at or timezone.now()))
+    lock_key = f"{key}:lock"
+    try:
+        if not _acquire_bucket_lock(lock_key):
+            logger.warning(
+                "Trending terms bucket %s is locked; dropping %s titles", key, len(titles)
+            )
+            return False
+        try:
+            payload = cache.get(key)
+            if payload is not None:
+                batch.merge(TrendingSketch.from_payload(payload))
+            cache.set(key, batch.to_payload(), timeout=_bucket_timeout())
+        finally:
+            cache.delete(lock_key)
+    except redis.RedisError as exc:
+        logger.warning("Trending terms update failed: %s", exc)
+        return False
+    return True
+
+
+def get_trending_terms(hours=6, limit=20):
+    hours = max(1, min(hours, settings.TRENDING_RETENTION_HOURS))
+    now_bucket = _hour_bucket(timezone.now())
+    keys = [_bucket_key(now_bucket - timedelta(hours=offset)) for offset in range(hours)]
+    payloads = cache.get_many(keys)
+    if not payloads:
+        return []
+
+    sketch = TrendingSketch()
+    for payload in payloads.values():
+        sketch.merge(TrendingSketch.from_payload(payload))
+    rows = sketch.top(limit)
+    max_count = rows[0][1] if rows and rows[0][1] > 0 else 1
+    return [
+        {
+            "term": term,
+            "count": count,
+            "weight": round(count / max_count, 4),
+            # 0.86rem ~ 1.6rem, matching the stock topic cloud
+            "font_size": round(0.86 + 0.74 * count / max_count, 3),
+        }
+        for term, count in rows
+    ]
@@ -0,0 +1,107 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.stocks.models import InterestUniqueSketch
+from services.hyperloglog import HyperLogLog
+
+UNIQUE_SKETCH_BULK_BATCH_SIZE = 500
+ANONYMOUS_AUTHORS = frozenset({"[deleted]", "[removed]"})
+
+
+def _hour_floor(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def mention_identity(source, record):
+    # The author when the source exposes one, otherwise the post itself, so a
+    # user repeating themselves counts once per sketch.
+    metadata = getattr(record, "metadata", None) or {}
+    author = metadata.get("author")
+    if author and author not in ANONYMOUS_AUTHORS:
+        return f"{source}:author:{author}"
+    return f"{source}:post:{record.url or record.title}"
+
+
+def record_unique_mentions(identities_by_key, recorded_at):
+    """Fold identities into the hour's (stock, source) HyperLogLog sketches.
+
+    ``identities_by_key`` maps ``(stock_id, source)`` to identity strings.
+    The hour's rows are locked while they are merged, so concurrent writers
+    never drop each other's registers.
+    """
+    sketches = {
+        key: HyperLogLog().update(identities)
+        for key, identities in identities_by_key.items()
+        if identities
+    }
+    if not sketches:
+        return 0
+
+    bucket_start = _hour_floor(recorded_at)
+    with transaction.atomic(savepoint=False):
+        # Create missing rows first so every sketch can be locked before merging;
+        # otherwise two first writers to an hour would overwrite each other.
+        InterestUniqueSketch.objects.bulk_create(
+            [
+                InterestUniqueSketch(
+                    stock_id=stock_id,
+                    source=source,
+                    bucket_start=bucket_start,
+                    registers=HyperLogLog().to_bytes(),
+                )
+                for stock_id, source in sketches
+            ],
+            batch_size=UNIQUE_SKETCH_BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        rows = InterestUniqueSketch.objects.select_for_update().filter(
+            stock_id__in={stock_id for stock_id, _ in sketches},
+            source__in={source for _, source in sketches},
+            bucket_start=bucket_start,
+        )
+        updated_at = timezone.now()
+        locked = []
+        for row in rows.only("id", "stock_id", "source", "registers"):
+            sketch = sketches.get((row.stock_id, row.source))
+            if sketch is None:
+                continue
+            sketch.merge(HyperLogLog.from_bytes(row.registers))
+            row.registers = sketch.to_bytes()
+            row.estimate = sketch.count()
+            row.updated_at = updated_at
+            locked.append(row)
+        InterestUniqueSketch.objects.bulk_update(
+            locked,
+            ["registers", "estimate", "updated_at"],
+            batch_size=UNIQUE_SKETCH_BULK_BATCH_SIZE,
+        )
+    return len(sketches)
+
+
+def get_unique_mentions(symbols, hours):
+    """Distinct authors/posts per symbol over the last ``hours`` hour buckets.
+
+    Identities are namespaced by source, so merging every source's sketches
+    across the window yields one union count per stock.
+    """
+    if not symbols:
+        return {}
+    since = _hour_floor(timezone.now()) - timedelta(hours=max(hours, 1) - 1)
+    merged = defaultdict(HyperLogLog)
+    rows = InterestUniqueSketch.objects.filter(
+        stock__symbol__in=list(symbols),
+        bucket_start__gte=since,
+    ).values_list("stock__symbol", "registers")
+    for symbol, registers in rows.iterator():
+        merged[symbol].merge(HyperLogLog.from_bytes(registers))
+    return {symbol: sketch.count() for symbol, sketch in merged.items()}
+
+
+def prune_unique_sketches(now=None):
+    cutoff = (now or timezone.now()) - timedelta(days=settings.INTEREST_SKETCH_RETENTION_DAYS)
+    deleted, _ = InterestUniqueSketch.objects.filter(bucket_start__lt=cutoff).delete()
+    return deleted
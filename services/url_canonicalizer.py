@@ -0,0 +1,65 @@
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {
+    "_ga",
+    "cmpid",
+    "dclid",
+    "fbclid",
+    "gclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "msclkid",
+    "oc",
+    "ref",
+    "ref_src",
+    "spm",
+    "yclid",
+}
+TRACKING_PREFIXES = ("utm_",)
+GOOGLE_REDIRECT_HOSTS = {"google.com", "www.google.com", "news.google.com"}
+GOOGLE_REDIRECT_PATHS = {"/url", "/news/url"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking_param(name):
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url):
+    """Normalise a crawled article URL so tracking variants share one key."""
+    url = (url or "").strip()
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    query = parse_qsl(parts.query, keep_blank_values=True)
+
+    if host in GOOGLE_REDIRECT_HOSTS and parts.path in GOOGLE_REDIRECT_PATHS:
+        target = dict(query).get("url") or dict(query).get("q")
+        if target and target.startswith(("http://", "https://")):
+            return canonicalize_url(target)
+
+    path = parts.path or "/"
+    if host == "news.google.com":
+        # RSS items link through /rss/articles/<id>?oc=5; the article id alone
+        # identifies the story.
+        if path.startswith("/rss/articles/"):
+            path = path[len("/rss") :]
+        query = []
+
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    kept = sorted((name, value) for name, value in query if not _is_tracking_param(name))
+    return urlunsplit((scheme, netloc, path, urlencode(kept), ""))
+
+
+def url_hash(canonical_url):
+    return hashlib.sha1(canonical_url.encode("utf-8"), usedforsecurity=False).hexdigest()